@@ -0,0 +1,115 @@
+"""
+Difusão de eventos em processo para os streams SSE
+
+Cada mudança é serializada uma única vez no formato SSE e o mesmo texto vai
+para a fila de todos os clientes conectados, então o custo por mudança não
+cresce com leituras no banco por cliente. Os últimos eventos ficam em memória
+para o cliente que reconectar com Last-Event-ID receber o que perdeu.
+
+Os eventos são do processo: com vários workers do uvicorn, cada worker só
+publica as mudanças que ele mesmo fez.
+"""
+import asyncio
+import json
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Optional, Set, Tuple
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Enviado quando o cliente perdeu eventos: ele deve recarregar os dados
+RESYNC_FRAME = 'event: resync\ndata: {}\n\n'
+
+
+def format_sse(event_id: int, event: str, data: Any) -> str:
+    payload = json.dumps(jsonable_encoder(data), ensure_ascii=False, separators=(",", ":"))
+    return f"id: {event_id}\nevent: {event}\ndata: {payload}\n\n"
+
+
+class EventBroadcaster:
+    """Fan-out de eventos para filas limitadas, uma por cliente"""
+
+    def __init__(self, queue_size: int = 100, history_size: int = 1000):
+        self.queue_size = queue_size
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._history: Deque[Tuple[int, str]] = deque(maxlen=history_size)
+        self._last_id = 0
+        self.published = 0
+        self.dropped = 0
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event: str, data: Any) -> int:
+        """Serializa o evento uma vez e entrega a todos os clientes (sem esperar)"""
+        self._last_id += 1
+        frame = format_sse(self._last_id, event, data)
+        self._history.append((self._last_id, frame))
+        self.published += 1
+
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                # Cliente lento: descarta o que está pendente e pede para recarregar
+                self.dropped += 1
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC_FRAME)
+        return self._last_id
+
+    def _replay(self, last_event_id: Optional[int]) -> list:
+        if last_event_id is None or last_event_id == self._last_id:
+            return []
+        # Id à frente do último publicado: veio de outro processo ou de antes de um restart
+        if last_event_id > self._last_id:
+            return [RESYNC_FRAME]
+        oldest = self._history[0][0] if self._history else self._last_id + 1
+        if last_event_id < oldest - 1:
+            return [RESYNC_FRAME]
+        missed = [frame for event_id, frame in self._history if event_id > last_event_id]
+        # Mais do que cabe na fila: recarregar sai mais barato que truncar em silêncio
+        return missed if len(missed) <= self.queue_size else [RESYNC_FRAME]
+
+    @asynccontextmanager
+    async def subscribe(self, last_event_id: Optional[int] = None) -> AsyncIterator[asyncio.Queue]:
+        """Fila do cliente, já com os eventos perdidos desde `last_event_id`"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        for frame in self._replay(last_event_id):
+            queue.put_nowait(frame)
+        self._subscribers.add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers.discard(queue)
+
+    async def stream(self, last_event_id: Optional[int] = None, heartbeat: float = 15.0) -> AsyncIterator[str]:
+        """Frames SSE para um cliente, com comentário de heartbeat quando ocioso"""
+        async with self.subscribe(last_event_id) as queue:
+            yield f"retry: {settings.EVENTS_RETRY_MS}\n\n"
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": self.subscribers,
+            "published": self.published,
+            "dropped": self.dropped,
+            "last_event_id": self._last_id,
+        }
+
+
+# Eventos de campanhas e métricas
+campaign_events = EventBroadcaster(
+    queue_size=settings.EVENTS_CLIENT_QUEUE_SIZE,
+    history_size=settings.EVENTS_HISTORY_SIZE
+)
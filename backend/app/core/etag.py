@@ -0,0 +1,42 @@
+"""
+ETag e GET condicional para os endpoints consultados periodicamente
+
+O ETag é um hash da URL e de uma marca d'água dos dados (ex.: versão da tabela
+ou id e versão da linha), calculada antes da leitura principal. Se o cliente manda
+o mesmo valor em If-None-Match, a resposta é 304 sem consultar nem serializar
+o corpo. Com Cache-Control: no-cache o navegador guarda a resposta mas sempre
+revalida, então o front-end não precisa mudar nada.
+"""
+import hashlib
+import json
+from typing import Any, Optional
+
+from fastapi import HTTPException, Request, Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    """ETag forte a partir das partes (serializadas de forma estável)"""
+    raw = json.dumps(parts, default=str, separators=(",", ":"))
+    return f'"{hashlib.sha1(raw.encode()).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    # Comparação fraca, como pede a RFC 9110 para If-None-Match
+    return "*" in candidates or etag in (value.removeprefix("W/") for value in candidates)
+
+
+def check_etag(request: Request, response: Response, *watermark: Any) -> str:
+    """
+    Define ETag/Cache-Control na resposta e levanta 304 quando o cliente já
+    tem essa versão. A marca d'água deve ser lida antes dos dados: se houver
+    escrita no meio, o pior caso é uma resposta nova com o ETag antigo.
+    """
+    etag = make_etag(request.url.path, request.url.query, *watermark)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return etag
@@ -0,0 +1,198 @@
+"""
+Profiling sob demanda de uma única requisição
+
+Com "X-Profile: 1" (ou ?profile=1) e um token de admin, a requisição roda sob
+o cProfile e o perfil é gravado em PROFILING_DIR: `<id>.prof` (pstats/snakeviz)
+e `<id>.json` com os metadados e as funções mais caras. O id volta no
+cabeçalho X-Profile-Id. Sem a flag, o custo é só procurar o cabeçalho; sem um
+token de admin, a flag é ignorada e a requisição segue normalmente.
+
+O cProfile mede a thread do event loop: requisições atendidas ao mesmo tempo
+também entram no perfil, e só um perfil roda por vez (as demais respondem com
+"X-Profile: busy"). Endpoints síncronos (executados no threadpool) não aparecem.
+"""
+import asyncio
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import re
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List
+from urllib.parse import parse_qs
+
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ID_PATTERN = re.compile(r"^[0-9]{8}T[0-9]{12}-[A-Z]+-[a-z0-9_]{1,60}$")
+SORT_KEYS = ("cumulative", "tottime", "ncalls")
+_TRUTHY = ("1", "true", "yes", "on")
+
+
+def wants_profile(scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == b"x-profile":
+            return value.decode("latin-1").lower() in _TRUTHY
+    query = scope.get("query_string", b"")
+    if b"profile=" in query:
+        values = parse_qs(query.decode("latin-1")).get("profile", [])
+        return any(value.lower() in _TRUTHY for value in values)
+    return False
+
+
+def new_profile_id(method: str, path: str) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "_", path.lower()).strip("_")[:60] or "root"
+    return f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')}-{method.upper()}-{slug}"
+
+
+def _function_label(func: tuple) -> str:
+    filename, line, name = func
+    return f"{filename}:{line}({name})" if line else name
+
+
+class ProfileStore:
+    """Perfis gravados em disco, com limite de arquivos"""
+
+    def __init__(self, directory: str, max_files: int = 100):
+        self.directory = directory
+        self.max_files = max_files
+
+    def _path(self, profile_id: str, extension: str) -> str:
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            raise FileNotFoundError(profile_id)
+        return os.path.join(self.directory, f"{profile_id}.{extension}")
+
+    def save(self, profile_id: str, profiler: cProfile.Profile, metadata: Dict[str, Any], top: int = 10) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        profiler.dump_stats(self._path(profile_id, "prof"))
+
+        stats = pstats.Stats(profiler)
+        by_tottime = sorted(stats.stats.items(), key=lambda item: -item[1][2])[:top]
+        metadata = {
+            "id": profile_id,
+            **metadata,
+            "total_calls": stats.total_calls,
+            "top_functions": [
+                {"function": _function_label(func), "ncalls": ncalls, "tottime": round(tottime, 6),
+                 "cumtime": round(cumtime, 6)}
+                for func, (_, ncalls, tottime, cumtime, _) in by_tottime
+            ],
+        }
+        with open(self._path(profile_id, "json"), "w", encoding="utf-8") as f:
+            json.dump(metadata, f, ensure_ascii=False)
+        self._prune()
+
+    def _ids(self) -> List[str]:
+        """Ids do mais recente para o mais antigo (o id começa pelo horário)"""
+        if not os.path.isdir(self.directory):
+            return []
+        names = (name[:-5] for name in os.listdir(self.directory) if name.endswith(".json"))
+        return sorted((name for name in names if PROFILE_ID_PATTERN.match(name)), reverse=True)
+
+    def _prune(self) -> None:
+        for profile_id in self._ids()[self.max_files:]:
+            for extension in ("json", "prof"):
+                try:
+                    os.remove(self._path(profile_id, extension))
+                except FileNotFoundError:
+                    pass
+
+    def list(self, limit: int = 20) -> List[Dict[str, Any]]:
+        profiles = []
+        for profile_id in self._ids()[:limit]:
+            try:
+                with open(self._path(profile_id, "json"), encoding="utf-8") as f:
+                    profiles.append(json.load(f))
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+        return profiles
+
+    def prof_path(self, profile_id: str) -> str:
+        path = self._path(profile_id, "prof")
+        if not os.path.isfile(path):
+            raise FileNotFoundError(profile_id)
+        return path
+
+    def report(self, profile_id: str, sort: str = "cumulative", limit: int = 50) -> str:
+        """Relatório texto do pstats, como `python -m pstats`"""
+        output = io.StringIO()
+        stats = pstats.Stats(self.prof_path(profile_id), stream=output)
+        stats.strip_dirs().sort_stats(sort).print_stats(limit)
+        return output.getvalue()
+
+
+class ProfilingMiddleware:
+    """Middleware ASGI: sem a flag, repassa a requisição sem nenhum outro custo"""
+
+    def __init__(self, app, store: ProfileStore, authorize: Callable[[Request], Awaitable[Any]]):
+        self.app = app
+        self.store = store
+        self.authorize = authorize
+        self._active = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            user = await self.authorize(Request(scope))
+        except HTTPException:
+            # Não é admin: a flag é ignorada (o endpoint aplica a própria autenticação)
+            await self.app(scope, receive, send)
+            return
+
+        if self._active:
+            await self.app(scope, receive, self._add_header(send, b"x-profile", b"busy"))
+            return
+
+        profile_id = new_profile_id(scope["method"], scope["path"])
+        response_status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response_status["code"] = message["status"]
+            await send(message)
+
+        self._active = True
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, self._add_header(send_wrapper, b"x-profile-id", profile_id.encode()))
+        finally:
+            profiler.disable()
+            elapsed = time.perf_counter() - started
+            self._active = False
+            metadata = {
+                "created_at": datetime.now().isoformat(),
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": scope.get("query_string", b"").decode("latin-1"),
+                "route": getattr(scope.get("route"), "path", None),
+                "status": response_status["code"],
+                "duration_ms": round(elapsed * 1000, 3),
+                "user": getattr(user, "email", None),
+            }
+            try:
+                await asyncio.to_thread(self.store.save, profile_id, profiler, metadata)
+            except OSError as e:
+                logger.error(f"❌ Não foi possível gravar o perfil {profile_id}: {e}")
+
+    @staticmethod
+    def _add_header(send, name: bytes, value: bytes):
+        async def send_with_header(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (name, value)]
+            await send(message)
+        return send_with_header
+
+
+profile_store = ProfileStore(settings.PROFILING_DIR, settings.PROFILING_MAX_FILES)
@@ -1,11 +1,26 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
-from typing import Optional
+from functools import partial
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
 # Use SHA256 (sem limite de tamanho, mais estável)
-pwd_context = CryptContext(schemes=["sha256_crypt"], deprecated="auto")
+# min_rounds faz needs_update() marcar hashes mais fracos que o custo atual
+pwd_context = CryptContext(
+    schemes=["sha256_crypt"],
+    deprecated="auto",
+    sha256_crypt__default_rounds=settings.PASSWORD_HASH_ROUNDS,
+    sha256_crypt__min_rounds=settings.PASSWORD_HASH_ROUNDS
+)
+
+# Pool limitado de processos para o hash: o sha256_crypt (os_crypt) não libera
+# o GIL, então só processos separados mantêm o event loop livre durante logins
+_hash_executor: Optional[ProcessPoolExecutor] = None
 
 # Configuração JWT
 SECRET_KEY = settings.SECRET_KEY
@@ -20,6 +35,47 @@ def get_password_hash(password: str) -> str:
     """Gera hash da senha"""
     return pwd_context.hash(password)
 
+def _verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+def _get_hash_executor() -> ProcessPoolExecutor:
+    """Cria o pool sob demanda (nenhum processo é iniciado no import)"""
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _hash_executor
+
+def shutdown_hash_executor():
+    """Encerra os processos do pool de hash"""
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+
+async def _run_in_hash_pool(func, *args):
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_get_hash_executor(), partial(func, *args))
+    except BrokenProcessPool:
+        # Um worker morreu: recria o pool e tenta novamente uma vez
+        shutdown_hash_executor()
+        return await loop.run_in_executor(_get_hash_executor(), partial(func, *args))
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verifica a senha no pool de hash, sem bloquear o event loop"""
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Gera o hash da senha no pool de hash"""
+    return await _run_in_hash_pool(get_password_hash, password)
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verifica a senha e, se o hash estiver desatualizado, retorna o novo hash"""
+    return await _run_in_hash_pool(_verify_and_update, plain_password, hashed_password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Cria token JWT"""
     to_encode = data.copy()
@@ -0,0 +1,143 @@
+"""
+Cache com stale-while-revalidate para leituras das plataformas de anúncios
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple
+
+from cachetools import LRUCache
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+HIT = "hit"
+STALE = "stale"
+MISS = "miss"
+
+
+class SWRCache:
+    """
+    Cache LRU limitado em que cada leitura informa o próprio TTL:
+    - dentro do TTL: devolve o valor em cache (hit)
+    - até `max_stale` segundos depois: devolve o valor antigo (stale) e
+      dispara uma única atualização em segundo plano para a chave
+    - além disso (ou sem valor): busca na origem (miss); buscas simultâneas
+      da mesma chave compartilham a mesma chamada
+    Valores recusados por `cache_if` (ex.: fallbacks simulados) são devolvidos
+    sem entrar no cache.
+    """
+
+    def __init__(self, maxsize: int, max_stale: float):
+        self._entries: LRUCache = LRUCache(maxsize=maxsize)
+        self.max_stale = max_stale
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._refreshes: Set[asyncio.Task] = set()
+        self.counters = {HIT: 0, STALE: 0, MISS: 0, "refresh_errors": 0}
+
+    async def get_or_fetch(
+        self,
+        key: Hashable,
+        fetcher: Callable[[], Awaitable[Any]],
+        ttl: float,
+        cache_if: Optional[Callable[[Any], bool]] = None
+    ) -> Tuple[Any, Dict[str, Any]]:
+        """Retorna (valor, {"status", "age_seconds"})"""
+        entry = self._entries.get(key)
+        now = time.monotonic()
+
+        if entry is not None:
+            value, fetched_at = entry
+            age = now - fetched_at
+            if age < ttl:
+                return value, self._info(HIT, age)
+            if age < ttl + self.max_stale:
+                if key not in self._inflight:
+                    task = asyncio.create_task(self._refresh(key, fetcher, cache_if))
+                    self._refreshes.add(task)
+                    task.add_done_callback(self._refreshes.discard)
+                return value, self._info(STALE, age)
+
+        value = await self._fetch(key, fetcher, cache_if)
+        return value, self._info(MISS, 0.0)
+
+    def _info(self, status: str, age: float) -> Dict[str, Any]:
+        self.counters[status] += 1
+        return {"status": status, "age_seconds": round(age, 1)}
+
+    async def _fetch(
+        self,
+        key: Hashable,
+        fetcher: Callable[[], Awaitable[Any]],
+        cache_if: Optional[Callable[[Any], bool]] = None
+    ) -> Any:
+        """
+        Busca na origem com uma única chamada em andamento por chave. A chamada
+        roda numa tarefa própria: cancelar quem a disparou não cancela os demais
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_and_store(key, fetcher, cache_if))
+            # Evita o aviso de exceção não consumida quando ninguém mais espera
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _fetch_and_store(
+        self,
+        key: Hashable,
+        fetcher: Callable[[], Awaitable[Any]],
+        cache_if: Optional[Callable[[Any], bool]]
+    ) -> Any:
+        try:
+            value = await fetcher()
+            if cache_if is None or cache_if(value):
+                self._entries[key] = (value, time.monotonic())
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _refresh(
+        self,
+        key: Hashable,
+        fetcher: Callable[[], Awaitable[Any]],
+        cache_if: Optional[Callable[[Any], bool]]
+    ) -> None:
+        try:
+            await self._fetch(key, fetcher, cache_if)
+        except Exception as e:
+            # Mantém o valor antigo até expirar a janela de stale
+            self.counters["refresh_errors"] += 1
+            logger.warning(f"Falha ao atualizar cache {key!r}: {e}")
+
+    def invalidate_namespace(self, namespace: str) -> None:
+        """Remove as chaves cujo primeiro elemento é `namespace`"""
+        for key in [k for k in self._entries.keys() if isinstance(k, tuple) and k[:1] == (namespace,)]:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def aclose(self) -> None:
+        """Cancela as atualizações em segundo plano e as buscas pendentes"""
+        tasks = [*self._refreshes, *self._inflight.values()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.counters[HIT] + self.counters[STALE] + self.counters[MISS]
+        return {
+            **self.counters,
+            "hit_ratio": round((self.counters[HIT] + self.counters[STALE]) / total, 4) if total else 0,
+            "size": len(self._entries),
+            "maxsize": self._entries.maxsize,
+            "max_stale_seconds": self.max_stale,
+            "refreshing": len(self._refreshes)
+        }
+
+
+# Cache das leituras do Meta/Google Ads
+ads_cache = SWRCache(settings.ADS_CACHE_MAXSIZE, settings.ADS_CACHE_MAX_STALE_SECONDS)
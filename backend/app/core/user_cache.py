@@ -0,0 +1,58 @@
+"""
+Cache dos usuários resolvidos a partir do token (chave: subject do JWT)
+"""
+import threading
+from typing import Any, Dict, Optional
+
+from cachetools import TTLCache
+
+from app.core.config import settings
+from app.models.user import UserInDB
+
+
+class UserCache:
+    """Cache TTL + LRU limitado, com contadores de acerto/erro"""
+
+    def __init__(self, maxsize: int, ttl: int):
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, subject: str) -> Optional[UserInDB]:
+        with self._lock:
+            user = self._cache.get(subject)
+            if user is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return user
+
+    def set(self, subject: str, user: UserInDB) -> None:
+        with self._lock:
+            self._cache[subject] = user
+
+    def invalidate(self, subject: str) -> None:
+        """Remove o usuário do cache (chamado sempre que ele é alterado)"""
+        with self._lock:
+            self._cache.pop(subject, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0,
+                "size": len(self._cache),
+                "maxsize": self._cache.maxsize,
+                "ttl_seconds": self._cache.ttl
+            }
+
+
+# Instância global do cache
+user_cache = UserCache(settings.USER_CACHE_MAXSIZE, settings.USER_CACHE_TTL_SECONDS)
@@ -1,17 +1,118 @@
-from sqlalchemy import create_engine
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from app.core.config import settings
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./gestao_trafego.db"
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False}  # Necessário para SQLite
-)
+def normalize_url(url: str) -> str:
+    """Aceita o formato postgres:// (Heroku, Render, ...) como postgresql://"""
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql://", 1)
+    return url
+
+
+SQLALCHEMY_DATABASE_URL = normalize_url(settings.DATABASE_URL)
+
+
+def to_async_url(url: str) -> str:
+    """Converte a URL síncrona para o driver assíncrono equivalente"""
+    if url.startswith("sqlite:///"):
+        return url.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+    if url.startswith("postgresql+psycopg2://"):
+        return url.replace("postgresql+psycopg2://", "postgresql+asyncpg://", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+def _is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    return _is_sqlite(url) and make_url(url).database in (None, "", ":memory:")
+
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """Opções de pool do engine conforme o banco (o SQLite em memória usa pool estático)"""
+    options: Dict[str, Any] = {"echo": settings.DB_ECHO}
+    if _is_sqlite(url):
+        if make_url(url).get_driver_name() == "pysqlite":
+            options["connect_args"] = {"check_same_thread": False}  # Necessário para SQLite
+        if _is_memory_sqlite(url):
+            return options
+    else:
+        # Servidores derrubam conexões ociosas: testa antes de usar e renova periodicamente
+        options["pool_pre_ping"] = settings.DB_POOL_PRE_PING
+        options["pool_recycle"] = settings.DB_POOL_RECYCLE_SECONDS
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    )
+    return options
+
+
+def sqlite_pragmas() -> Dict[str, Any]:
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        # Valor negativo = tamanho em KiB
+        "cache_size": -settings.SQLITE_CACHE_SIZE_KB,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "temp_store": "MEMORY",
+    }
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in sqlite_pragmas().items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def configure_engine(engine: Engine) -> Engine:
+    """Aplica os PRAGMAs do SQLite em cada nova conexão do engine (síncrono ou o sync_engine do assíncrono)"""
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+
+def build_engine(url: str) -> Engine:
+    return configure_engine(create_engine(url, **engine_options(url)))
+
+
+def build_async_engine(url: str) -> AsyncEngine:
+    async_url = to_async_url(url)
+    async_engine = create_async_engine(async_url, **engine_options(async_url))
+    configure_engine(async_engine.sync_engine)
+    return async_engine
+
+
+# Engine síncrono: usado pelos scripts de manutenção (init_db, check_db, ...)
+engine = build_engine(SQLALCHEMY_DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Engine assíncrono: usado pelos routers para não bloquear o event loop
+async_engine = build_async_engine(SQLALCHEMY_DATABASE_URL)
+
+# expire_on_commit=False evita lazy-loads (proibidos em AsyncSession) após o commit
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 Base = declarative_base()
 
 def get_db():
@@ -20,3 +121,37 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def database_report(engine: AsyncEngine = async_engine) -> Dict[str, Any]:
+    """Conecta ao banco e descreve a configuração efetiva (verificação de inicialização)"""
+    pool = engine.sync_engine.pool
+    report: Dict[str, Any] = {
+        "url": engine.url.render_as_string(hide_password=True),
+        "backend": engine.dialect.name,
+        "driver": engine.dialect.driver,
+        "pool": type(pool).__name__,
+    }
+    if hasattr(pool, "size"):
+        report.update(
+            pool_size=pool.size(),
+            max_overflow=pool._max_overflow,
+            pool_timeout=pool._timeout,
+            pool_recycle=pool._recycle,
+            pre_ping=pool._pre_ping,
+        )
+
+    async with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            report["sqlite_version"] = (await conn.execute(text("SELECT sqlite_version()"))).scalar()
+            report["pragmas"] = {
+                name: (await conn.execute(text(f"PRAGMA {name}"))).scalar()
+                for name in sqlite_pragmas()
+            }
+        else:
+            report["server_version"] = (await conn.execute(text("SELECT version()"))).scalar()
+    return report
@@ -1,18 +1,102 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from datetime import datetime
 
 # Import routers
 from app.routers import campaigns, auth  # <-- Adicionado auth
+from app.routers.ads_router import router as ads_router
+from app.routers.profiling import router as profiling_router, authorize_profiling
+from app.routers.rules import router as rules_router
+from app.database import async_engine, database_report
+from app.core.security import shutdown_hash_executor
+from app.services.meta_graph_client import meta_graph_client
+from app.core.swr_cache import ads_cache
+from app.core.config import settings, print_settings_report
+from app.core.metrics import MetricsMiddleware, instrument_sqlalchemy, registry, CONTENT_TYPE
+from app.core.profiling import ProfilingMiddleware, profile_store
+from app.services.ads_sync import ads_sync_worker
+from app.services.rules_engine import rules_worker
+from app.services.ad_creative_generator import creative_generator
+from app.services.meta_ads_service import meta_ads_service
+
+logger = logging.getLogger(__name__)
+
+
+def print_database_report(report: dict) -> None:
+    print(f"🗄️ Banco de dados: {report['backend']} ({report['driver']}) em {report['url']}")
+    if "pool_size" in report:
+        print(
+            f"   pool {report['pool']}: size={report['pool_size']} overflow={report['max_overflow']} "
+            f"timeout={report['pool_timeout']}s recycle={report['pool_recycle']}s pre_ping={report['pre_ping']}"
+        )
+    else:
+        print(f"   pool {report['pool']}")
+    if "pragmas" in report:
+        print(f"   SQLite {report['sqlite_version']}: " + ", ".join(f"{k}={v}" for k, v in report["pragmas"].items()))
+    else:
+        print(f"   {report['server_version']}")
+
+
+def preload_services() -> None:
+    """Importa os módulos pesados usados sob demanda (roda numa thread após a subida)"""
+    import app.services.kpi_engine  # noqa: F401 (pandas/numpy)
+    if creative_generator.configured:
+        import openai  # noqa: F401
+    # Importa e inicializa o SDK do Facebook quando configurado
+    meta_ads_service.initialized
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    print_settings_report()
+    # Verifica a conexão na subida: falha logo se o banco estiver inacessível
+    try:
+        print_database_report(await database_report())
+    except Exception as e:
+        print(f"❌ Não foi possível conectar ao banco ({async_engine.url.render_as_string(hide_password=True)}): {e}")
+        raise
+    if settings.ADS_SYNC_ENABLED:
+        ads_sync_worker.start()
+    if settings.RULES_ENABLED:
+        rules_worker.start()
+    # O worker já atende enquanto os imports pesados acontecem em segundo plano
+    preload = asyncio.create_task(asyncio.to_thread(preload_services)) if settings.PRELOAD_SERVICES else None
+    print("✅ Sistema de Gestão de Tráfego Pago inicializado!")
+    print("🔗 Documentação: http://localhost:8000/docs")
+    print("🎯 APIs de Ads disponíveis em: /api/ads")
+    yield
+    if preload is not None:
+        try:
+            await preload
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao pré-carregar serviços: {e}")
+    await ads_sync_worker.stop()
+    await rules_worker.stop()
+    # Fecha as conexões do pool assíncrono (libera as threads do aiosqlite)
+    await async_engine.dispose()
+    shutdown_hash_executor()
+    await ads_cache.aclose()
+    await meta_graph_client.aclose()
+    await creative_generator.aclose()
+
 
 app = FastAPI(
     title="Gestão Tráfego Pago API",
     description="API para gerenciamento de campanhas de tráfego pago",
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
+if settings.PROFILING_ENABLED:
+    # Dentro do CORS: X-Profile-Id vai nas respostas ao front-end
+    app.add_middleware(ProfilingMiddleware, store=profile_store, authorize=authorize_profiling)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -20,11 +104,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Combinations", "ETag", "X-Profile-Id"],
 )
 
+if settings.METRICS_ENABLED:
+    # Adicionado por último = mais externo: mede também o tempo do CORS
+    app.add_middleware(MetricsMiddleware)
+    instrument_sqlalchemy()
+
 # Include routers
 app.include_router(campaigns.router)
 app.include_router(auth.router)  # <-- Adicionado
+app.include_router(ads_router)  # APIs de ads REAL
+app.include_router(profiling_router)
+app.include_router(rules_router)
 
 @app.get("/")
 async def root():
@@ -37,7 +130,9 @@ async def root():
         "endpoints": [
             "/campaigns - Gerenciamento de campanhas",
             "/auth - Autenticação de usuários",
-            "/health - Health check"
+            "/rules - Regras automáticas de campanhas",
+            "/health - Health check",
+            "/metrics - Métricas (Prometheus)"
         ]
     }
 
@@ -49,14 +144,14 @@ async def health_check():
         "service": "gestao-trafego-pago-api"
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Métricas do processo no formato de texto do Prometheus"""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Métricas desabilitadas")
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
 
-# Adicionar router de ads REAL
-from app.routers.ads_router import router as ads_router
-app.include_router(ads_router)
-
-print("✅ Sistema de Gestão de Tráfego Pago inicializado!")
-print("🔗 Documentação: http://localhost:8000/docs")
-print("🎯 APIs de Ads disponíveis em: /api/ads")
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, validator, ConfigDict
+from pydantic import BaseModel, Field, validator, model_validator, ConfigDict
 from datetime import datetime, date
 from typing import Optional, List
 from enum import Enum
@@ -64,15 +64,108 @@ class CampaignUpdate(BaseModel):
     status: Optional[CampaignStatus] = None
     end_date: Optional[date] = None
     target_audience: Optional[str] = None
+    
+    @validator('name', 'budget_amount', 'status')
+    def validate_not_null(cls, value):
+        # Colunas NOT NULL: omitir o campo mantém o valor, null explícito é erro
+        if value is None:
+            raise ValueError('Campo não pode ser nulo')
+        return value
+
+
+class CampaignFilter(BaseModel):
+    status: Optional[CampaignStatus] = None
+    platform: Optional[Platform] = None
+    start_date_from: Optional[date] = None
+    start_date_to: Optional[date] = None
+
+
+class CampaignBulkUpdate(BaseModel):
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=10000, description="Campanhas por ID")
+    filter: Optional[CampaignFilter] = Field(None, description="Campanhas pelo filtro ({} = todas)")
+    changes: CampaignUpdate = Field(..., description="Campos alterados em todas as campanhas")
+    return_ids: bool = Field(False, description="Inclui os IDs alterados na resposta")
+    
+    @model_validator(mode="after")
+    def validate_target(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Informe ids ou filter (apenas um)")
+        if not self.changes.model_fields_set:
+            raise ValueError("changes deve ter ao menos um campo")
+        return self
 
 
 class Campaign(CampaignBase):
     id: int
+    external_id: Optional[str] = Field(None, description="ID da campanha na plataforma (sincronizada)")
     created_at: datetime
     updated_at: datetime
     total_spent: float = Field(default=0.0, description="Total gasto até o momento")
     impressions: int = Field(default=0, description="Número de impressões")
     clicks: int = Field(default=0, description="Número de cliques")
     conversions: int = Field(default=0, description="Número de conversões")
+    conversion_value: float = Field(default=0.0, description="Receita atribuída às conversões")
     
     model_config = ConfigDict(from_attributes=True)
+    
+    # Campanhas sincronizadas podem ter o orçamento nos conjuntos de anúncios (0 na campanha)
+    budget_amount: float = Field(..., ge=0, description="Valor do orçamento")
+    
+    @validator('budget_amount')
+    def validate_budget(cls, budget_amount, values):
+        return round(budget_amount, 2)
+
+
+class DailyMetricCreate(BaseModel):
+    campaign_id: int = Field(..., gt=0)
+    metric_date: date = Field(..., alias="date", description="Dia de referência")
+    spend: float = Field(default=0.0, ge=0, description="Valor gasto no dia")
+    impressions: int = Field(default=0, ge=0)
+    clicks: int = Field(default=0, ge=0)
+    conversions: int = Field(default=0, ge=0)
+    conversion_value: float = Field(default=0.0, ge=0, description="Receita atribuída às conversões")
+    
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class SyntheticDataRequest(BaseModel):
+    # Limites do endpoint (volumes maiores: generate_synthetic_data.py)
+    campaigns: int = Field(1000, gt=0, le=10_000, description="Campanhas a gerar")
+    days: int = Field(30, ge=0, le=90, description="Dias de histórico de métricas por campanha")
+    seed: Optional[int] = Field(None, description="Semente para gerar sempre os mesmos dados")
+    replace: bool = Field(False, description="Apaga campanhas e métricas existentes antes")
+
+
+class MetricsGroupBy(str, Enum):
+    CAMPAIGN = "campaign"
+    DATE = "date"
+    PLATFORM = "platform"
+
+
+class CampaignFileFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class KpiSortField(str, Enum):
+    CTR = "ctr"
+    CPC = "cpc"
+    CONVERSION_RATE = "conversion_rate"
+    CPA = "cpa"
+    ROAS = "roas"
+    BUDGET_UTILIZATION = "budget_utilization"
+    TOTAL_SPENT = "total_spent"
+    CONVERSIONS = "conversions"
+
+
+class SortOrder(str, Enum):
+    ASC = "asc"
+    DESC = "desc"
+
+
+class PacingStatus(str, Enum):
+    ON_TRACK = "on_track"
+    OVER = "over"
+    UNDER = "under"
+    NOT_STARTED = "not_started"
+    NO_END_DATE = "no_end_date"  # Orçamento vitalício sem data de término
@@ -0,0 +1,95 @@
+from pydantic import BaseModel, Field, ConfigDict, validator
+from datetime import datetime
+from typing import Optional, List, Dict, Any
+from enum import Enum
+
+from app.models.campaign import Platform, CampaignStatus
+
+
+class RuleAction(str, Enum):
+    PAUSE = "pause"  # Campanhas ativas
+    ACTIVATE = "activate"  # Campanhas pausadas
+    ALERT = "alert"  # Só registra (campanhas ativas)
+
+
+class RuleMetric(str, Enum):
+    SPEND = "spend"
+    IMPRESSIONS = "impressions"
+    CLICKS = "clicks"
+    CONVERSIONS = "conversions"
+    CONVERSION_VALUE = "conversion_value"
+    CTR = "ctr"  # %
+    CPC = "cpc"
+    CONVERSION_RATE = "conversion_rate"  # %
+    CPA = "cpa"
+    ROAS = "roas"
+
+
+class RuleOperator(str, Enum):
+    GT = "gt"
+    GTE = "gte"
+    LT = "lt"
+    LTE = "lte"
+    EQ = "eq"
+
+
+class RuleCondition(BaseModel):
+    metric: RuleMetric
+    operator: RuleOperator
+    value: float
+
+
+class RuleBase(BaseModel):
+    name: str = Field(..., min_length=3, max_length=100, description="Nome da regra")
+    description: Optional[str] = Field(None, description="Descrição")
+    action: RuleAction = Field(..., description="Ação nas campanhas que satisfazem as condições")
+    conditions: List[RuleCondition] = Field(..., min_length=1, max_length=10, description="Todas precisam ser verdadeiras")
+    window_days: Optional[int] = Field(None, ge=1, le=365, description="Métricas dos últimos N dias (vazio = acumulado)")
+    platform: Optional[Platform] = Field(None, description="Só campanhas desta plataforma")
+    enabled: bool = Field(default=True, description="Avaliada pelo agendador")
+
+
+class RuleCreate(RuleBase):
+    pass
+
+
+class RuleUpdate(BaseModel):
+    name: Optional[str] = Field(None, min_length=3, max_length=100)
+    description: Optional[str] = None
+    action: Optional[RuleAction] = None
+    conditions: Optional[List[RuleCondition]] = Field(None, min_length=1, max_length=10)
+    window_days: Optional[int] = Field(None, ge=1, le=365)
+    platform: Optional[Platform] = None
+    enabled: Optional[bool] = None
+    
+    @validator('name', 'action', 'conditions', 'enabled')
+    def validate_not_null(cls, value):
+        # Omitir o campo mantém o valor, null explícito é erro
+        if value is None:
+            raise ValueError('Campo não pode ser nulo')
+        return value
+
+
+class Rule(RuleBase):
+    id: int
+    last_run_at: Optional[datetime] = None
+    last_matched: int = 0
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class RuleAuditEntry(BaseModel):
+    id: int
+    run_id: str
+    rule_id: Optional[int] = None
+    rule_name: str
+    campaign_id: int
+    action: RuleAction
+    previous_status: Optional[CampaignStatus] = None
+    new_status: Optional[CampaignStatus] = None
+    metrics: Optional[Dict[str, Any]] = None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,17 +1,38 @@
 """
 Router REAL para APIs de Ads com Meta e Google Ads
 """
+import asyncio
 from fastapi import APIRouter, HTTPException, Depends, status
-from typing import Dict, Any, List
-from pydantic import BaseModel, Field
-from datetime import datetime, timedelta
+from fastapi.responses import StreamingResponse
+from typing import Dict, Any, List, Optional
+from pydantic import BaseModel, Field, model_validator
+from datetime import datetime, timedelta, date
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.swr_cache import ads_cache
+from app.database import get_async_db
+from app.models.user import UserInDB
+from app.routers.auth import get_current_active_admin
 from app.services.meta_ads_service import meta_ads_service
+from app.services.meta_rate_limiter import meta_rate_limiter
+from app.services.ads_sync import (
+    ads_sync_worker, list_synced_campaigns, synced_campaign_insights, get_sync_states
+)
 # from app.services.google_ads_service import google_ads_service  # Adicionaremos depois
-from app.services.ad_creative_generator import generate_ad_creative  # Vamos criar
+from app.services.ad_creative_generator import creative_generator
+from app.services.creative_templates import creative_templates
 
 router = APIRouter(prefix="/api/ads", tags=["Ads"])
 
+
+def is_real_meta_data(value: Any) -> bool:
+    """Dados simulados (SDK sem configuração ou com erro) não entram no cache"""
+    items = value if isinstance(value, list) else [value]
+    return not any(item.get("simulated") for item in items)
+
+
 # Models Pydantic
 class CampaignCreate(BaseModel):
     name: str = Field(..., min_length=3, max_length=200)
@@ -19,11 +40,46 @@ class CampaignCreate(BaseModel):
     daily_budget: float = Field(default=50.0, gt=0)
     status: str = Field(default="PAUSED", pattern="^(PAUSED|ACTIVE)$")
 
+class InsightsBulkRequest(BaseModel):
+    campaign_ids: List[str] = Field(..., min_length=1, max_length=5000)
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    days: int = Field(default=7, ge=1, le=365)
+    time_increment: Optional[int] = Field(default=None, ge=1, le=90)
+
+    @model_validator(mode="after")
+    def check_period(self):
+        if self.date_from and self.date_to and self.date_from > self.date_to:
+            raise ValueError("date_from deve ser anterior ou igual a date_to")
+        return self
+
+    def date_range(self):
+        """Período explícito ou os últimos `days` dias até hoje"""
+        until = self.date_to or date.today()
+        since = self.date_from or until - timedelta(days=self.days - 1)
+        return since, until
+
 class CreativeRequest(BaseModel):
     product: str
     target_audience: str
     tone: str = "profissional"
     platform: str = "meta"
+    variants: Optional[int] = Field(default=None, ge=1, le=10, description="Padrão: CREATIVE_VARIANTS")
+
+class CreativeItem(BaseModel):
+    product: str
+    target_audience: str
+    tone: str = "profissional"
+    platform: str = "meta"
+
+class CreativeBatchRequest(BaseModel):
+    items: List[CreativeItem] = Field(..., min_length=1, max_length=200)
+    variants: Optional[int] = Field(default=None, ge=1, le=10, description="Padrão: CREATIVE_VARIANTS")
+
+class CreativeVariantsRequest(CreativeItem):
+    limit: int = Field(default=1000, ge=1, le=100000)
+    offset: int = Field(default=0, ge=0)
+    seed: Optional[int] = Field(default=None, description="Mesma semente, mesmas variações (sem seed: ordem das combinações)")
 
 class SegmentAnalysisRequest(BaseModel):
     demographics: Dict[str, Any]
@@ -32,16 +88,34 @@ class SegmentAnalysisRequest(BaseModel):
 
 # Meta Ads Endpoints
 @router.get("/meta/campaigns")
-async def get_meta_campaigns(limit: int = 10):
+async def get_meta_campaigns(limit: int = 10, db: AsyncSession = Depends(get_async_db)):
     """Lista campanhas reais do Meta Ads"""
-    campaigns = meta_ads_service.get_campaigns(limit=limit)
+    if settings.ADS_SYNC_ENABLED:
+        campaigns = await list_synced_campaigns(db, limit)
+        return {
+            "platform": "meta",
+            "count": len(campaigns),
+            "campaigns": campaigns,
+            "has_real_connection": meta_ads_service.initialized,
+            "timestamp": datetime.now().isoformat(),
+            "source": "database"
+        }
+    
+    # O SDK é síncrono: a chamada roda em thread para não travar o event loop
+    campaigns, cache = await ads_cache.get_or_fetch(
+        ("meta_campaigns", limit),
+        lambda: asyncio.to_thread(meta_ads_service.get_campaigns, limit=limit),
+        ttl=settings.ADS_CACHE_CAMPAIGNS_TTL_SECONDS,
+        cache_if=is_real_meta_data
+    )
     
     return {
         "platform": "meta",
         "count": len(campaigns),
         "campaigns": campaigns,
         "has_real_connection": meta_ads_service.initialized,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": datetime.now().isoformat(),
+        "cache": cache
     }
 
 @router.post("/meta/campaigns")
@@ -53,6 +127,8 @@ async def create_meta_campaign(campaign: CampaignCreate):
         "daily_budget": campaign.daily_budget,
         "status": campaign.status
     })
+    if result["success"]:
+        ads_cache.invalidate_namespace("meta_campaigns")
     
     return {
         "success": result["success"],
@@ -63,33 +139,105 @@ async def create_meta_campaign(campaign: CampaignCreate):
     }
 
 @router.get("/meta/campaigns/{campaign_id}/insights")
-async def get_campaign_insights(campaign_id: str, days: int = 7):
+async def get_campaign_insights(campaign_id: str, days: int = 7, db: AsyncSession = Depends(get_async_db)):
     """Busca insights de performance da campanha"""
-    insights = meta_ads_service.get_campaign_insights(campaign_id, days)
+    if settings.ADS_SYNC_ENABLED:
+        insights = await synced_campaign_insights(db, campaign_id, days)
+        if insights is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Campanha não sincronizada"
+            )
+        return {
+            "campaign_id": campaign_id,
+            "insights": insights,
+            "period_days": days,
+            "platform": "meta",
+            "source": "database"
+        }
+    
+    insights, cache = await ads_cache.get_or_fetch(
+        ("meta_insights", campaign_id, days),
+        lambda: asyncio.to_thread(meta_ads_service.get_campaign_insights, campaign_id, days),
+        ttl=settings.ADS_CACHE_INSIGHTS_TTL_SECONDS,
+        cache_if=is_real_meta_data
+    )
     
     return {
         "campaign_id": campaign_id,
         "insights": insights,
         "period_days": days,
+        "platform": "meta",
+        "cache": cache
+    }
+
+@router.post("/meta/insights/bulk")
+async def get_insights_bulk(request: InsightsBulkRequest):
+    """Busca insights de várias campanhas em poucas requisições à Graph API"""
+    date_from, date_to = request.date_range()
+    insights = await meta_ads_service.get_insights_bulk(
+        request.campaign_ids, (date_from, date_to), time_increment=request.time_increment
+    )
+    
+    return {
+        "count": len(insights),
+        "date_from": date_from,
+        "date_to": date_to,
+        "time_increment": request.time_increment,
+        "insights": list(insights.values()),
         "platform": "meta"
     }
 
+# Sincronização com as plataformas
+@router.get("/sync/status")
+async def get_sync_status(db: AsyncSession = Depends(get_async_db)):
+    """Estado da sincronização por conta (marca d'água e última execução)"""
+    states = await get_sync_states(db)
+    
+    return {
+        "enabled": settings.ADS_SYNC_ENABLED,
+        "running": ads_sync_worker.running,
+        "interval_seconds": settings.ADS_SYNC_INTERVAL_SECONDS,
+        "accounts": [
+            {
+                "platform": state.platform,
+                "account_id": state.account_id,
+                "watermark_date": state.watermark_date,
+                "last_run_at": state.last_run_at,
+                "last_success_at": state.last_success_at,
+                "last_error": state.last_error,
+                "campaigns_synced": state.campaigns_synced,
+                "metrics_rows_synced": state.metrics_rows_synced
+            }
+            for state in states
+        ]
+    }
+
+@router.post("/sync/run")
+async def run_sync(admin: UserInDB = Depends(get_current_active_admin)):
+    """Executa uma sincronização imediata (apenas admin)"""
+    results = await ads_sync_worker.run_once()
+    return {"results": results}
+
 # Gerador de Criativos com IA
 @router.post("/generate-creative")
 async def generate_creative(request: CreativeRequest):
     """Gera texto criativo para anúncios usando IA"""
-    creative = generate_ad_creative(
+    result = await creative_generator.generate(
         product=request.product,
         target_audience=request.target_audience,
         tone=request.tone,
-        platform=request.platform
+        platform=request.platform,
+        variants=request.variants
     )
     
     return {
         "platform": request.platform,
         "product": request.product,
         "audience": request.target_audience,
-        "creative": creative,
+        "creative": result["variants"][0],
+        "variants": result["variants"],
+        "cache": result["cache"],
         "generated_at": datetime.now().isoformat(),
         "tips": [
             "Use imagens de alta qualidade (1080x1080 para Instagram, 1200x628 para Facebook)",
@@ -99,6 +247,41 @@ async def generate_creative(request: CreativeRequest):
         ]
     }
 
+@router.post("/generate-creative/batch")
+async def generate_creative_batch(request: CreativeBatchRequest):
+    """Gera criativos para vários produtos de uma vez (chamadas em paralelo, com cache)"""
+    results = await creative_generator.generate_batch(
+        [item.model_dump() for item in request.items],
+        variants=request.variants
+    )
+    
+    return {
+        "count": len(results),
+        "results": [
+            {**item.model_dump(), "variants": result["variants"], "cache": result["cache"]}
+            for item, result in zip(request.items, results)
+        ],
+        "generated_at": datetime.now().isoformat()
+    }
+
+@router.post("/generate-creative/variants")
+async def generate_creative_variants(request: CreativeVariantsRequest):
+    """Variações A/B por templates (headline × descrição × CTA × hashtags × texto), em NDJSON"""
+    total = creative_templates.total_combinations(request.tone)
+    return StreamingResponse(
+        creative_templates.iter_ndjson(
+            request.product,
+            request.target_audience,
+            tone=request.tone,
+            platform=request.platform,
+            limit=request.limit,
+            seed=request.seed,
+            offset=request.offset
+        ),
+        media_type="application/x-ndjson",
+        headers={"X-Total-Combinations": str(total)}
+    )
+
 # Análise de Segmento
 @router.post("/analyze-segment")
 async def analyze_segment(request: SegmentAnalysisRequest):
@@ -185,11 +368,18 @@ async def ads_health():
     return {
         "meta_ads": {
             "connected": meta_ads_service.initialized,
-            "status": "operational" if meta_ads_service.initialized else "needs_config"
+            "status": "operational" if meta_ads_service.initialized else "needs_config",
+            "rate_limit": meta_rate_limiter.stats()
         },
         "google_ads": {
             "connected": False,
             "status": "not_implemented"
         },
+        "cache": ads_cache.stats(),
+        "openai": {
+            "connected": creative_generator.configured,
+            "concurrency": creative_generator.concurrency,
+            "cache": creative_generator.cache.stats()
+        },
         "timestamp": datetime.now().isoformat()
     }
@@ -1,18 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 from typing import List
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models.user import User, UserCreate, UserLogin, Token, UserUpdate, UserInDB
 from app.schemas.user_db import UserDB
 from app.core.security import (
-    verify_password, get_password_hash, 
+    verify_password_async, get_password_hash_async, verify_and_update_password,
     create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES,
     decode_access_token
 )
 from app.core.config import settings
+from app.core.user_cache import user_cache
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
@@ -20,17 +22,26 @@ router = APIRouter(prefix="/auth", tags=["authentication"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 # --- Helper Functions ---
-def authenticate_user(db: Session, email: str, password: str):
+async def authenticate_user(db: AsyncSession, email: str, password: str):
     """Autentica usuário pelo email e senha"""
-    user = db.query(UserDB).filter(UserDB.email == email).first()
+    result = await db.execute(select(UserDB).where(UserDB.email == email))
+    user = result.scalars().first()
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    
+    valid, new_hash = await verify_and_update_password(password, user.hashed_password)
+    if not valid:
         return None
+    
+    # Atualiza transparentemente hashes gerados com custo antigo
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+        user_cache.invalidate(user.email)
     return user
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
-    """Obtém usuário atual a partir do token"""
+async def get_current_user(db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)):
+    """Obtém usuário atual a partir do token (snapshot em cache, não anexado à sessão)"""
     payload = decode_access_token(token)
     if payload is None:
         raise HTTPException(
@@ -47,13 +58,19 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = db.query(UserDB).filter(UserDB.email == email).first()
+    # Em regime permanente o usuário vem do cache, sem ida ao banco
+    user = user_cache.get(email)
     if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Usuário não encontrado",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        result = await db.execute(select(UserDB).where(UserDB.email == email))
+        db_user = result.scalars().first()
+        if db_user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Usuário não encontrado",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        user = UserInDB.model_validate(db_user)
+        user_cache.set(email, user)
     
     if not user.is_active:
         raise HTTPException(
@@ -64,7 +81,7 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_
     
     return user
 
-def get_current_active_admin(current_user: UserDB = Depends(get_current_user)):
+async def get_current_active_admin(current_user: UserInDB = Depends(get_current_user)):
     """Verifica se usuário atual é admin"""
     if current_user.role != "admin":
         raise HTTPException(
@@ -75,10 +92,11 @@ def get_current_active_admin(current_user: UserDB = Depends(get_current_user)):
 
 # --- Endpoints Públicos ---
 @router.post("/register", response_model=User, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Registra um novo usuário"""
     # Verifica se email já existe
-    existing_user = db.query(UserDB).filter(UserDB.email == user_data.email).first()
+    result = await db.execute(select(UserDB).where(UserDB.email == user_data.email))
+    existing_user = result.scalars().first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -89,21 +107,21 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     db_user = UserDB(
         email=user_data.email,
         full_name=user_data.full_name,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=await get_password_hash_async(user_data.password),
         role=user_data.role,
         is_active=user_data.is_active
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     return db_user
 
 @router.post("/login", response_model=Token)
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
     """Login de usuário (retorna token JWT)"""
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     
     if not user:
         raise HTTPException(
@@ -130,7 +148,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
 
 # --- Endpoints Protegidos ---
 @router.get("/me", response_model=User)
-async def get_me(current_user: UserDB = Depends(get_current_user)):
+async def get_me(current_user: UserInDB = Depends(get_current_user)):
     """Retorna informações do usuário atual"""
     return current_user
 
@@ -138,60 +156,65 @@ async def get_me(current_user: UserDB = Depends(get_current_user)):
 async def change_password(
     current_password: str,
     new_password: str,
-    current_user: UserDB = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserInDB = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Altera senha do usuário atual"""
     # Verifica senha atual
-    if not verify_password(current_password, current_user.hashed_password):
+    if not await verify_password_async(current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Senha atual incorreta"
         )
     
     # Atualiza senha
-    current_user.hashed_password = get_password_hash(new_password)
-    db.commit()
+    user = await db.get(UserDB, current_user.id)
+    user.hashed_password = await get_password_hash_async(new_password)
+    await db.commit()
+    user_cache.invalidate(user.email)
     
     return {"message": "Senha alterada com sucesso"}
 
 @router.put("/me", response_model=User)
 async def update_me(
     user_update: UserUpdate,
-    current_user: UserDB = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserInDB = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Atualiza informações do usuário atual"""
+    user = await db.get(UserDB, current_user.id)
     update_data = user_update.dict(exclude_unset=True)
     
     for key, value in update_data.items():
-        setattr(current_user, key, value)
+        setattr(user, key, value)
     
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(user)
+    user_cache.invalidate(user.email)
     
-    return current_user
+    return user
 
 # --- Endpoints Admin ---
 @router.get("/users", response_model=List[User])
 async def list_users(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    admin: UserDB = Depends(get_current_active_admin)
+    db: AsyncSession = Depends(get_async_db),
+    admin: UserInDB = Depends(get_current_active_admin)
 ):
     """Lista todos os usuários (apenas admin)"""
-    users = db.query(UserDB).offset(skip).limit(limit).all()
+    result = await db.execute(select(UserDB).offset(skip).limit(limit))
+    users = result.scalars().all()
     return users
 
 @router.get("/users/{user_id}", response_model=User)
 async def get_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    admin: UserDB = Depends(get_current_active_admin)
+    db: AsyncSession = Depends(get_async_db),
+    admin: UserInDB = Depends(get_current_active_admin)
 ):
     """Busca usuário por ID (apenas admin)"""
-    user = db.query(UserDB).filter(UserDB.id == user_id).first()
+    user = await db.get(UserDB, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -203,11 +226,11 @@ async def get_user(
 async def update_user(
     user_id: int,
     user_update: UserUpdate,
-    db: Session = Depends(get_db),
-    admin: UserDB = Depends(get_current_active_admin)
+    db: AsyncSession = Depends(get_async_db),
+    admin: UserInDB = Depends(get_current_active_admin)
 ):
     """Atualiza usuário (apenas admin)"""
-    user = db.query(UserDB).filter(UserDB.id == user_id).first()
+    user = await db.get(UserDB, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -219,26 +242,33 @@ async def update_user(
     for key, value in update_data.items():
         setattr(user, key, value)
     
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    user_cache.invalidate(user.email)
     
     return user
 
 @router.delete("/users/{user_id}")
 async def delete_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    admin: UserDB = Depends(get_current_active_admin)
+    db: AsyncSession = Depends(get_async_db),
+    admin: UserInDB = Depends(get_current_active_admin)
 ):
     """Remove usuário (apenas admin)"""
-    user = db.query(UserDB).filter(UserDB.id == user_id).first()
+    user = await db.get(UserDB, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Usuário não encontrado"
         )
     
-    db.delete(user)
-    db.commit()
+    await db.delete(user)
+    await db.commit()
+    user_cache.invalidate(user.email)
     
     return {"message": "Usuário removido com sucesso"}
+
+@router.get("/cache/stats")
+async def get_user_cache_stats(admin: UserInDB = Depends(get_current_active_admin)):
+    """Estatísticas do cache de usuários autenticados (apenas admin)"""
+    return user_cache.stats()
@@ -1,13 +1,28 @@
-from fastapi import APIRouter, HTTPException, Query, Depends, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Header, Query, Depends, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, update, delete, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime, date
-import statistics
+import base64
+import json
 
-from app.database import get_db
+from app.core.broadcaster import campaign_events
+from app.core.config import settings
+from app.core.etag import check_etag
+from app.database import get_async_db
 from app.schemas.campaign_db import CampaignDB, PlatformEnum, CampaignStatus, BudgetType
+from app.schemas.campaign_metrics_db import CampaignDailyMetricsDB
 from app.models.campaign import (
-    Campaign, CampaignCreate, CampaignUpdate
+    Campaign, CampaignCreate, CampaignUpdate, DailyMetricCreate, MetricsGroupBy,
+    CampaignFileFormat, KpiSortField, SortOrder, SyntheticDataRequest, PacingStatus, CampaignBulkUpdate
+)
+from app.models.user import UserInDB
+from app.routers.auth import get_current_active_admin
+from app.services.campaign_io import campaign_to_row, bulk_import_campaigns, export_campaigns
+from app.services.campaign_versions import bump_campaigns_version, campaigns_version
+from app.services.campaign_metrics import (
+    upsert_daily_metrics, aggregate_campaign_period, aggregate_period, platform_summaries
 )
 
 router = APIRouter(
@@ -16,38 +31,155 @@ router = APIRouter(
     responses={404: {"description": "Não encontrado"}}
 )
 
+# Acima disso o evento de métricas leva só a contagem (o cliente recarrega)
+MAX_EVENT_ITEMS = 500
+
 # --- CRUD Operations com Banco de Dados ---
 
-@router.get("/", response_model=List[Campaign])
-async def list_campaigns(
-    db: Session = Depends(get_db),
-    skip: int = Query(0, ge=0),
-    limit: int = Query(10, ge=1, le=100),
+def _encode_cursor(campaign: CampaignDB) -> str:
+    """Cursor opaco com a posição (start_date, id) do último item da página"""
+    raw = json.dumps([campaign.start_date.isoformat(), campaign.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str):
+    try:
+        start_date, campaign_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(start_date), int(campaign_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido"
+        )
+
+
+def _apply_filters(
+    query,
     status: Optional[CampaignStatus] = None,
     platform: Optional[PlatformEnum] = None,
     start_date_from: Optional[date] = None,
     start_date_to: Optional[date] = None
 ):
-    """Lista campanhas com filtros opcionais"""
-    query = db.query(CampaignDB)
-    
     if status:
-        query = query.filter(CampaignDB.status == status)
+        query = query.where(CampaignDB.status == status)
     if platform:
-        query = query.filter(CampaignDB.platform == platform)
+        query = query.where(CampaignDB.platform == platform)
     if start_date_from:
-        query = query.filter(CampaignDB.start_date >= start_date_from)
+        query = query.where(CampaignDB.start_date >= start_date_from)
     if start_date_to:
-        query = query.filter(CampaignDB.start_date <= start_date_to)
+        query = query.where(CampaignDB.start_date <= start_date_to)
+    return query
+
+
+async def _campaigns_watermark(db: AsyncSession) -> tuple:
+    """Versão da tabela campaigns: incrementada na transação de cada insert, update ou delete"""
+    return (await campaigns_version(db),)
+
+
+@router.get("/", response_model=List[Campaign])
+async def list_campaigns(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Valor de X-Next-Cursor da página anterior"),
+    status: Optional[CampaignStatus] = None,
+    platform: Optional[PlatformEnum] = None,
+    start_date_from: Optional[date] = None,
+    start_date_to: Optional[date] = None
+):
+    """
+    Lista campanhas com filtros opcionais, ordenadas por (start_date, id).
+    Quando a página vem cheia, o header X-Next-Cursor traz o cursor da próxima.
+    """
+    check_etag(request, response, *await _campaigns_watermark(db))
+    query = _apply_filters(select(CampaignDB), status, platform, start_date_from, start_date_to)
+    
+    if cursor:
+        if skip:
+            raise HTTPException(
+                status_code=400,
+                detail="Use skip ou cursor, não ambos"
+            )
+        query = query.where(
+            tuple_(CampaignDB.start_date, CampaignDB.id) > tuple_(*_decode_cursor(cursor))
+        )
+    
+    query = query.order_by(CampaignDB.start_date, CampaignDB.id)
+    result = await db.execute(query.offset(skip).limit(limit))
+    campaigns = result.scalars().all()
+    
+    if len(campaigns) == limit:
+        response.headers["X-Next-Cursor"] = _encode_cursor(campaigns[-1])
     
-    campaigns = query.offset(skip).limit(limit).all()
     return campaigns
 
 
+@router.get("/export")
+async def export_campaigns_file(
+    format: CampaignFileFormat = CampaignFileFormat.NDJSON,
+    status: Optional[CampaignStatus] = None,
+    platform: Optional[PlatformEnum] = None,
+    start_date_from: Optional[date] = None,
+    start_date_to: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Exporta campanhas em streaming (NDJSON ou CSV)"""
+    query = _apply_filters(
+        select(*CampaignDB.__table__.columns), status, platform, start_date_from, start_date_to
+    ).order_by(CampaignDB.id)
+    
+    media_type = "text/csv" if format == CampaignFileFormat.CSV else "application/x-ndjson"
+    return StreamingResponse(
+        export_campaigns(db, query, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="campaigns.{format.value}"'}
+    )
+
+
+@router.get("/stream")
+async def stream_campaign_events(last_event_id: Optional[int] = Header(None)):
+    """
+    Server-Sent Events com as mudanças em campanhas e métricas. Eventos:
+    campaign.created/updated/paused/activated/deleted, metrics.updated,
+    campaigns.imported, campaigns.reset, campaigns.synced e resync (o cliente deve recarregar).
+    """
+    return StreamingResponse(
+        campaign_events.stream(last_event_id, heartbeat=settings.EVENTS_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/pacing")
+async def get_pacing(
+    platform: Optional[PlatformEnum] = None,
+    pacing_status: Optional[List[PacingStatus]] = Query(None, description="Filtra as campanhas listadas"),
+    top: Optional[int] = Query(None, ge=1, le=10000, description="Retorna só as N com maior desvio"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Pacing das campanhas ativas: gasto esperado x realizado, com alertas de over/under"""
+    # pandas/numpy só são importados no primeiro uso (ou no preload do lifespan)
+    from app.services.pacing import pacing_engine, pacing_report_json
+
+    now = datetime.now()
+    frame = await pacing_engine.report(db, now)
+    return Response(
+        content=pacing_report_json(frame, now, pacing_engine.tolerance, platform, pacing_status, top),
+        media_type="application/json"
+    )
+
+
 @router.get("/{campaign_id}", response_model=Campaign)
-async def get_campaign(campaign_id: int, db: Session = Depends(get_db)):
+async def get_campaign(
+    campaign_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
     """Busca uma campanha específica pelo ID"""
-    campaign = db.query(CampaignDB).filter(CampaignDB.id == campaign_id).first()
+    campaign = await db.get(CampaignDB, campaign_id)
     
     if not campaign:
         raise HTTPException(
@@ -55,48 +187,90 @@ async def get_campaign(campaign_id: int, db: Session = Depends(get_db)):
             detail=f"Campanha {campaign_id} não encontrada"
         )
     
+    check_etag(request, response, campaign.id, campaign.version, campaign.updated_at)
     return campaign
 
 
 @router.post("/", response_model=Campaign, status_code=status.HTTP_201_CREATED)
-async def create_campaign(campaign: CampaignCreate, db: Session = Depends(get_db)):
+async def create_campaign(campaign: CampaignCreate, db: AsyncSession = Depends(get_async_db)):
     """Cria uma nova campanha"""
-    
-    # Converte date para datetime para o banco
-    start_datetime = datetime.combine(campaign.start_date, datetime.min.time())
-    end_datetime = datetime.combine(campaign.end_date, datetime.min.time()) if campaign.end_date else None
-    
-    db_campaign = CampaignDB(
-        name=campaign.name,
-        platform=campaign.platform,
-        budget_type=campaign.budget_type,
-        budget_amount=campaign.budget_amount,
-        start_date=start_datetime,
-        end_date=end_datetime,
-        status=campaign.status,
-        target_audience=campaign.target_audience,
-        keywords=campaign.keywords,
-        bid_strategy=campaign.bid_strategy,
-        creative_url=campaign.creative_url,
-        created_at=datetime.now(),
-        updated_at=datetime.now()
-    )
+    db_campaign = CampaignDB(**campaign_to_row(campaign))
+    db_campaign.version = await bump_campaigns_version(db)
     
     db.add(db_campaign)
-    db.commit()
-    db.refresh(db_campaign)
+    await db.commit()
+    await db.refresh(db_campaign)
     
+    campaign_events.publish("campaign.created", Campaign.model_validate(db_campaign))
     return db_campaign
 
 
+@router.post("/bulk")
+async def bulk_create_campaigns(
+    request: Request,
+    format: Optional[CampaignFileFormat] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Importa campanhas em lote a partir de NDJSON ou CSV (corpo em streaming).
+    O formato vem de ?format= ou do Content-Type; retorna o relatório de erros por linha.
+    """
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = CampaignFileFormat.CSV if "csv" in content_type else CampaignFileFormat.NDJSON
+    
+    report = await bulk_import_campaigns(db, request.stream(), format)
+    if report["inserted"]:
+        campaign_events.publish("campaigns.imported", {"inserted": report["inserted"]})
+    return report
+
+
+@router.patch("/bulk")
+async def bulk_update_campaigns(request: CampaignBulkUpdate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Atualiza várias campanhas (por IDs ou filtro) com um único UPDATE na mesma transação.
+    Retorna a quantidade alterada e, com return_ids, os IDs.
+    """
+    update_data = request.changes.model_dump(exclude_unset=True)
+    if update_data.get('end_date'):
+        update_data['end_date'] = datetime.combine(update_data['end_date'], datetime.min.time())
+    now = datetime.now()
+    
+    version = await bump_campaigns_version(db)
+    stmt = update(CampaignDB).values(**update_data, updated_at=now, version=version)
+    if request.ids is not None:
+        stmt = stmt.where(CampaignDB.id.in_(request.ids))
+    else:
+        stmt = _apply_filters(stmt, **request.filter.model_dump())
+    result = await db.execute(stmt.returning(CampaignDB.id).execution_options(synchronize_session=False))
+    updated_ids = sorted(result.scalars().all())
+    await db.commit()
+    
+    if updated_ids:
+        campaign_events.publish("campaigns.bulk_updated", {
+            "changes": update_data,
+            "updated": len(updated_ids),
+            # Acima do limite o evento leva só a contagem (o cliente recarrega)
+            "campaigns": updated_ids if len(updated_ids) <= MAX_EVENT_ITEMS else None,
+            "updated_at": now
+        })
+    
+    report = {"updated": len(updated_ids)}
+    if request.ids is not None:
+        report["not_found_ids"] = sorted(set(request.ids) - set(updated_ids))
+    if request.return_ids:
+        report["ids"] = updated_ids
+    return report
+
+
 @router.put("/{campaign_id}", response_model=Campaign)
 async def update_campaign(
     campaign_id: int, 
     campaign_update: CampaignUpdate, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Atualiza uma campanha existente"""
-    db_campaign = db.query(CampaignDB).filter(CampaignDB.id == campaign_id).first()
+    db_campaign = await db.get(CampaignDB, campaign_id)
     
     if not db_campaign:
         raise HTTPException(
@@ -115,16 +289,23 @@ async def update_campaign(
         setattr(db_campaign, key, value)
     
     db_campaign.updated_at = datetime.now()
-    db.commit()
-    db.refresh(db_campaign)
-    
+    db_campaign.version = await bump_campaigns_version(db)
+    await db.commit()
+    await db.refresh(db_campaign)
+    
+    # Só os campos alterados
+    campaign_events.publish("campaign.updated", {
+        "id": campaign_id,
+        "changes": update_data,
+        "updated_at": db_campaign.updated_at
+    })
     return db_campaign
 
 
 @router.delete("/{campaign_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_campaign(campaign_id: int, db: Session = Depends(get_db)):
+async def delete_campaign(campaign_id: int, db: AsyncSession = Depends(get_async_db)):
     """Remove uma campanha"""
-    db_campaign = db.query(CampaignDB).filter(CampaignDB.id == campaign_id).first()
+    db_campaign = await db.get(CampaignDB, campaign_id)
     
     if not db_campaign:
         raise HTTPException(
@@ -132,16 +313,21 @@ async def delete_campaign(campaign_id: int, db: Session = Depends(get_db)):
             detail=f"Campanha {campaign_id} não encontrada"
         )
     
-    db.delete(db_campaign)
-    db.commit()
+    await db.execute(
+        delete(CampaignDailyMetricsDB).where(CampaignDailyMetricsDB.campaign_id == campaign_id)
+    )
+    await db.delete(db_campaign)
+    await bump_campaigns_version(db)
+    await db.commit()
     
+    campaign_events.publish("campaign.deleted", {"id": campaign_id})
     return None
 
 
 @router.post("/{campaign_id}/pause", response_model=Campaign)
-async def pause_campaign(campaign_id: int, db: Session = Depends(get_db)):
+async def pause_campaign(campaign_id: int, db: AsyncSession = Depends(get_async_db)):
     """Pausa uma campanha"""
-    db_campaign = db.query(CampaignDB).filter(CampaignDB.id == campaign_id).first()
+    db_campaign = await db.get(CampaignDB, campaign_id)
     
     if not db_campaign:
         raise HTTPException(
@@ -151,16 +337,20 @@ async def pause_campaign(campaign_id: int, db: Session = Depends(get_db)):
     
     db_campaign.status = CampaignStatus.PAUSED
     db_campaign.updated_at = datetime.now()
-    db.commit()
-    db.refresh(db_campaign)
+    db_campaign.version = await bump_campaigns_version(db)
+    await db.commit()
+    await db.refresh(db_campaign)
     
+    campaign_events.publish("campaign.paused", {
+        "id": campaign_id, "status": db_campaign.status, "updated_at": db_campaign.updated_at
+    })
     return db_campaign
 
 
 @router.post("/{campaign_id}/activate", response_model=Campaign)
-async def activate_campaign(campaign_id: int, db: Session = Depends(get_db)):
+async def activate_campaign(campaign_id: int, db: AsyncSession = Depends(get_async_db)):
     """Ativa uma campanha"""
-    db_campaign = db.query(CampaignDB).filter(CampaignDB.id == campaign_id).first()
+    db_campaign = await db.get(CampaignDB, campaign_id)
     
     if not db_campaign:
         raise HTTPException(
@@ -170,18 +360,111 @@ async def activate_campaign(campaign_id: int, db: Session = Depends(get_db)):
     
     db_campaign.status = CampaignStatus.ACTIVE
     db_campaign.updated_at = datetime.now()
-    db.commit()
-    db.refresh(db_campaign)
+    db_campaign.version = await bump_campaigns_version(db)
+    await db.commit()
+    await db.refresh(db_campaign)
     
+    campaign_events.publish("campaign.activated", {
+        "id": campaign_id, "status": db_campaign.status, "updated_at": db_campaign.updated_at
+    })
     return db_campaign
 
 
 # --- Analytics & Reports ---
 
+def _validate_period(date_from: Optional[date], date_to: Optional[date]):
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_from deve ser anterior ou igual a date_to"
+        )
+
+
+@router.post("/metrics/daily")
+async def ingest_daily_metrics(
+    metrics: List[DailyMetricCreate],
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Ingestão em lote de métricas diárias (upsert por campanha e dia)"""
+    report = await upsert_daily_metrics(
+        db, (metric.model_dump(by_alias=True) for metric in metrics)
+    )
+    if report["campaigns_updated"]:
+        campaign_ids = {metric.campaign_id for metric in metrics} - set(report["unknown_campaign_ids"])
+        await _publish_metrics_event(db, campaign_ids)
+    return report
+
+
+async def _publish_metrics_event(db: AsyncSession, campaign_ids: set) -> None:
+    """Uma leitura dos acumulados atualizados, compartilhada por todos os clientes do stream"""
+    if len(campaign_ids) > MAX_EVENT_ITEMS:
+        campaign_events.publish("metrics.updated", {"campaigns_updated": len(campaign_ids), "campaigns": None})
+        return
+    result = await db.execute(
+        select(
+            CampaignDB.id, CampaignDB.total_spent, CampaignDB.impressions, CampaignDB.clicks,
+            CampaignDB.conversions, CampaignDB.conversion_value, CampaignDB.updated_at
+        ).where(CampaignDB.id.in_(campaign_ids))
+    )
+    campaign_events.publish("metrics.updated", {
+        "campaigns_updated": len(campaign_ids),
+        "campaigns": [dict(row._mapping) for row in result]
+    })
+
+
+@router.get("/metrics/period")
+async def get_period_metrics(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    group_by: MetricsGroupBy = MetricsGroupBy.CAMPAIGN,
+    platform: Optional[PlatformEnum] = None,
+    status: Optional[CampaignStatus] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Métricas de todas as campanhas no período, agregadas no banco"""
+    _validate_period(date_from, date_to)
+    return await aggregate_period(db, date_from, date_to, group_by, platform, status)
+
+
+@router.get("/metrics/bulk")
+async def get_bulk_kpis(
+    status: Optional[CampaignStatus] = None,
+    platform: Optional[PlatformEnum] = None,
+    start_date_from: Optional[date] = None,
+    start_date_to: Optional[date] = None,
+    sort_by: Optional[KpiSortField] = None,
+    order: SortOrder = SortOrder.DESC,
+    top: Optional[int] = Query(None, ge=1, le=10000, description="Retorna só as N melhores pelo sort_by"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """KPIs (CTR, CPC, conversão, CPA, ROAS, uso do orçamento) de todas as campanhas filtradas"""
+    # pandas/numpy só são importados no primeiro uso (ou no preload do lifespan)
+    from app.services.kpi_engine import load_campaign_frame, kpi_report_json
+
+    query = _apply_filters(
+        select(
+            CampaignDB.id, CampaignDB.name, CampaignDB.platform, CampaignDB.status,
+            CampaignDB.budget_amount, CampaignDB.total_spent, CampaignDB.impressions,
+            CampaignDB.clicks, CampaignDB.conversions, CampaignDB.conversion_value
+        ).order_by(CampaignDB.id),
+        status, platform, start_date_from, start_date_to
+    )
+    frame = await load_campaign_frame(db, query)
+    return Response(content=kpi_report_json(frame, sort_by, order, top), media_type="application/json")
+
+
 @router.get("/{campaign_id}/metrics")
-async def get_campaign_metrics(campaign_id: int, db: Session = Depends(get_db)):
-    """Retorna métricas detalhadas de uma campanha"""
-    campaign = db.query(CampaignDB).filter(CampaignDB.id == campaign_id).first()
+async def get_campaign_metrics(
+    campaign_id: int,
+    request: Request,
+    response: Response,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Retorna métricas detalhadas de uma campanha (acumuladas ou de um período)"""
+    _validate_period(date_from, date_to)
+    campaign = await db.get(CampaignDB, campaign_id)
     
     if not campaign:
         raise HTTPException(
@@ -189,6 +472,24 @@ async def get_campaign_metrics(campaign_id: int, db: Session = Depends(get_db)):
             detail=f"Campanha {campaign_id} não encontrada"
         )
     
+    # A ingestão de métricas diárias soma a diferença aos acumulados e atualiza updated_at
+    check_etag(request, response, campaign.id, campaign.version, campaign.updated_at)
+    
+    if date_from or date_to:
+        metrics = await aggregate_campaign_period(db, campaign_id, date_from, date_to)
+        return {
+            "campaign_id": campaign_id,
+            "campaign_name": campaign.name,
+            "period": {
+                "date_from": date_from,
+                "date_to": date_to,
+                "days_with_data": metrics.pop("days_with_data")
+            },
+            "metrics": metrics,
+            "status": campaign.status,
+            "platform": campaign.platform
+        }
+    
     # Cálculos
     ctr = (campaign.clicks / campaign.impressions * 100) if campaign.impressions > 0 else 0
     cpc = (campaign.total_spent / campaign.clicks) if campaign.clicks > 0 else 0
@@ -213,49 +514,64 @@ async def get_campaign_metrics(campaign_id: int, db: Session = Depends(get_db)):
     }
 
 
+@router.get("/platforms/summary")
+async def get_platforms_summary(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Resumo de todas as plataformas em uma única consulta"""
+    check_etag(request, response, *await _campaigns_watermark(db))
+    summaries = await platform_summaries(db)
+    
+    return {
+        "platforms": [
+            summaries.get(platform, {
+                "platform": platform,
+                "total_campaigns": 0,
+                "active_campaigns": 0,
+                "total_spent": 0,
+                "total_budget": 0,
+                "budget_utilization": 0,
+                "average_ctr": 0
+            })
+            for platform in PlatformEnum
+        ]
+    }
+
+
 @router.get("/platform/{platform}/summary")
-async def get_platform_summary(platform: PlatformEnum, db: Session = Depends(get_db)):
+async def get_platform_summary(
+    platform: PlatformEnum,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
     """Resumo de todas as campanhas de uma plataforma"""
-    platform_campaigns = db.query(CampaignDB).filter(CampaignDB.platform == platform).all()
+    check_etag(request, response, *await _campaigns_watermark(db))
+    summaries = await platform_summaries(db, platform)
     
-    if not platform_campaigns:
+    if platform not in summaries:
         return {
             "platform": platform,
             "total_campaigns": 0,
             "message": f"Nenhuma campanha encontrada para {platform}"
         }
     
-    total_spent = sum(c.total_spent for c in platform_campaigns)
-    total_budget = sum(c.budget_amount for c in platform_campaigns)
-    active_campaigns = len([c for c in platform_campaigns if c.status == CampaignStatus.ACTIVE])
-    
-    # Calcula CTR médio
-    ctr_list = [
-        (c.clicks / c.impressions * 100) if c.impressions > 0 else 0 
-        for c in platform_campaigns
-    ]
-    avg_ctr = statistics.mean(ctr_list) if ctr_list else 0
-    
-    return {
-        "platform": platform,
-        "total_campaigns": len(platform_campaigns),
-        "active_campaigns": active_campaigns,
-        "total_spent": round(total_spent, 2),
-        "total_budget": round(total_budget, 2),
-        "budget_utilization": round((total_spent / total_budget * 100), 2) if total_budget > 0 else 0,
-        "average_ctr": round(avg_ctr, 2)
-    }
+    return summaries[platform]
 
 
 # --- Data Population (para testes) ---
 
 @router.post("/populate-sample", response_model=List[Campaign])
-async def populate_sample_data(db: Session = Depends(get_db)):
+async def populate_sample_data(db: AsyncSession = Depends(get_async_db)):
     """Popula com dados de exemplo para testes"""
     
-    # Limpa tabela primeiro
-    db.query(CampaignDB).delete()
-    db.commit()
+    # Limpa as tabelas primeiro (métricas diárias não ficam órfãs para ids reaproveitados)
+    await db.execute(delete(CampaignDailyMetricsDB))
+    await db.execute(delete(CampaignDB))
+    await bump_campaigns_version(db)
+    await db.commit()
     
     sample_campaigns = [
         CampaignDB(
@@ -296,11 +612,36 @@ async def populate_sample_data(db: Session = Depends(get_db)):
         )
     ]
     
+    version = await bump_campaigns_version(db)
+    for campaign in sample_campaigns:
+        campaign.version = version
     db.add_all(sample_campaigns)
-    db.commit()
+    await db.commit()
     
     # Retorna as campanhas criadas
     for campaign in sample_campaigns:
-        db.refresh(campaign)
+        await db.refresh(campaign)
     
+    campaign_events.publish("campaigns.reset", {"count": len(sample_campaigns)})
     return sample_campaigns
+
+
+@router.post("/synthetic", status_code=status.HTTP_201_CREATED)
+async def generate_synthetic_campaigns(
+    request: SyntheticDataRequest,
+    db: AsyncSession = Depends(get_async_db),
+    admin: UserInDB = Depends(get_current_active_admin)
+):
+    """Gera campanhas e histórico de métricas sintéticos para testes de carga (apenas admin; volumes maiores pelo CLI)"""
+    # Import local: numpy só é carregado quando o gerador é usado
+    from app.services.synthetic_data import generate_synthetic_data, API_CHUNK_SIZE
+    
+    result = await generate_synthetic_data(
+        db, request.campaigns, days=request.days, seed=request.seed, replace=request.replace,
+        chunk_size=API_CHUNK_SIZE
+    )
+    if request.replace:
+        campaign_events.publish("campaigns.reset", {"count": result["campaigns"]})
+    else:
+        campaign_events.publish("campaigns.imported", {"inserted": result["campaigns"]})
+    return result
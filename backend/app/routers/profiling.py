@@ -0,0 +1,56 @@
+import asyncio
+from contextlib import aclosing
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import FileResponse, PlainTextResponse
+
+from app.core.profiling import profile_store, SORT_KEYS
+from app.database import get_async_db
+from app.models.user import UserInDB
+from app.routers.auth import oauth2_scheme, get_current_user, get_current_active_admin
+
+router = APIRouter(
+    prefix="/profiles",
+    tags=["profiling"],
+    dependencies=[Depends(get_current_active_admin)]
+)
+
+
+async def authorize_profiling(request: Request) -> UserInDB:
+    """Mesma verificação do get_current_active_admin, chamada pelo ProfilingMiddleware"""
+    token = await oauth2_scheme(request)
+    get_db = request.app.dependency_overrides.get(get_async_db, get_async_db)
+    async with aclosing(get_db()) as sessions:
+        async for db in sessions:
+            user = await get_current_user(db=db, token=token)
+            break
+    return await get_current_active_admin(user)
+
+
+@router.get("/")
+async def list_profiles(limit: int = Query(20, ge=1, le=1000)):
+    """Perfis mais recentes (metadados e funções com maior tempo próprio)"""
+    return await asyncio.to_thread(profile_store.list, limit)
+
+
+@router.get("/{profile_id}", response_class=PlainTextResponse)
+async def get_profile_report(
+    profile_id: str,
+    sort: str = Query("cumulative", pattern=f"^({'|'.join(SORT_KEYS)})$"),
+    limit: int = Query(50, ge=1, le=1000)
+):
+    """Relatório do pstats ordenado por `sort`"""
+    try:
+        return await asyncio.to_thread(profile_store.report, profile_id, sort, limit)
+    except FileNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Perfil não encontrado")
+
+
+@router.get("/{profile_id}/download")
+async def download_profile(profile_id: str):
+    """Arquivo .prof para abrir com pstats ou snakeviz"""
+    try:
+        path = profile_store.prof_path(profile_id)
+    except FileNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Perfil não encontrado")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
@@ -0,0 +1,101 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+from app.database import get_async_db
+from app.models.rule import Rule, RuleCreate, RuleUpdate, RuleAuditEntry
+from app.routers.auth import get_current_active_admin
+from app.schemas.rule_db import AutomationRuleDB
+from app.services.rules_engine import run_rules, list_audit_log
+
+router = APIRouter(
+    prefix="/rules",
+    tags=["rules"],
+    dependencies=[Depends(get_current_active_admin)]
+)
+
+
+async def _get_rule(db: AsyncSession, rule_id: int) -> AutomationRuleDB:
+    rule = await db.get(AutomationRuleDB, rule_id)
+    if not rule:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Regra {rule_id} não encontrada"
+        )
+    return rule
+
+
+@router.get("/", response_model=List[Rule])
+async def list_rules(db: AsyncSession = Depends(get_async_db)):
+    """Lista as regras automáticas"""
+    result = await db.execute(select(AutomationRuleDB).order_by(AutomationRuleDB.id))
+    return result.scalars().all()
+
+
+@router.post("/", response_model=Rule, status_code=status.HTTP_201_CREATED)
+async def create_rule(rule: RuleCreate, db: AsyncSession = Depends(get_async_db)):
+    """Cria uma regra (ex.: CPA > 50 nos últimos 3 dias → pausar)"""
+    db_rule = AutomationRuleDB(**rule.model_dump(mode="json"))
+    db.add(db_rule)
+    await db.commit()
+    await db.refresh(db_rule)
+    return db_rule
+
+
+@router.post("/run")
+async def run_all_rules(
+    dry_run: bool = Query(False, description="Só informa o que mudaria"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Avalia agora todas as regras habilitadas"""
+    return await run_rules(db, dry_run=dry_run)
+
+
+@router.get("/audit", response_model=List[RuleAuditEntry])
+async def get_audit_log(
+    rule_id: Optional[int] = None,
+    campaign_id: Optional[int] = None,
+    run_id: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=10000),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Histórico das ações aplicadas pelas regras (mais recentes primeiro)"""
+    return await list_audit_log(db, rule_id, campaign_id, run_id, limit)
+
+
+@router.get("/{rule_id}", response_model=Rule)
+async def get_rule(rule_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Busca uma regra pelo ID"""
+    return await _get_rule(db, rule_id)
+
+
+@router.put("/{rule_id}", response_model=Rule)
+async def update_rule(rule_id: int, rule_update: RuleUpdate, db: AsyncSession = Depends(get_async_db)):
+    """Atualiza uma regra existente"""
+    db_rule = await _get_rule(db, rule_id)
+    for key, value in rule_update.model_dump(mode="json", exclude_unset=True).items():
+        setattr(db_rule, key, value)
+    await db.commit()
+    await db.refresh(db_rule)
+    return db_rule
+
+
+@router.delete("/{rule_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_rule(rule_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Remove uma regra (o histórico é mantido)"""
+    db_rule = await _get_rule(db, rule_id)
+    await db.delete(db_rule)
+    await db.commit()
+    return None
+
+
+@router.post("/{rule_id}/run")
+async def run_rule(
+    rule_id: int,
+    dry_run: bool = Query(False, description="Só informa o que mudaria"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Avalia agora uma regra, mesmo desabilitada"""
+    await _get_rule(db, rule_id)
+    return await run_rules(db, rule_ids=[rule_id], dry_run=dry_run)
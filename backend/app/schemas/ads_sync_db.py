@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, Enum, Text, UniqueConstraint
+from sqlalchemy.sql import func
+from app.database import Base
+from app.schemas.campaign_db import PlatformEnum
+
+class AdsSyncStateDB(Base):
+    """Marca d'água da sincronização incremental por conta de anúncios"""
+    __tablename__ = "ads_sync_state"
+    __table_args__ = (
+        UniqueConstraint("platform", "account_id", name="uq_ads_sync_state_platform_account"),
+        {'extend_existing': True}
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    platform = Column(Enum(PlatformEnum), nullable=False)
+    account_id = Column(String(64), nullable=False)
+
+    # Último dia com métricas sincronizadas
+    watermark_date = Column(Date, nullable=True)
+
+    # Resultado da última execução
+    last_run_at = Column(DateTime, nullable=True)
+    last_success_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    campaigns_synced = Column(Integer, default=0)
+    metrics_rows_synced = Column(Integer, default=0)
+
+    # Timestamps
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Enum, Text, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, Enum, Text, JSON, Index
 from sqlalchemy.sql import func
 from app.database import Base
 import enum
@@ -24,11 +24,23 @@ class BudgetType(str, enum.Enum):
 
 class CampaignDB(Base):
     __tablename__ = "campaigns"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Paginação por cursor em (start_date, id) para cada combinação de filtros
+        Index("ix_campaigns_start_date_id", "start_date", "id"),
+        Index("ix_campaigns_status_start_date_id", "status", "start_date", "id"),
+        Index("ix_campaigns_platform_start_date_id", "platform", "start_date", "id"),
+        Index("ix_campaigns_platform_status_start_date_id", "platform", "status", "start_date", "id"),
+        # Campanhas sincronizadas das plataformas (upsert pelo ID externo)
+        Index("ux_campaigns_platform_external_id", "platform", "external_id", unique=True),
+        # Linhas gravadas depois de uma versão (pacing incremental)
+        Index("ix_campaigns_version", "version"),
+        {'extend_existing': True}
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
     platform = Column(Enum(PlatformEnum), nullable=False)
+    external_id = Column(String(64), nullable=True)  # ID da campanha na plataforma
     budget_type = Column(Enum(BudgetType), default=BudgetType.DAILY)
     budget_amount = Column(Float, nullable=False)
     start_date = Column(DateTime, nullable=False)
@@ -44,7 +56,9 @@ class CampaignDB(Base):
     impressions = Column(Integer, default=0)
     clicks = Column(Integer, default=0)
     conversions = Column(Integer, default=0)
+    conversion_value = Column(Float, default=0.0)  # Receita atribuída (para ROAS)
     
     # Timestamps
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    version = Column(Integer, default=0)  # table_versions.campaigns da última escrita na linha
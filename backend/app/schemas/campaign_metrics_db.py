@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, Float, Date, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.sql import func
+from app.database import Base
+
+class CampaignDailyMetricsDB(Base):
+    """Fato diário de performance por campanha"""
+    __tablename__ = "campaign_daily_metrics"
+    __table_args__ = (
+        # Cobre as consultas por campanha + período e garante um registro por dia
+        UniqueConstraint("campaign_id", "date", name="uq_campaign_daily_metrics_campaign_date"),
+        # Consultas entre campanhas filtram só pelo período
+        Index("ix_campaign_daily_metrics_date", "date"),
+        {'extend_existing': True}
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    campaign_id = Column(Integer, ForeignKey("campaigns.id", ondelete="CASCADE"), nullable=False)
+    date = Column(Date, nullable=False)
+
+    # Métricas do dia
+    spend = Column(Float, default=0.0)
+    impressions = Column(Integer, default=0)
+    clicks = Column(Integer, default=0)
+    conversions = Column(Integer, default=0)
+    conversion_value = Column(Float, default=0.0)
+
+    # Timestamps
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,53 @@
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, Text, JSON, Index
+from sqlalchemy.sql import func
+from app.database import Base
+from app.schemas.campaign_db import PlatformEnum, CampaignStatus
+import enum
+
+class RuleActionEnum(str, enum.Enum):
+    PAUSE = "pause"
+    ACTIVATE = "activate"
+    ALERT = "alert"
+
+class AutomationRuleDB(Base):
+    """Regra automática: condições sobre as métricas e a ação nas campanhas que as satisfazem"""
+    __tablename__ = "automation_rules"
+    __table_args__ = {'extend_existing': True}
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), nullable=False)
+    description = Column(Text, nullable=True)
+    action = Column(Enum(RuleActionEnum), nullable=False)
+    conditions = Column(JSON, nullable=False)  # [{"metric": "cpa", "operator": "gt", "value": 50}]
+    window_days = Column(Integer, nullable=True)  # Últimos N dias de métricas (vazio = acumulado)
+    platform = Column(Enum(PlatformEnum), nullable=True)  # Vazio = todas
+    enabled = Column(Boolean, default=True)
+
+    # Resultado da última execução (fora do dry-run)
+    last_run_at = Column(DateTime, nullable=True)
+    last_matched = Column(Integer, default=0)
+
+    # Timestamps
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+class RuleAuditLogDB(Base):
+    """Histórico das ações aplicadas pelas regras, uma linha por campanha"""
+    __tablename__ = "rule_audit_log"
+    __table_args__ = (
+        Index("ix_rule_audit_log_rule_id_created_at", "rule_id", "created_at"),
+        Index("ix_rule_audit_log_campaign_id_created_at", "campaign_id", "created_at"),
+        {'extend_existing': True}
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(String(32), nullable=False, index=True)  # Mesma execução do motor de regras
+    # Sem chave estrangeira: o histórico continua depois de apagar a regra ou a campanha
+    rule_id = Column(Integer, nullable=True)
+    rule_name = Column(String(100), nullable=False)
+    campaign_id = Column(Integer, nullable=False)
+    action = Column(Enum(RuleActionEnum), nullable=False)
+    previous_status = Column(Enum(CampaignStatus), nullable=True)
+    new_status = Column(Enum(CampaignStatus), nullable=True)
+    metrics = Column(JSON, nullable=True)  # Valores que satisfizeram as condições
+    created_at = Column(DateTime, server_default=func.now())
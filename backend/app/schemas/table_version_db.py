@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, DDL, event
+from app.database import Base
+
+class TableVersionDB(Base):
+    """Versão monotônica de uma tabela, incrementada na mesma transação de cada escrita"""
+    __tablename__ = "table_versions"
+    __table_args__ = {'extend_existing': True}
+
+    name = Column(String(64), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+# A linha já existe na primeira escrita: o incremento é sempre um UPDATE
+event.listen(
+    TableVersionDB.__table__,
+    "after_create",
+    DDL("INSERT INTO table_versions (name, version) VALUES ('campaigns', 0)")
+)
@@ -1,123 +1,214 @@
 """
 Gerador de textos criativos para anúncios usando IA
+
+As chamadas usam o cliente assíncrono da OpenAI, com no máximo
+OPENAI_CONCURRENCY em andamento. Cada chamada pede todas as variações de uma
+vez (parâmetro `n`) e o resultado fica em cache pelo hash de
+(produto, público, tom, plataforma, variações). OPENAI_BASE_URL permite apontar
+para um servidor falso local (ver benchmarks/fake_openai_api.py).
 """
-import os
-from typing import Dict, Any
-import openai
+import asyncio
+import hashlib
+import json
+import logging
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+
+import httpx
+
 from app.core.config import settings
+from app.core.metrics import track_upstream
+from app.core.swr_cache import SWRCache
+from app.services.creative_templates import creative_templates
 
-# Configurar OpenAI se disponível
-if settings.OPENAI_API_KEY:
-    openai.api_key = settings.OPENAI_API_KEY
-    OPENAI_AVAILABLE = True
-else:
-    OPENAI_AVAILABLE = False
-    print("⚠️ OpenAI não configurado. Usando templates padrão.")
-
-def generate_ad_creative(
-    product: str,
-    target_audience: str,
-    tone: str = "profissional",
-    platform: str = "meta"
-) -> Dict[str, Any]:
-    """
-    Gera textos criativos para anúncios
-    """
-    
-    if OPENAI_AVAILABLE:
-        return _generate_with_openai(product, target_audience, tone, platform)
-    else:
-        return _generate_with_templates(product, target_audience, tone, platform)
-
-def _generate_with_openai(product: str, audience: str, tone: str, platform: str) -> Dict[str, Any]:
-    """Usa OpenAI para gerar textos"""
-    try:
-        prompt = f"""
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_PROMPT = "Você é um copywriter especialista em marketing digital."
+
+def build_prompt(product: str, audience: str, tone: str, platform: str) -> str:
+    return f"""
         Gere um anúncio para {platform.upper()} com as seguintes características:
-        
+
         Produto/Serviço: {product}
         Público-alvo: {audience}
         Tom: {tone}
-        
+
         Forneça:
         1. Um HEADLINE impactante (máx 40 caracteres)
         2. Uma DESCRIÇÃO persuasiva (máx 125 caracteres)
         3. Um CALL-TO-ACTION claro
         4. 3 HASHTAGS relevantes
         5. Um texto para o campo "Texto Principal" (máx 200 caracteres)
-        
+
+        Responda somente com um objeto JSON com as chaves
+        "headline", "description", "cta", "hashtags" (lista) e "primary_text".
         Formato em português do Brasil.
         """
-        
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "Você é um copywriter especialista em marketing digital."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=300,
-            temperature=0.7
-        )
-        
-        content = response.choices[0].message.content
-        
-        # Parse simples da resposta
-        lines = content.split('\n')
-        result = {
-            "headline": lines[1].replace("1. ", "").replace("HEADLINE: ", "") if len(lines) > 1 else f"Descubra {product}",
-            "description": lines[2].replace("2. ", "").replace("DESCRIÇÃO: ", "") if len(lines) > 2 else f"Perfecto para {audience}",
-            "cta": lines[3].replace("3. ", "").replace("CALL-TO-ACTION: ", "") if len(lines) > 3 else "Saiba Mais",
-            "hashtags": lines[4].replace("4. ", "").split(", ") if len(lines) > 4 else [f"#{product.replace(' ', '')}"],
-            "primary_text": lines[5].replace("5. ", "") if len(lines) > 5 else "",
+
+
+def creative_cache_key(product: str, audience: str, tone: str, platform: str, variants: int) -> str:
+    """Hash estável da combinação (maiúsculas e espaços extras não mudam a chave)"""
+    normalized = [" ".join(value.split()).lower() for value in (product, audience, tone, platform)]
+    raw = json.dumps([*normalized, variants, settings.OPENAI_MODEL], ensure_ascii=False)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def parse_creative(content: str, product: str, audience: str) -> Dict[str, Any]:
+    """Lê a resposta em JSON; se o modelo não respeitar o formato, lê linha a linha"""
+    text = content.strip()
+    if text.startswith("```"):
+        text = text.strip("`").removeprefix("json").strip()
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = None
+
+    if isinstance(data, dict):
+        hashtags = data.get("hashtags") or [f"#{product.replace(' ', '')}"]
+        if isinstance(hashtags, str):
+            hashtags = hashtags.replace(",", " ").split()
+        return {
+            "headline": str(data.get("headline") or f"Descubra {product}"),
+            "description": str(data.get("description") or f"Perfeito para {audience}"),
+            "cta": str(data.get("cta") or "Saiba Mais"),
+            "hashtags": [str(tag) for tag in hashtags],
+            "primary_text": str(data.get("primary_text") or ""),
             "generated_by": "openai_gpt"
         }
-        
-        return result
-        
-    except Exception as e:
-        print(f"Erro ao usar OpenAI: {e}")
-        return _generate_with_templates(product, audience, tone, platform)
-
-def _generate_with_templates(product: str, audience: str, tone: str, platform: str) -> Dict[str, Any]:
-    """Usa templates quando OpenAI não está disponível"""
-    
-    templates = {
-        "profissional": {
-            "headlines": [
-                f"Solução Profissional para {product}",
-                f"Eficiência em {product} para {audience}",
-                f"Resultados Comprovados com {product}"
-            ],
-            "descriptions": [
-                f"Maximize seus resultados com nossa solução em {product}. Ideal para {audience}.",
-                f"Tecnologia avançada para {product}. Desenvolvido para {audience}.",
-                f"Transforme sua abordagem com {product}. Solução completa para {audience}."
-            ],
-            "ctas": ["Solicitar Demonstração", "Agendar Consulta", "Baixar Material"]
-        },
-        "conversacional": {
-            "headlines": [
-                f"Descubra como {product} pode mudar seu dia a dia!",
-                f"Você já conhece {product}? Perfeito para {audience}!",
-                f"A revolução do {product} chegou!"
-            ],
-            "descriptions": [
-                f"Junte-se a milhares de {audience} satisfeitos. Experimente {product} hoje mesmo!",
-                f"Não espere mais para descobrir os benefícios do {product}. Feito para {audience} como você!",
-                f"O que você está esperando? {product} é a solução que faltava para {audience}."
-            ],
-            "ctas": ["Experimente Grátis", "Começar Agora", "Quero Saber Mais"]
-        }
-    }
-    
-    import random
-    template = templates.get(tone, templates["profissional"])
-    
+
+    # Parse simples da resposta
+    lines = [line.strip() for line in content.split('\n') if line.strip()]
     return {
-        "headline": random.choice(template["headlines"]),
-        "description": random.choice(template["descriptions"]),
-        "cta": random.choice(template["ctas"]),
-        "hashtags": [f"#{product.replace(' ', '')}", f"#{audience.replace(' ', '')}", "#MarketingDigital"],
-        "primary_text": f"{product} oferece a melhor solução para {audience}. Resultados comprovados e suporte especializado. Não perca esta oportunidade!",
-        "generated_by": "template_system"
+        "headline": lines[0].replace("1. ", "").replace("HEADLINE: ", "") if len(lines) > 0 else f"Descubra {product}",
+        "description": lines[1].replace("2. ", "").replace("DESCRIÇÃO: ", "") if len(lines) > 1 else f"Perfeito para {audience}",
+        "cta": lines[2].replace("3. ", "").replace("CALL-TO-ACTION: ", "") if len(lines) > 2 else "Saiba Mais",
+        "hashtags": lines[3].replace("4. ", "").split(", ") if len(lines) > 3 else [f"#{product.replace(' ', '')}"],
+        "primary_text": lines[4].replace("5. ", "") if len(lines) > 4 else "",
+        "generated_by": "openai_gpt"
     }
+
+
+class CreativeGenerator:
+    """Geração de criativos com a OpenAI: chamadas limitadas, várias variações por chamada e cache"""
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        base_url: Optional[str] = None,
+        model: str = "gpt-3.5-turbo",
+        concurrency: int = 8,
+        timeout: float = 30.0,
+        cache: Optional[SWRCache] = None,
+        http_client: Optional[httpx.AsyncClient] = None
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.model = model
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.cache = cache or SWRCache(settings.CREATIVE_CACHE_MAXSIZE, max_stale=0)
+        self.http_client = http_client
+        self._client: Optional["AsyncOpenAI"] = None
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key)
+
+    def _get_client(self) -> "AsyncOpenAI":
+        """Cria o cliente sob demanda (conexões reaproveitadas entre requisições)"""
+        if self._client is None:
+            # O SDK só é importado quando há chave configurada e uma chamada real
+            from openai import AsyncOpenAI
+
+            self._client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                timeout=self.timeout,
+                http_client=self.http_client
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    async def _complete(self, product: str, audience: str, tone: str, platform: str, variants: int) -> List[Dict[str, Any]]:
+        """Uma chamada à OpenAI devolvendo `variants` criativos"""
+        async with self._semaphore:
+            with track_upstream("openai", "chat.completions"):
+                response = await self._get_client().chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        {"role": "user", "content": build_prompt(product, audience, tone, platform)}
+                    ],
+                    n=variants,
+                    max_tokens=300,
+                    temperature=0.7
+                )
+        return [parse_creative(choice.message.content or "", product, audience) for choice in response.choices]
+
+    async def generate(
+        self,
+        product: str,
+        target_audience: str,
+        tone: str = "profissional",
+        platform: str = "meta",
+        variants: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Gera `variants` criativos: {"variants": [...], "cache": {...}}"""
+        variants = variants or settings.CREATIVE_VARIANTS
+        if not self.configured:
+            return {
+                "variants": _generate_with_templates(product, target_audience, tone, platform, variants),
+                "cache": None
+            }
+
+        key = ("creative", creative_cache_key(product, target_audience, tone, platform, variants))
+        try:
+            creatives, cache = await self.cache.get_or_fetch(
+                key,
+                lambda: self._complete(product, target_audience, tone, platform, variants),
+                ttl=settings.CREATIVE_CACHE_TTL_SECONDS
+            )
+        except Exception as e:
+            # Falhas não entram no cache: a próxima requisição tenta a OpenAI de novo
+            logger.error(f"Erro ao usar OpenAI: {e}")
+            return {
+                "variants": _generate_with_templates(product, target_audience, tone, platform, variants),
+                "cache": None
+            }
+        return {"variants": creatives, "cache": cache}
+
+    async def generate_batch(self, items: Sequence[Dict[str, Any]], variants: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Gera para vários produtos em paralelo (o semáforo limita as chamadas)"""
+        return await asyncio.gather(*(self.generate(**item, variants=variants) for item in items))
+
+
+def _generate_with_templates(product: str, audience: str, tone: str, platform: str, variants: int = 1) -> List[Dict[str, Any]]:
+    """Usa templates quando OpenAI não está disponível"""
+    return [
+        {
+            "headline": variant["headline"],
+            "description": variant["description"],
+            "cta": variant["cta"],
+            "hashtags": variant["hashtags"],
+            "primary_text": variant["primary_text"],
+            "generated_by": "template_system"
+        }
+        for variant in creative_templates.sample(product, audience, tone, platform, variants)
+    ]
+
+
+# Instância global do gerador
+creative_generator = CreativeGenerator(
+    api_key=settings.OPENAI_API_KEY,
+    base_url=settings.OPENAI_BASE_URL,
+    model=settings.OPENAI_MODEL,
+    concurrency=settings.OPENAI_CONCURRENCY,
+    timeout=settings.OPENAI_TIMEOUT_SECONDS
+)
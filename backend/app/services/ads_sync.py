@@ -0,0 +1,302 @@
+"""
+Sincronização em segundo plano das plataformas de anúncios para o banco local
+
+A cada ADS_SYNC_INTERVAL_SECONDS o worker busca as campanhas e os insights
+diários de cada conta do Meta Ads e faz upsert em `campaigns` e
+`campaign_daily_metrics`. A marca d'água por conta (`ads_sync_state`) guarda
+o último dia sincronizado: a próxima execução busca só a partir dali, voltando
+ADS_SYNC_LOOKBACK_DAYS dias porque a plataforma ainda ajusta as métricas
+recentes (atribuição).
+
+Com ADS_SYNC_ENABLED a API lê as campanhas e insights do Meta do banco, então
+a latência das requisições não depende mais da plataforma.
+"""
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.broadcaster import campaign_events
+from app.core.config import settings
+from app.database import AsyncSessionLocal
+from app.schemas.ads_sync_db import AdsSyncStateDB
+from app.schemas.campaign_db import CampaignDB, PlatformEnum, CampaignStatus, BudgetType
+from app.services.campaign_metrics import (
+    upsert_daily_metrics, aggregate_campaign_period, dialect_insert, chunked
+)
+from app.services.campaign_versions import bump_campaigns_version
+from app.services.meta_graph_client import MetaGraphClient, meta_graph_client
+
+logger = logging.getLogger(__name__)
+
+META_STATUS_MAP = {
+    "ACTIVE": CampaignStatus.ACTIVE,
+    "PAUSED": CampaignStatus.PAUSED,
+    "ARCHIVED": CampaignStatus.ARCHIVED,
+    "DELETED": CampaignStatus.ARCHIVED,
+}
+
+# Colunas atualizadas quando a campanha já existe (métricas vêm do fato diário)
+CAMPAIGN_SYNC_COLUMNS = ("name", "status", "budget_type", "budget_amount", "start_date", "end_date", "bid_strategy")
+
+
+def _parse_meta_datetime(value: Optional[str]) -> Optional[datetime]:
+    # Formato da Graph API: 2024-01-01T10:00:00-0300 (guardado sem fuso, como o resto do banco)
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z").replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def meta_campaign_to_row(campaign: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+    """Converte uma campanha da Graph API nos valores da tabela campaigns"""
+    daily_budget = campaign.get("daily_budget")
+    lifetime_budget = campaign.get("lifetime_budget")
+    # Orçamentos vêm em centavos; sem orçamento na campanha ele está nos conjuntos de anúncios
+    budget = daily_budget or lifetime_budget or 0
+    start = _parse_meta_datetime(campaign.get("start_time")) or _parse_meta_datetime(campaign.get("created_time"))
+    bid_strategy = campaign.get("bid_strategy")
+
+    return {
+        "name": (campaign.get("name") or campaign["id"])[:100],
+        "platform": PlatformEnum.META_ADS,
+        "external_id": str(campaign["id"]),
+        "status": META_STATUS_MAP.get(campaign.get("status"), CampaignStatus.PAUSED),
+        "budget_type": BudgetType.LIFETIME if lifetime_budget and not daily_budget else BudgetType.DAILY,
+        "budget_amount": round(int(budget) / 100, 2),
+        "start_date": start or now,
+        "end_date": _parse_meta_datetime(campaign.get("stop_time")),
+        "bid_strategy": bid_strategy[:50] if bid_strategy else None,
+        "keywords": [],
+        "updated_at": now,
+    }
+
+
+async def upsert_meta_campaigns(db: AsyncSession, campaigns: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Insere/atualiza as campanhas pelo ID externo e retorna {id externo: id local}"""
+    insert = dialect_insert(db)
+    now = datetime.now()
+    rows = [meta_campaign_to_row(campaign, now) for campaign in campaigns]
+    version = await bump_campaigns_version(db)
+    for row in rows:
+        row["version"] = version
+
+    for chunk in chunked(rows):
+        stmt = insert(CampaignDB).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CampaignDB.platform, CampaignDB.external_id],
+            set_={
+                **{column: stmt.excluded[column] for column in CAMPAIGN_SYNC_COLUMNS},
+                "updated_at": now,
+                "version": version
+            }
+        )
+        await db.execute(stmt)
+
+    local_ids: Dict[str, int] = {}
+    external_ids = [row["external_id"] for row in rows]
+    for chunk in chunked(external_ids):
+        result = await db.execute(
+            select(CampaignDB.external_id, CampaignDB.id)
+            .where(CampaignDB.platform == PlatformEnum.META_ADS, CampaignDB.external_id.in_(chunk))
+        )
+        local_ids.update({external_id: campaign_id for external_id, campaign_id in result})
+    return local_ids
+
+
+async def _get_state(db: AsyncSession, platform: PlatformEnum, account_id: str) -> AdsSyncStateDB:
+    result = await db.execute(
+        select(AdsSyncStateDB)
+        .where(AdsSyncStateDB.platform == platform, AdsSyncStateDB.account_id == account_id)
+    )
+    state = result.scalars().first()
+    if state is None:
+        state = AdsSyncStateDB(platform=platform, account_id=account_id)
+        db.add(state)
+        await db.flush()
+    return state
+
+
+def sync_window(watermark: Optional[date], today: date) -> tuple:
+    """Período a buscar: backfill na primeira vez, depois a partir da marca d'água"""
+    if watermark is None:
+        since = today - timedelta(days=settings.ADS_SYNC_BACKFILL_DAYS - 1)
+    else:
+        since = min(watermark, today) - timedelta(days=settings.ADS_SYNC_LOOKBACK_DAYS)
+    return since, today
+
+
+async def sync_meta_account(db: AsyncSession, client: MetaGraphClient) -> Dict[str, Any]:
+    """Sincroniza campanhas e métricas diárias de uma conta do Meta Ads"""
+    state = await _get_state(db, PlatformEnum.META_ADS, client.ad_account_id)
+    state.last_run_at = datetime.now()
+    since, until = sync_window(state.watermark_date, date.today())
+
+    try:
+        campaigns = await client.get_campaigns()
+        local_ids = await upsert_meta_campaigns(db, campaigns)
+        insights = await client.get_insights_bulk(list(local_ids), since, until, time_increment=1)
+    except Exception as e:
+        # A marca d'água não avança: a próxima execução repete o período
+        await db.rollback()
+        state = await _get_state(db, PlatformEnum.META_ADS, client.ad_account_id)
+        state.last_run_at = datetime.now()
+        state.last_error = str(e)[:1000]
+        await db.commit()
+        raise
+
+    metrics = [
+        {
+            "campaign_id": local_ids[external_id],
+            "date": date.fromisoformat(day["date_start"]),
+            "spend": day["spend"],
+            "impressions": day["impressions"],
+            "clicks": day["clicks"],
+            "conversions": day["conversions"],
+        }
+        for external_id, item in insights.items()
+        for day in item.get("daily", [])
+    ]
+    # upsert_daily_metrics atualiza os acumulados das campanhas e faz o commit
+    report = await upsert_daily_metrics(db, metrics)
+
+    state.watermark_date = until
+    state.last_success_at = datetime.now()
+    state.last_error = None
+    state.campaigns_synced = len(local_ids)
+    state.metrics_rows_synced = report["upserted"]
+    await db.commit()
+
+    campaign_events.publish("campaigns.synced", {
+        "platform": PlatformEnum.META_ADS,
+        "campaigns_synced": len(local_ids),
+        "metrics_rows_synced": report["upserted"]
+    })
+
+    return {
+        "platform": PlatformEnum.META_ADS,
+        "account_id": client.ad_account_id,
+        "date_from": since,
+        "date_to": until,
+        "campaigns_synced": len(local_ids),
+        "metrics_rows_synced": report["upserted"],
+    }
+
+
+class AdsSyncWorker:
+    """Agendador asyncio que roda a sincronização periodicamente no processo da API"""
+
+    def __init__(self, session_factory=AsyncSessionLocal, client: MetaGraphClient = meta_graph_client):
+        self.session_factory = session_factory
+        self.client = client
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self.last_results: List[Dict[str, Any]] = []
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def run_once(self) -> List[Dict[str, Any]]:
+        """Uma rodada de sincronização (execuções simultâneas esperam a atual)"""
+        async with self._lock:
+            results = []
+            if self.client.configured:
+                async with self.session_factory() as db:
+                    try:
+                        results.append(await sync_meta_account(db, self.client))
+                    except Exception as e:
+                        logger.error(f"Erro ao sincronizar Meta Ads ({self.client.ad_account_id}): {e}")
+                        results.append({
+                            "platform": PlatformEnum.META_ADS,
+                            "account_id": self.client.ad_account_id,
+                            "error": str(e)
+                        })
+            else:
+                logger.warning("⚠️ Sincronização de Ads sem contas configuradas")
+            self.last_results = results
+            return results
+
+    async def _loop(self) -> None:
+        while True:
+            await self.run_once()
+            await asyncio.sleep(settings.ADS_SYNC_INTERVAL_SECONDS)
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._loop())
+            logger.info(f"🔄 Sincronização de Ads a cada {settings.ADS_SYNC_INTERVAL_SECONDS}s")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+async def list_synced_campaigns(db: AsyncSession, limit: int) -> List[Dict[str, Any]]:
+    """Campanhas do Meta sincronizadas, no formato de get_campaigns"""
+    result = await db.execute(
+        select(CampaignDB)
+        .where(CampaignDB.platform == PlatformEnum.META_ADS, CampaignDB.external_id.is_not(None))
+        .order_by(CampaignDB.id)
+        .limit(limit)
+    )
+    return [
+        {
+            'id': campaign.external_id,
+            'name': campaign.name,
+            'status': campaign.status.value.upper(),
+            'daily_budget': campaign.budget_amount if campaign.budget_type == BudgetType.DAILY else None,
+            'created_time': campaign.start_date.isoformat(),
+            'effective_status': campaign.status.value.upper(),
+            'impressions': campaign.impressions,
+            'clicks': campaign.clicks,
+            'spend': campaign.total_spent,
+            'platform': 'meta'
+        }
+        for campaign in result.scalars()
+    ]
+
+
+async def synced_campaign_insights(db: AsyncSession, external_id: str, days: int) -> Optional[Dict[str, Any]]:
+    """Insights dos últimos `days` dias a partir do fato diário sincronizado"""
+    result = await db.execute(
+        select(CampaignDB.id)
+        .where(CampaignDB.platform == PlatformEnum.META_ADS, CampaignDB.external_id == external_id)
+    )
+    campaign_id = result.scalar()
+    if campaign_id is None:
+        return None
+
+    today = date.today()
+    totals = await aggregate_campaign_period(db, campaign_id, today - timedelta(days=days - 1), today)
+    return {
+        'campaign_id': external_id,
+        'period_days': days,
+        'impressions': totals['impressions'],
+        'clicks': totals['clicks'],
+        'spend': totals['spend'],
+        'cpc': totals['cpc'],
+        'ctr': totals['ctr'],
+        'conversions': totals['conversions'],
+        'platform': 'meta',
+        'real_data': True
+    }
+
+
+async def get_sync_states(db: AsyncSession) -> List[AdsSyncStateDB]:
+    result = await db.execute(select(AdsSyncStateDB).order_by(AdsSyncStateDB.id))
+    return list(result.scalars())
+
+
+# Instância global do worker
+ads_sync_worker = AdsSyncWorker()
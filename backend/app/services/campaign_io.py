@@ -0,0 +1,250 @@
+"""
+Importação e exportação de campanhas em streaming (NDJSON/CSV)
+"""
+import csv
+import io
+import json
+from collections import deque
+from datetime import datetime, date
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.schemas.campaign_db import CampaignDB
+from app.models.campaign import CampaignCreate, CampaignFileFormat
+from app.services.campaign_versions import bump_campaigns_version
+
+# Linhas validadas por executemany
+IMPORT_CHUNK_SIZE = 1000
+# Linhas lidas do banco por vez na exportação
+EXPORT_BATCH_SIZE = 1000
+# Limite de erros detalhados no relatório (os demais só são contados)
+MAX_REPORTED_ERRORS = 1000
+
+KEYWORD_SEPARATOR = ";"
+
+ENCODING_ERROR = "Codificação inválida: salve o arquivo em UTF-8"
+
+
+def campaign_to_row(campaign: CampaignCreate) -> Dict[str, Any]:
+    """Converte o payload validado nos valores da tabela campaigns"""
+    # Converte date para datetime para o banco
+    start_datetime = datetime.combine(campaign.start_date, datetime.min.time())
+    end_datetime = datetime.combine(campaign.end_date, datetime.min.time()) if campaign.end_date else None
+    now = datetime.now()
+
+    return {
+        "name": campaign.name,
+        "platform": campaign.platform,
+        "budget_type": campaign.budget_type,
+        "budget_amount": campaign.budget_amount,
+        "start_date": start_datetime,
+        "end_date": end_datetime,
+        "status": campaign.status,
+        "target_audience": campaign.target_audience,
+        "keywords": campaign.keywords,
+        "bid_strategy": campaign.bid_strategy,
+        "creative_url": campaign.creative_url,
+        "created_at": now,
+        "updated_at": now
+    }
+
+
+def _decode_line(line: bytes) -> Optional[str]:
+    """Linha em UTF-8, ou None se a codificação for outra (ex.: Windows-1252 do Excel)"""
+    try:
+        return line.decode("utf-8").rstrip("\r")
+    except UnicodeDecodeError:
+        return None
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Optional[str]]:
+    """Quebra o corpo da requisição em linhas sem carregá-lo inteiro (None = não é UTF-8)"""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield _decode_line(line)
+    if buffer:
+        yield _decode_line(buffer)
+
+
+async def iter_records(
+    lines: AsyncIterator[Optional[str]],
+    file_format: CampaignFileFormat
+) -> AsyncIterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Gera (linha inicial do registro, registro, erro de leitura).
+    No CSV o primeiro registro é o cabeçalho e keywords vêm separadas por ';'.
+    """
+    header: Optional[List[str]] = None
+    line_number = 0
+    # CSV: um único leitor incremental, alimentado linha a linha; um registro
+    # pode ocupar várias linhas (quebras de linha dentro de campos entre aspas)
+    pending_lines: deque = deque()
+    reader = csv.reader(iter(pending_lines.popleft, None))
+    record_line = 0
+    in_quotes = False
+
+    async for line in lines:
+        line_number += 1
+        if line is None:
+            # Descarta o registro inteiro (no CSV, também as linhas já lidas dele)
+            if file_format == CampaignFileFormat.CSV and in_quotes:
+                pending_lines.clear()
+                in_quotes = False
+            else:
+                record_line = line_number
+            yield record_line, None, ENCODING_ERROR
+            if file_format == CampaignFileFormat.CSV and header is None:
+                # Sem cabeçalho legível nenhuma linha seguinte pode ser mapeada
+                return
+            continue
+        if line_number == 1:
+            line = line.lstrip("\ufeff")
+
+        if file_format == CampaignFileFormat.NDJSON:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, None, f"JSON inválido: {e.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield line_number, None, "Cada linha deve ser um objeto JSON"
+                continue
+            yield line_number, record, None
+            continue
+
+        if not in_quotes:
+            if not line.strip():
+                continue
+            record_line = line_number
+        pending_lines.append(line + "\n")
+        # Aspas escapadas ("") não mudam a paridade: o registro acaba com as aspas fechadas
+        if line.count('"') % 2:
+            in_quotes = not in_quotes
+        if in_quotes:
+            continue
+
+        values = next(reader)
+        if header is None:
+            header = [column.strip() for column in values]
+            continue
+        if len(values) != len(header):
+            yield record_line, None, f"Esperadas {len(header)} colunas, recebidas {len(values)}"
+            continue
+
+        record = {column: value for column, value in zip(header, values) if value != ""}
+        if "keywords" in record:
+            record["keywords"] = [
+                keyword.strip() for keyword in record["keywords"].split(KEYWORD_SEPARATOR)
+                if keyword.strip()
+            ]
+        yield record_line, record, None
+
+    if in_quotes:
+        yield record_line, None, "Campo entre aspas sem fechamento"
+
+
+def _validation_messages(error: ValidationError) -> List[Dict[str, str]]:
+    return [
+        {"field": ".".join(str(part) for part in err["loc"]), "message": err["msg"]}
+        for err in error.errors()
+    ]
+
+
+async def bulk_import_campaigns(
+    db: AsyncSession,
+    chunks: AsyncIterator[bytes],
+    file_format: CampaignFileFormat
+) -> Dict[str, Any]:
+    """Valida e insere campanhas em lotes, retornando o relatório por linha"""
+    report: Dict[str, Any] = {"received": 0, "inserted": 0, "failed": 0, "errors": []}
+    pending: List[Dict[str, Any]] = []
+
+    def add_error(line_number: int, errors: List[Dict[str, str]]):
+        report["failed"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append({"line": line_number, "errors": errors})
+
+    async def flush():
+        if pending:
+            await db.execute(insert(CampaignDB).values(version=await bump_campaigns_version(db)), pending)
+            report["inserted"] += len(pending)
+            pending.clear()
+
+    async for line_number, record, read_error in iter_records(iter_lines(chunks), file_format):
+        report["received"] += 1
+        if read_error:
+            add_error(line_number, [{"field": "", "message": read_error}])
+            continue
+        try:
+            campaign = CampaignCreate.model_validate(record)
+        except ValidationError as e:
+            add_error(line_number, _validation_messages(e))
+            continue
+
+        pending.append(campaign_to_row(campaign))
+        if len(pending) >= IMPORT_CHUNK_SIZE:
+            await flush()
+
+    await flush()
+    await db.commit()
+
+    report["errors_truncated"] = report["failed"] > len(report["errors"])
+    return report
+
+
+def _json_default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return KEYWORD_SEPARATOR.join(str(item) for item in value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+async def export_campaigns(
+    db: AsyncSession,
+    query: Select,
+    file_format: CampaignFileFormat
+) -> AsyncIterator[str]:
+    """Exporta o resultado da consulta em lotes, sem materializar a tabela"""
+    result = await db.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    columns = list(result.keys())
+
+    if file_format == CampaignFileFormat.CSV:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        yield buffer.getvalue()
+
+    async for partition in result.partitions():
+        buffer = io.StringIO()
+        if file_format == CampaignFileFormat.CSV:
+            writer = csv.writer(buffer)
+            for row in partition:
+                writer.writerow([_csv_value(value) for value in row])
+        else:
+            for row in partition:
+                buffer.write(json.dumps(dict(row._mapping), default=_json_default, ensure_ascii=False))
+                buffer.write("\n")
+        yield buffer.getvalue()
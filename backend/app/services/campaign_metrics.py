@@ -0,0 +1,324 @@
+"""
+Métricas diárias por campanha: ingestão em lote e agregação por período no banco
+"""
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from sqlalchemy import select, update, func, case, tuple_, bindparam
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.campaign_db import CampaignDB, PlatformEnum, CampaignStatus
+from app.schemas.campaign_metrics_db import CampaignDailyMetricsDB
+from app.models.campaign import MetricsGroupBy
+from app.services.campaign_versions import bump_campaigns_version
+
+# Linhas por INSERT multi-valores (respeita o limite de parâmetros do SQLite)
+INGEST_CHUNK_SIZE = 500
+
+METRIC_COLUMNS = ("spend", "impressions", "clicks", "conversions", "conversion_value")
+
+
+def chunked(items: Sequence, size: int = INGEST_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def derive_kpis(
+    spend: float,
+    impressions: int,
+    clicks: int,
+    conversions: int,
+    conversion_value: Optional[float] = None
+) -> Dict[str, float]:
+    """Calcula os indicadores derivados a partir dos totais"""
+    kpis = {
+        "ctr": round(clicks / impressions * 100, 2) if impressions > 0 else 0,
+        "cpc": round(spend / clicks, 2) if clicks > 0 else 0,
+        "conversion_rate": round(conversions / clicks * 100, 2) if clicks > 0 else 0,
+        "cpa": round(spend / conversions, 2) if conversions > 0 else 0,
+    }
+    if conversion_value is not None:
+        kpis["roas"] = round(conversion_value / spend, 2) if spend > 0 else 0
+    return kpis
+
+
+def dialect_insert(db: AsyncSession):
+    """INSERT com suporte a ON CONFLICT do dialeto em uso"""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
+
+
+# Contador acumulado da campanha de cada coluna do fato diário
+LIFETIME_COUNTERS = {
+    "spend": "total_spent",
+    "impressions": "impressions",
+    "clicks": "clicks",
+    "conversions": "conversions",
+    "conversion_value": "conversion_value",
+}
+
+
+async def apply_lifetime_deltas(
+    db: AsyncSession,
+    deltas: Mapping[int, Mapping[str, float]],
+    version: int
+) -> None:
+    """
+    Soma aos contadores acumulados das campanhas a diferença entre os valores
+    diários novos e os anteriores (totais de fora do fato diário são preservados)
+    """
+    if not deltas:
+        return
+    table = CampaignDB.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("b_id"))
+        .values(
+            **{
+                counter: func.coalesce(table.c[counter], 0) + bindparam(f"d_{column}")
+                for column, counter in LIFETIME_COUNTERS.items()
+            },
+            updated_at=bindparam("b_updated_at"),
+            version=version
+        )
+    )
+    now = datetime.now()
+    await db.execute(stmt, [
+        {"b_id": campaign_id, "b_updated_at": now, **{f"d_{column}": delta[column] for column in METRIC_COLUMNS}}
+        for campaign_id, delta in sorted(deltas.items())
+    ])
+
+
+async def upsert_daily_metrics(db: AsyncSession, metrics: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Insere ou atualiza métricas diárias em lote (uma linha por campanha e dia)
+    e aplica aos contadores acumulados das campanhas a diferença para os
+    valores diários anteriores
+    """
+    # O último registro para a mesma campanha/dia prevalece
+    rows_by_key: Dict[tuple, Dict[str, Any]] = {}
+    received = 0
+    for row in metrics:
+        received += 1
+        rows_by_key[(row["campaign_id"], row["date"])] = row
+
+    campaign_ids = sorted({campaign_id for campaign_id, _ in rows_by_key})
+    known_ids = set()
+    for chunk in chunked(campaign_ids):
+        result = await db.execute(select(CampaignDB.id).where(CampaignDB.id.in_(chunk)))
+        known_ids.update(result.scalars().all())
+
+    rows = [row for (campaign_id, _), row in rows_by_key.items() if campaign_id in known_ids]
+    if not rows:
+        await db.commit()
+        return {
+            "received": received,
+            "upserted": 0,
+            "campaigns_updated": 0,
+            "unknown_campaign_ids": campaign_ids
+        }
+
+    # Trava de escrita antes de ler os valores anteriores: ingestões simultâneas
+    # dos mesmos dias são serializadas e cada uma vê o que a anterior gravou
+    # (linha do contador no Postgres, banco inteiro no SQLite)
+    version = await bump_campaigns_version(db)
+    insert = dialect_insert(db)
+    now = datetime.now()
+    daily = CampaignDailyMetricsDB
+    deltas: Dict[int, Dict[str, float]] = {}
+
+    for chunk in chunked(rows):
+        # Valores anteriores dos mesmos dias
+        previous = {
+            (row.campaign_id, row.date): row
+            for row in await db.execute(
+                select(daily.campaign_id, daily.date, *(getattr(daily, column) for column in METRIC_COLUMNS))
+                .where(tuple_(daily.campaign_id, daily.date).in_([(row["campaign_id"], row["date"]) for row in chunk]))
+            )
+        }
+        for row in chunk:
+            old = previous.get((row["campaign_id"], row["date"]))
+            delta = deltas.setdefault(row["campaign_id"], dict.fromkeys(METRIC_COLUMNS, 0))
+            for column in METRIC_COLUMNS:
+                delta[column] += (row.get(column) or 0) - ((getattr(old, column) or 0) if old else 0)
+
+        stmt = insert(CampaignDailyMetricsDB).values([
+            {
+                "campaign_id": row["campaign_id"],
+                "date": row["date"],
+                **{column: row.get(column) or 0 for column in METRIC_COLUMNS},
+                "created_at": now,
+                "updated_at": now
+            }
+            for row in chunk
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CampaignDailyMetricsDB.campaign_id, CampaignDailyMetricsDB.date],
+            set_={
+                **{column: stmt.excluded[column] for column in METRIC_COLUMNS},
+                "updated_at": now
+            }
+        )
+        await db.execute(stmt)
+
+    await apply_lifetime_deltas(db, deltas, version)
+    await db.commit()
+
+    return {
+        "received": received,
+        "upserted": len(rows),
+        "campaigns_updated": len(known_ids),
+        "unknown_campaign_ids": sorted(set(campaign_ids) - known_ids)
+    }
+
+
+def _period_filters(
+    date_from: Optional[date],
+    date_to: Optional[date],
+    platform: Optional[PlatformEnum] = None,
+    status: Optional[CampaignStatus] = None,
+    campaign_id: Optional[int] = None
+) -> List:
+    daily = CampaignDailyMetricsDB
+    filters = []
+    if date_from:
+        filters.append(daily.date >= date_from)
+    if date_to:
+        filters.append(daily.date <= date_to)
+    if platform:
+        filters.append(CampaignDB.platform == platform)
+    if status:
+        filters.append(CampaignDB.status == status)
+    if campaign_id is not None:
+        filters.append(daily.campaign_id == campaign_id)
+    return filters
+
+
+def _metric_sums():
+    daily = CampaignDailyMetricsDB
+    return [
+        func.coalesce(func.sum(getattr(daily, column)), 0).label(column)
+        for column in METRIC_COLUMNS
+    ]
+
+
+def _totals(values: Mapping[str, Any]) -> Dict[str, Any]:
+    totals = {
+        "spend": round(float(values["spend"]), 2),
+        "impressions": int(values["impressions"]),
+        "clicks": int(values["clicks"]),
+        "conversions": int(values["conversions"]),
+        "conversion_value": round(float(values["conversion_value"]), 2),
+    }
+    totals.update(derive_kpis(
+        totals["spend"], totals["impressions"], totals["clicks"],
+        totals["conversions"], totals["conversion_value"]
+    ))
+    return totals
+
+
+async def aggregate_campaign_period(
+    db: AsyncSession,
+    campaign_id: int,
+    date_from: Optional[date],
+    date_to: Optional[date]
+) -> Dict[str, Any]:
+    """Totais de uma campanha no período, somados no banco"""
+    daily = CampaignDailyMetricsDB
+    query = (
+        select(*_metric_sums(), func.count(daily.id).label("days_with_data"))
+        .where(*_period_filters(date_from, date_to, campaign_id=campaign_id))
+    )
+    row = (await db.execute(query)).one()
+    totals = _totals(row._mapping)
+    totals["days_with_data"] = int(row.days_with_data)
+    return totals
+
+
+async def aggregate_period(
+    db: AsyncSession,
+    date_from: Optional[date],
+    date_to: Optional[date],
+    group_by: MetricsGroupBy = MetricsGroupBy.CAMPAIGN,
+    platform: Optional[PlatformEnum] = None,
+    status: Optional[CampaignStatus] = None
+) -> Dict[str, Any]:
+    """Agrega o fato diário de todas as campanhas no período (GROUP BY no banco)"""
+    daily = CampaignDailyMetricsDB
+
+    if group_by == MetricsGroupBy.CAMPAIGN:
+        keys = [daily.campaign_id, CampaignDB.name, CampaignDB.platform]
+    elif group_by == MetricsGroupBy.DATE:
+        keys = [daily.date]
+    else:
+        keys = [CampaignDB.platform]
+
+    query = (
+        select(*keys, *_metric_sums())
+        .select_from(daily)
+        .join(CampaignDB, CampaignDB.id == daily.campaign_id)
+        .where(*_period_filters(date_from, date_to, platform, status))
+        .group_by(*keys)
+        .order_by(*keys)
+    )
+    result = await db.execute(query)
+
+    rows = []
+    grand = dict.fromkeys(METRIC_COLUMNS, 0)
+    for row in result:
+        for column in METRIC_COLUMNS:
+            grand[column] += getattr(row, column)
+        item = {key.key: getattr(row, key.key) for key in keys}
+        item.update(_totals(row._mapping))
+        rows.append(item)
+
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "group_by": group_by,
+        "totals": _totals(grand),
+        "rows": rows
+    }
+
+
+async def platform_summaries(
+    db: AsyncSession,
+    platform: Optional[PlatformEnum] = None
+) -> Dict[PlatformEnum, Dict[str, Any]]:
+    """Resumo por plataforma calculado em uma única consulta agregada"""
+    ctr = case(
+        (CampaignDB.impressions > 0, CampaignDB.clicks * 100.0 / CampaignDB.impressions),
+        else_=0
+    )
+    query = (
+        select(
+            CampaignDB.platform,
+            func.count(CampaignDB.id).label("total_campaigns"),
+            func.coalesce(
+                func.sum(case((CampaignDB.status == CampaignStatus.ACTIVE, 1), else_=0)), 0
+            ).label("active_campaigns"),
+            func.coalesce(func.sum(CampaignDB.total_spent), 0).label("total_spent"),
+            func.coalesce(func.sum(CampaignDB.budget_amount), 0).label("total_budget"),
+            func.coalesce(func.avg(ctr), 0).label("average_ctr")
+        )
+        .group_by(CampaignDB.platform)
+    )
+    if platform:
+        query = query.where(CampaignDB.platform == platform)
+
+    summaries = {}
+    for row in await db.execute(query):
+        total_spent = float(row.total_spent)
+        total_budget = float(row.total_budget)
+        summaries[row.platform] = {
+            "platform": row.platform,
+            "total_campaigns": row.total_campaigns,
+            "active_campaigns": int(row.active_campaigns),
+            "total_spent": round(total_spent, 2),
+            "total_budget": round(total_budget, 2),
+            "budget_utilization": round((total_spent / total_budget * 100), 2) if total_budget > 0 else 0,
+            "average_ctr": round(float(row.average_ctr), 2)
+        }
+    return summaries
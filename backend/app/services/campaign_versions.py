@@ -0,0 +1,39 @@
+"""
+Versão monotônica da tabela campaigns
+
+Toda transação que grava campanhas incrementa table_versions.campaigns antes do
+commit e marca as linhas gravadas com o novo valor (campaigns.version). O
+incremento trava a linha do contador até o commit (no SQLite, o banco inteiro),
+então as versões seguem a ordem dos commits: ao contrário de updated_at, uma
+transação que já leu a versão N não perde escritas confirmadas depois com
+versão <= N.
+"""
+from sqlalchemy import select, update, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.table_version_db import TableVersionDB
+
+CAMPAIGNS = "campaigns"
+
+
+async def bump_campaigns_version(db: AsyncSession) -> int:
+    """Incrementa a versão na transação corrente e devolve o novo valor"""
+    result = await db.execute(
+        update(TableVersionDB)
+        .where(TableVersionDB.name == CAMPAIGNS)
+        .values(version=TableVersionDB.version + 1)
+        .returning(TableVersionDB.version)
+        .execution_options(synchronize_session=False)
+    )
+    version = result.scalar_one_or_none()
+    if version is None:
+        # Banco criado antes da tabela de versões ganhar a linha inicial
+        await db.execute(insert(TableVersionDB).values(name=CAMPAIGNS, version=1))
+        version = 1
+    return version
+
+
+async def campaigns_version(db: AsyncSession) -> int:
+    """Última versão confirmada (0 antes da primeira escrita)"""
+    result = await db.execute(select(TableVersionDB.version).where(TableVersionDB.name == CAMPAIGNS))
+    return result.scalar() or 0
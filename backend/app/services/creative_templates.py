@@ -0,0 +1,274 @@
+"""
+Motor de criativos por templates
+
+Os templates são compilados uma vez, na importação do módulo: os campos são
+validados e cada texto vira um `str.format_map` pronto. Por requisição, cada
+template é renderizado uma única vez para o produto/público; as variações são
+combinações (headline × descrição × CTA × hashtags × texto principal)
+identificadas por um índice, então gerar milhares delas é só indexar listas.
+
+Com `seed`, a amostragem das combinações é reproduzível: a mesma semente
+devolve as mesmas variações na mesma ordem.
+"""
+import json
+import random
+import string
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+# Campos disponíveis nos templates
+TEMPLATE_FIELDS = {"product", "audience", "product_tag", "audience_tag", "platform"}
+
+PARTS = ("headline", "description", "cta", "hashtags", "primary_text")
+
+DEFAULT_TONE = "profissional"
+
+
+def _compile(template: str) -> Callable[[Dict[str, str]], str]:
+    """Valida os campos do template e devolve a função de renderização"""
+    for _, field, _, _ in string.Formatter().parse(template):
+        if field is not None and field not in TEMPLATE_FIELDS:
+            raise ValueError(f"Campo desconhecido '{field}' no template: {template}")
+    return template.format_map
+
+
+class TemplateSet:
+    """Templates de um tom, compilados"""
+
+    def __init__(
+        self,
+        headlines: Sequence[str],
+        descriptions: Sequence[str],
+        ctas: Sequence[str],
+        hashtags: Sequence[Sequence[str]],
+        primary_texts: Sequence[str]
+    ):
+        self.parts: Dict[str, List[Callable]] = {
+            "headline": [_compile(t) for t in headlines],
+            "description": [_compile(t) for t in descriptions],
+            "cta": [_compile(t) for t in ctas],
+            # Um conjunto de hashtags é renderizado como uma lista
+            "hashtags": [[_compile(tag) for tag in tags] for tags in hashtags],
+            "primary_text": [_compile(t) for t in primary_texts],
+        }
+        self.sizes = [len(self.parts[part]) for part in PARTS]
+        self.total = 1
+        for size in self.sizes:
+            self.total *= size
+
+    def render(self, context: Dict[str, str]) -> Dict[str, List[Any]]:
+        """Renderiza cada template uma vez para o contexto"""
+        rendered = {
+            part: [render(context) for render in self.parts[part]]
+            for part in PARTS if part != "hashtags"
+        }
+        rendered["hashtags"] = [[render(context) for render in tags] for tags in self.parts["hashtags"]]
+        return rendered
+
+    def decode(self, index: int) -> List[int]:
+        """Índice da combinação -> posição em cada parte (base mista)"""
+        positions = []
+        for size in self.sizes:
+            index, position = divmod(index, size)
+            positions.append(position)
+        return positions
+
+
+class CreativeTemplateRegistry:
+    """Registro de templates por tom, com geração combinatória de variações"""
+
+    def __init__(self):
+        self._sets: Dict[str, TemplateSet] = {}
+
+    def register(self, tone: str, template_set: TemplateSet) -> None:
+        self._sets[tone] = template_set
+
+    @property
+    def tones(self) -> List[str]:
+        return list(self._sets)
+
+    def get(self, tone: str) -> TemplateSet:
+        return self._sets.get(tone) or self._sets[DEFAULT_TONE]
+
+    def total_combinations(self, tone: str) -> int:
+        return self.get(tone).total
+
+    @staticmethod
+    def context(product: str, audience: str, platform: str) -> Dict[str, str]:
+        return {
+            "product": product,
+            "audience": audience,
+            "product_tag": product.replace(" ", ""),
+            "audience_tag": audience.replace(" ", ""),
+            "platform": platform,
+        }
+
+    def _indexes(self, total: int, limit: int, seed: Optional[int], offset: int) -> Sequence[int]:
+        count = max(0, min(limit, total - offset))
+        if seed is None:
+            return range(offset, offset + count)
+        # Permutação completa pela semente: páginas (offset) diferentes nunca se repetem
+        indexes = list(range(total))
+        random.Random(seed).shuffle(indexes)
+        return indexes[offset:offset + count]
+
+    def iter_variants(
+        self,
+        product: str,
+        audience: str,
+        tone: str = DEFAULT_TONE,
+        platform: str = "meta",
+        limit: int = 10,
+        seed: Optional[int] = None,
+        offset: int = 0
+    ) -> Iterator[Dict[str, Any]]:
+        """Variações em ordem (sem seed) ou amostradas de forma reproduzível (com seed)"""
+        template_set = self.get(tone)
+        rendered = template_set.render(self.context(product, audience, platform))
+        columns = [rendered[part] for part in PARTS]
+
+        for index in self._indexes(template_set.total, limit, seed, offset):
+            variant = {"variant_id": index}
+            for part, column, position in zip(PARTS, columns, template_set.decode(index)):
+                variant[part] = column[position]
+            yield variant
+
+    def iter_ndjson(
+        self,
+        product: str,
+        audience: str,
+        tone: str = DEFAULT_TONE,
+        platform: str = "meta",
+        limit: int = 10,
+        seed: Optional[int] = None,
+        offset: int = 0,
+        batch_size: int = 1000
+    ) -> Iterator[str]:
+        """
+        Variações em NDJSON, em blocos de `batch_size` linhas. Cada texto é
+        serializado uma vez; as linhas só concatenam os pedaços prontos.
+        """
+        template_set = self.get(tone)
+        rendered = template_set.render(self.context(product, audience, platform))
+        encoded = [
+            [f'"{part}": {json.dumps(value, ensure_ascii=False)}' for value in rendered[part]]
+            for part in PARTS
+        ]
+
+        platform_json = json.dumps(platform, ensure_ascii=False)
+        lines = []
+        for index in self._indexes(template_set.total, limit, seed, offset):
+            fields = ", ".join(column[position] for column, position in zip(encoded, template_set.decode(index)))
+            lines.append(f'{{"variant_id": {index}, {fields}, "platform": {platform_json}}}\n')
+            if len(lines) >= batch_size:
+                yield "".join(lines)
+                lines = []
+        if lines:
+            yield "".join(lines)
+
+    def sample(
+        self,
+        product: str,
+        audience: str,
+        tone: str = DEFAULT_TONE,
+        platform: str = "meta",
+        variants: int = 1,
+        seed: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """`variants` combinações distintas sorteadas (aleatórias sem seed)"""
+        if seed is None:
+            seed = random.getrandbits(32)
+        return list(self.iter_variants(product, audience, tone, platform, variants, seed))
+
+
+creative_templates = CreativeTemplateRegistry()
+
+creative_templates.register("profissional", TemplateSet(
+    headlines=[
+        "Solução Profissional para {product}",
+        "Eficiência em {product} para {audience}",
+        "Resultados Comprovados com {product}",
+        "{product}: performance para {audience}",
+        "O padrão em {product} que {audience} confiam",
+        "Mais resultado com {product}",
+        "{product} com suporte especializado",
+        "Escale seus resultados com {product}",
+    ],
+    descriptions=[
+        "Maximize seus resultados com nossa solução em {product}. Ideal para {audience}.",
+        "Tecnologia avançada para {product}. Desenvolvido para {audience}.",
+        "Transforme sua abordagem com {product}. Solução completa para {audience}.",
+        "Metodologia testada em {product}, com métricas claras para {audience}.",
+        "Reduza custos e ganhe previsibilidade com {product}.",
+        "Implantação rápida de {product} e acompanhamento dedicado para {audience}.",
+    ],
+    ctas=["Solicitar Demonstração", "Agendar Consulta", "Baixar Material", "Falar com Especialista", "Saiba Mais"],
+    hashtags=[
+        ["#{product_tag}", "#{audience_tag}", "#MarketingDigital"],
+        ["#{product_tag}", "#Resultados", "#Negócios"],
+        ["#{audience_tag}", "#Eficiência", "#{product_tag}"],
+        ["#{product_tag}", "#Profissional", "#Performance"],
+    ],
+    primary_texts=[
+        "{product} oferece a melhor solução para {audience}. Resultados comprovados e suporte especializado. Não perca esta oportunidade!",
+        "Empresas que usam {product} medem o retorno desde o primeiro mês. Veja como funciona para {audience}.",
+        "Conheça {product}: a escolha de {audience} que buscam resultado com segurança.",
+    ]
+))
+
+creative_templates.register("conversacional", TemplateSet(
+    headlines=[
+        "Descubra como {product} pode mudar seu dia a dia!",
+        "Você já conhece {product}? Perfeito para {audience}!",
+        "A revolução do {product} chegou!",
+        "Chega de complicação: {product} resolve!",
+        "{audience}, esse é pra vocês: {product}",
+        "Bora experimentar {product}?",
+        "Todo mundo falando de {product}. E você?",
+        "{product} do jeito que você queria",
+    ],
+    descriptions=[
+        "Junte-se a milhares de {audience} satisfeitos. Experimente {product} hoje mesmo!",
+        "Não espere mais para descobrir os benefícios do {product}. Feito para {audience} como você!",
+        "O que você está esperando? {product} é a solução que faltava para {audience}.",
+        "Simples, rápido e sem enrolação: {product} para {audience}.",
+        "Experimente {product} e conte pra gente o que achou!",
+        "Feito por quem entende {audience}: {product}.",
+    ],
+    ctas=["Experimente Grátis", "Começar Agora", "Quero Saber Mais", "Quero o Meu", "Vem Conferir"],
+    hashtags=[
+        ["#{product_tag}", "#{audience_tag}", "#MarketingDigital"],
+        ["#{product_tag}", "#Dica", "#Novidade"],
+        ["#{audience_tag}", "#{product_tag}", "#VemPraCá"],
+        ["#{product_tag}", "#Experimente", "#{audience_tag}"],
+    ],
+    primary_texts=[
+        "{product} oferece a melhor solução para {audience}. Resultados comprovados e suporte especializado. Não perca esta oportunidade!",
+        "Sabe aquela coisa que faltava? {product} chegou pra facilitar a vida de {audience}.",
+        "Testa aí: {product} foi pensado pra {audience} que não têm tempo a perder.",
+    ]
+))
+
+# Templates do simulador do Meta Ads
+creative_templates.register("persuasivo", TemplateSet(
+    headlines=[
+        "Descubra como {product} pode transformar seu negócio!",
+        "{audience}: A solução definitiva para {product}",
+        "Pare de perder tempo com {product} ineficientes",
+        "Revolucione sua abordagem com {product}",
+    ],
+    descriptions=[
+        "Especialmente desenvolvido para {audience}. Resultados comprovados em 30 dias.",
+        "Junte-se a milhares de {audience} satisfeitos. Método testado e aprovado.",
+        "Não espere mais para otimizar seus resultados. Solução completa para {audience}.",
+    ],
+    ctas=["Saiba Mais", "Comece Agora", "Teste Grátis", "Solicitar Demonstração"],
+    hashtags=[
+        ["#{product_tag}", "#{audience_tag}", "#MarketingDigital"],
+        ["#{product_tag}", "#Transformação", "#Resultados"],
+        ["#{audience_tag}", "#{product_tag}", "#Oferta"],
+    ],
+    primary_texts=[
+        "{product} oferece a melhor solução para {audience}. Resultados comprovados e suporte especializado. Não perca esta oportunidade!",
+        "Últimas vagas: {audience} que começam com {product} hoje têm condições especiais.",
+    ]
+))
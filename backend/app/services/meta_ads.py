@@ -2,6 +2,8 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime
 import json
 
+from app.services.creative_templates import creative_templates
+
 class MetaAdsSimulator:
     """Simulador seguro de Meta Ads para desenvolvimento"""
     
@@ -61,26 +63,11 @@ class MetaAdsSimulator:
     
     def generate_creative(self, product: str, audience: str) -> Dict[str, Any]:
         """Gera texto criativo para anúncios"""
-        creatives = {
-            "headlines": [
-                f"Descubra como {product} pode transformar seu negócio!",
-                f"{audience}: A solução definitiva para {product}",
-                f"Pare de perder tempo com {product} ineficientes",
-                f"Revolucione sua abordagem com {product}"
-            ],
-            "descriptions": [
-                f"Especialmente desenvolvido para {audience}. Resultados comprovados em 30 dias.",
-                f"Junte-se a milhares de {audience} satisfeitos. Método testado e aprovado.",
-                f"Não espere mais para otimizar seus resultados. Solução completa para {audience}."
-            ],
-            "ctas": ["Saiba Mais", "Comece Agora", "Teste Grátis", "Solicitar Demonstração"]
-        }
-        
-        import random
+        variant = creative_templates.sample(product, audience, tone="persuasivo", platform="meta")[0]
         return {
-            "headline": random.choice(creatives["headlines"]),
-            "description": random.choice(creativas["descriptions"]),
-            "cta": random.choice(creatives["ctas"]),
+            "headline": variant["headline"],
+            "description": variant["description"],
+            "cta": variant["cta"],
             "platform": "meta",
             "generated_at": datetime.now().isoformat()
         }
@@ -8,28 +8,33 @@ Necessita configuração no .env:
 """
 import os
 import json
-from typing import Dict, Any, List, Optional
-from datetime import datetime
-from facebook_business.api import FacebookAdsApi
-from facebook_business.adobjects.adaccount import AdAccount
-from facebook_business.adobjects.campaign import Campaign
-from facebook_business.adobjects.adset import AdSet
-from facebook_business.adobjects.ad import Ad
-from facebook_business.adobjects.adcreative import AdCreative
-from facebook_business.exceptions import FacebookRequestError
+import httpx
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
+from datetime import datetime, date
 from app.core.config import settings
+from app.services.meta_graph_client import meta_graph_client, MetaGraphError
+from app.services.meta_rate_limiter import meta_rate_limiter, is_throttle_error, backoff_delay
 import logging
 
+if TYPE_CHECKING:
+    from facebook_business.exceptions import FacebookRequestError
+
 logger = logging.getLogger(__name__)
 
 class RealMetaAdsService:
     """Serviço real para Meta Ads API"""
     
     def __init__(self):
-        self.initialized = False
-        self._init_facebook_api()
+        # O SDK do Facebook só é importado e inicializado no primeiro uso
+        self._initialized: Optional[bool] = None
+    
+    @property
+    def initialized(self) -> bool:
+        if self._initialized is None:
+            self._initialized = self._init_facebook_api()
+        return self._initialized
     
-    def _init_facebook_api(self):
+    def _init_facebook_api(self) -> bool:
         """Inicializa a API do Facebook"""
         try:
             if all([
@@ -37,26 +42,39 @@ class RealMetaAdsService:
                 settings.META_APP_SECRET, 
                 settings.META_ACCESS_TOKEN
             ]):
+                from facebook_business.api import FacebookAdsApi
+                
                 FacebookAdsApi.init(
                     app_id=settings.META_APP_ID,
                     app_secret=settings.META_APP_SECRET,
                     access_token=settings.META_ACCESS_TOKEN,
-                    api_version='v18.0'
+                    api_version=settings.META_API_VERSION
                 )
-                self.initialized = True
                 logger.info("✅ Meta Ads API inicializada com sucesso")
+                return True
             else:
                 logger.warning("⚠️ Meta Ads não configurado. Configure no .env")
-                self.initialized = False
+                return False
                 
         except Exception as e:
             logger.error(f"❌ Erro ao inicializar Meta Ads: {e}")
-            self.initialized = False
+            return False
+    
+    def _record_request_error(self, error: "FacebookRequestError") -> None:
+        """Throttling visto pelo SDK também pausa a conta no controle de taxa"""
+        if is_throttle_error(error.api_error_code(), error.http_status()):
+            meta_rate_limiter.record_throttle(
+                settings.META_AD_ACCOUNT_ID or "default",
+                error.http_headers() or {},
+                backoff_delay(0)
+            )
     
     def get_campaigns(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Busca campanhas reais da conta de ads"""
         if not self.initialized:
             return self._get_mock_campaigns()
+        from facebook_business.adobjects.adaccount import AdAccount
+        from facebook_business.exceptions import FacebookRequestError
         
         try:
             account = AdAccount(settings.META_AD_ACCOUNT_ID)
@@ -84,6 +102,7 @@ class RealMetaAdsService:
             return result
             
         except FacebookRequestError as e:
+            self._record_request_error(e)
             logger.error(f"Erro Meta API: {e}")
             return self._get_mock_campaigns()
         except Exception as e:
@@ -94,6 +113,8 @@ class RealMetaAdsService:
         """Cria uma campanha REAL no Meta Ads"""
         if not self.initialized:
             return self._mock_create_campaign(campaign_data)
+        from facebook_business.adobjects.adaccount import AdAccount
+        from facebook_business.exceptions import FacebookRequestError
         
         try:
             account = AdAccount(settings.META_AD_ACCOUNT_ID)
@@ -133,6 +154,8 @@ class RealMetaAdsService:
         """Busca insights de performance da campanha"""
         if not self.initialized:
             return self._mock_insights(campaign_id, days)
+        from facebook_business.adobjects.campaign import Campaign
+        from facebook_business.exceptions import FacebookRequestError
         
         try:
             campaign = Campaign(campaign_id)
@@ -164,10 +187,38 @@ class RealMetaAdsService:
             
             return self._mock_insights(campaign_id, days)
             
+        except FacebookRequestError as e:
+            self._record_request_error(e)
+            logger.error(f"Erro ao buscar insights: {e}")
+            return self._mock_insights(campaign_id, days)
         except Exception as e:
             logger.error(f"Erro ao buscar insights: {e}")
             return self._mock_insights(campaign_id, days)
     
+    async def get_insights_bulk(
+        self,
+        campaign_ids: List[str],
+        date_range: Tuple[date, date],
+        time_increment: Optional[int] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Busca insights de várias campanhas com poucas requisições em paralelo"""
+        since, until = date_range
+        days = (until - since).days + 1
+        if not meta_graph_client.configured:
+            return {campaign_id: self._mock_insights(campaign_id, days) for campaign_id in campaign_ids}
+        
+        try:
+            insights = await meta_graph_client.get_insights_bulk(
+                campaign_ids, since, until, time_increment=time_increment
+            )
+            for item in insights.values():
+                item.update({'period_days': days, 'platform': 'meta', 'real_data': True})
+            return insights
+            
+        except (MetaGraphError, httpx.HTTPError) as e:
+            logger.error(f"Erro ao buscar insights em lote: {e}")
+            return {campaign_id: self._mock_insights(campaign_id, days) for campaign_id in campaign_ids}
+    
     def _get_mock_campaigns(self) -> List[Dict[str, Any]]:
         """Dados mock para desenvolvimento"""
         return [
@@ -0,0 +1,270 @@
+"""
+Cliente assíncrono da Graph API do Meta para leituras em lote
+
+O SDK facebook_business faz uma requisição síncrona por campanha. Aqui os
+insights vêm do endpoint da conta (`level=campaign`), filtrados por lotes de
+IDs de campanha, com no máximo N lotes em paralelo.
+
+Todas as chamadas passam pelo controle de taxa por conta (meta_rate_limiter):
+erros de throttling são repetidos com backoff exponencial com jitter.
+
+A URL base é configurável (META_GRAPH_API_URL), o que permite apontar o
+cliente para um servidor falso local (ver benchmarks/fake_graph_api.py).
+"""
+import asyncio
+import json
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import track_upstream
+from app.services.meta_rate_limiter import (
+    MetaRateLimiter, meta_rate_limiter, is_throttle_error, backoff_delay, parse_usage
+)
+
+INSIGHT_FIELDS = [
+    "campaign_id", "campaign_name", "impressions", "clicks", "spend",
+    "cpc", "ctr", "reach", "frequency", "conversions"
+]
+
+CAMPAIGN_FIELDS = [
+    "id", "name", "status", "effective_status", "objective", "daily_budget",
+    "lifetime_budget", "bid_strategy", "created_time", "start_time", "stop_time"
+]
+
+# Linhas por página das listagens
+INSIGHTS_PAGE_LIMIT = 500
+
+
+class MetaGraphError(Exception):
+    """Erro retornado pela Graph API"""
+
+    def __init__(self, status_code: int, code: Optional[int], message: str):
+        super().__init__(f"[{status_code}] {message}")
+        self.status_code = status_code
+        self.code = code
+        self.message = message
+
+
+def _sum_actions(value: Any) -> int:
+    # `conversions` vem como lista de ações [{"action_type": ..., "value": "3"}]
+    if isinstance(value, list):
+        return int(sum(float(action.get("value", 0)) for action in value))
+    return int(float(value or 0))
+
+
+def parse_insight(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Converte uma linha de insights da Graph API para o formato da aplicação"""
+    return {
+        "impressions": int(row.get("impressions", 0)),
+        "clicks": int(row.get("clicks", 0)),
+        "spend": float(row.get("spend", 0)),
+        "cpc": float(row.get("cpc", 0)),
+        "ctr": float(row.get("ctr", 0)),
+        "reach": int(row.get("reach", 0)),
+        "conversions": _sum_actions(row.get("conversions")),
+    }
+
+
+class MetaGraphClient:
+    """Leituras em lote da Graph API com paralelismo limitado"""
+
+    def __init__(
+        self,
+        base_url: str,
+        api_version: str,
+        access_token: Optional[str],
+        ad_account_id: Optional[str],
+        concurrency: int = 4,
+        chunk_size: int = 50,
+        timeout: float = 30.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        rate_limiter: MetaRateLimiter = meta_rate_limiter
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.api_version = api_version
+        self.access_token = access_token
+        self.ad_account_id = ad_account_id
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.transport = transport
+        self.rate_limiter = rate_limiter
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.access_token and self.ad_account_id)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Cria o cliente HTTP sob demanda (conexões reaproveitadas entre lotes)"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=f"{self.base_url}/{self.api_version}",
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.concurrency),
+                transport=self.transport
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _get(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._request(path, {**params, "access_token": self.access_token})
+
+    async def _get_url(self, url: str) -> Dict[str, Any]:
+        # `paging.next` já traz todos os parâmetros, inclusive o token
+        return await self._request(url)
+
+    async def _request(self, url: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """GET respeitando o bucket da conta e repetindo em caso de throttling"""
+        account_id = self.ad_account_id
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire(account_id)
+            with track_upstream("meta_graph", "get"):
+                response = await self._get_client().get(url, params=params)
+            try:
+                payload = self._parse_response(response)
+            except MetaGraphError as e:
+                if not is_throttle_error(e.code, e.status_code):
+                    self.rate_limiter.record_response(account_id, response.headers)
+                    raise
+                delay = max(backoff_delay(attempt), parse_usage(response.headers)["regain_seconds"])
+                self.rate_limiter.record_throttle(account_id, response.headers, delay)
+                # Sem novas tentativas se o Meta pedir uma pausa maior que o backoff máximo
+                if attempt >= settings.META_MAX_RETRIES or delay > settings.META_BACKOFF_MAX_SECONDS:
+                    raise
+                attempt += 1
+                self.rate_limiter.record_retry(account_id)
+                continue
+            self.rate_limiter.record_response(account_id, response.headers)
+            return payload
+
+    @staticmethod
+    def _parse_response(response: httpx.Response) -> Dict[str, Any]:
+        try:
+            payload = response.json()
+        except ValueError:
+            payload = {}
+        if response.status_code >= 400 or "error" in payload:
+            error = payload.get("error", {})
+            raise MetaGraphError(
+                response.status_code,
+                error.get("code"),
+                error.get("message", response.text[:200])
+            )
+        return payload
+
+    async def _get_all_pages(self, path: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        payload = await self._get(path, params)
+        rows = list(payload.get("data", []))
+        while payload.get("paging", {}).get("next"):
+            payload = await self._get_url(payload["paging"]["next"])
+            rows.extend(payload.get("data", []))
+        return rows
+
+    async def get_campaigns(self) -> List[Dict[str, Any]]:
+        """Todas as campanhas da conta (percorre a paginação)"""
+        return await self._get_all_pages(
+            f"/{self.ad_account_id}/campaigns",
+            {"fields": ",".join(CAMPAIGN_FIELDS), "limit": INSIGHTS_PAGE_LIMIT}
+        )
+
+    async def _fetch_chunk(
+        self,
+        campaign_ids: Sequence[str],
+        since: date,
+        until: date,
+        time_increment: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        """Busca todas as páginas de insights de um lote de campanhas"""
+        params = {
+            "level": "campaign",
+            "fields": ",".join(INSIGHT_FIELDS),
+            "filtering": json.dumps([
+                {"field": "campaign.id", "operator": "IN", "value": list(campaign_ids)}
+            ]),
+            "time_range": json.dumps({"since": since.isoformat(), "until": until.isoformat()}),
+            "limit": INSIGHTS_PAGE_LIMIT,
+        }
+        if time_increment:
+            params["time_increment"] = time_increment
+
+        return await self._get_all_pages(f"/{self.ad_account_id}/insights", params)
+
+    async def get_insights_bulk(
+        self,
+        campaign_ids: Sequence[str],
+        since: date,
+        until: date,
+        time_increment: Optional[int] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Insights de várias campanhas no período, indexados pelo ID da campanha.
+        Com `time_increment` cada campanha traz também a série em `daily`.
+        """
+        unique_ids = list(dict.fromkeys(str(campaign_id) for campaign_id in campaign_ids))
+        chunks = [
+            unique_ids[start:start + self.chunk_size]
+            for start in range(0, len(unique_ids), self.chunk_size)
+        ]
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(chunk):
+            async with semaphore:
+                return await self._fetch_chunk(chunk, since, until, time_increment)
+
+        results = await asyncio.gather(*(run(chunk) for chunk in chunks))
+
+        # Campanhas sem entrega no período não aparecem na resposta da Graph API
+        insights: Dict[str, Dict[str, Any]] = {
+            campaign_id: {
+                "campaign_id": campaign_id,
+                "campaign_name": None,
+                **parse_insight({}),
+            }
+            for campaign_id in unique_ids
+        }
+        for rows in results:
+            for row in rows:
+                item = insights.get(str(row.get("campaign_id")))
+                if item is None:
+                    continue
+                values = parse_insight(row)
+                item["campaign_name"] = row.get("campaign_name")
+                if not time_increment:
+                    item.update(values)
+                    continue
+                item.setdefault("daily", []).append(
+                    {"date_start": row.get("date_start"), "date_stop": row.get("date_stop"), **values}
+                )
+                for key in ("impressions", "clicks", "spend", "conversions"):
+                    item[key] += values[key]
+
+        if time_increment:
+            for item in insights.values():
+                item.setdefault("daily", [])
+                # Alcance não é somável entre dias; as taxas são recalculadas
+                item["reach"] = None
+                item["spend"] = round(item["spend"], 2)
+                item["ctr"] = round(item["clicks"] / item["impressions"] * 100, 2) if item["impressions"] else 0.0
+                item["cpc"] = round(item["spend"] / item["clicks"], 2) if item["clicks"] else 0.0
+
+        return insights
+
+
+# Instância global do cliente
+meta_graph_client = MetaGraphClient(
+    base_url=settings.META_GRAPH_API_URL,
+    api_version=settings.META_API_VERSION,
+    access_token=settings.META_ACCESS_TOKEN,
+    ad_account_id=settings.META_AD_ACCOUNT_ID,
+    concurrency=settings.META_INSIGHTS_CONCURRENCY,
+    chunk_size=settings.META_INSIGHTS_CHUNK_SIZE
+)
@@ -0,0 +1,204 @@
+"""
+Controle de taxa das chamadas à Graph API do Meta
+
+Cada conta de anúncios tem um token bucket. A taxa do bucket se adapta ao uso
+informado pelo próprio Meta nos cabeçalhos de cada resposta
+(X-Business-Use-Case-Usage, X-Ad-Account-Usage, X-FB-Ads-Insights-Throttle):
+é multiplicada por alvo/uso (uma vez por segundo, entre 0,5x e 1,25x), então
+cai quando o uso passa do alvo e volta a subir quando há folga. Erros de throttling pausam a conta pelo tempo indicado pelo Meta.
+"""
+import asyncio
+import json
+import logging
+import random
+import time
+from typing import Any, Dict, Mapping, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Códigos de erro de limite de chamadas da Graph API
+THROTTLE_ERROR_CODES = {4, 17, 32, 613}
+BUSINESS_USE_CASE_THROTTLE_CODES = range(80000, 80015)
+
+# Ajuste da taxa: no máximo uma vez por intervalo, limitado entre os fatores
+ADJUST_INTERVAL_SECONDS = 1.0
+MAX_INCREASE_FACTOR = 1.25
+MIN_DECREASE_FACTOR = 0.5
+MIN_RATE_FRACTION = 0.05
+
+USAGE_HEADERS = ("x-business-use-case-usage", "x-ad-account-usage", "x-fb-ads-insights-throttle", "x-app-usage")
+
+
+def is_throttle_error(code: Optional[int], status_code: Optional[int] = None) -> bool:
+    return status_code == 429 or code in THROTTLE_ERROR_CODES or code in BUSINESS_USE_CASE_THROTTLE_CODES
+
+
+def backoff_delay(attempt: int) -> float:
+    """Backoff exponencial com jitter completo (evita novas tentativas sincronizadas)"""
+    ceiling = min(settings.META_BACKOFF_MAX_SECONDS, settings.META_BACKOFF_BASE_SECONDS * 2 ** attempt)
+    return random.uniform(0, ceiling)
+
+
+def parse_usage(headers: Mapping[str, str]) -> Dict[str, float]:
+    """
+    Extrai dos cabeçalhos o maior percentual de uso e o tempo (s) até liberar
+    o acesso. Os cabeçalhos são JSON com formatos diferentes entre si.
+    """
+    usage = 0.0
+    regain_seconds = 0.0
+
+    for name in USAGE_HEADERS:
+        raw = headers.get(name)
+        if not raw:
+            continue
+        try:
+            payload = json.loads(raw)
+        except ValueError:
+            continue
+
+        # X-Business-Use-Case-Usage: {"<business_id>": [{"call_count": 28, ...}]}
+        entries = []
+        if name == "x-business-use-case-usage" and isinstance(payload, dict):
+            for items in payload.values():
+                entries.extend(item for item in items if isinstance(item, dict))
+        elif isinstance(payload, dict):
+            entries.append(payload)
+
+        for entry in entries:
+            for key in ("call_count", "total_cputime", "total_time", "acc_id_util_pct", "app_id_util_pct"):
+                value = entry.get(key)
+                if isinstance(value, (int, float)):
+                    usage = max(usage, float(value))
+            # estimated_time_to_regain_access em minutos; reset_time_duration em segundos
+            regain_seconds = max(
+                regain_seconds,
+                float(entry.get("estimated_time_to_regain_access") or 0) * 60,
+                float(entry.get("reset_time_duration") or 0) if usage >= 100 else 0.0
+            )
+
+    return {"usage_pct": usage, "regain_seconds": regain_seconds}
+
+
+class TokenBucket:
+    """Token bucket assíncrono com taxa ajustável e pausa"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.paused_until = 0.0
+        self.adjusted_at = 0.0
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self) -> float:
+        """Espera um token; retorna quanto tempo esperou"""
+        waited = 0.0
+        # O lock mantém a ordem de chegada entre as requisições da mesma conta
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    delay = self.paused_until - now
+                else:
+                    self._refill(now)
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return waited
+                    delay = (1 - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def pause(self, seconds: float) -> None:
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+
+class MetaRateLimiter:
+    """Buckets por conta de anúncios, ajustados pelo uso reportado pelo Meta"""
+
+    def __init__(self, rate: float, burst: float, target_usage: float):
+        self.rate = rate
+        self.burst = burst
+        self.target_usage = target_usage
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._metrics: Dict[str, Dict[str, float]] = {}
+
+    def _bucket(self, account_id: str) -> TokenBucket:
+        if account_id not in self._buckets:
+            self._buckets[account_id] = TokenBucket(self.rate, self.burst)
+            self._metrics[account_id] = {
+                "requests": 0, "throttled": 0, "retries": 0,
+                "wait_seconds": 0.0, "usage_pct": 0.0
+            }
+        return self._buckets[account_id]
+
+    async def acquire(self, account_id: str) -> None:
+        waited = await self._bucket(account_id).acquire()
+        metrics = self._metrics[account_id]
+        metrics["requests"] += 1
+        metrics["wait_seconds"] += waited
+
+    def record_response(self, account_id: str, headers: Mapping[str, str]) -> None:
+        """Ajusta a taxa da conta para manter o uso reportado perto do alvo"""
+        bucket = self._bucket(account_id)
+        usage = parse_usage(headers)
+        usage_pct = usage["usage_pct"]
+        self._metrics[account_id]["usage_pct"] = usage_pct
+
+        if usage["regain_seconds"] > 0:
+            bucket.pause(usage["regain_seconds"])
+
+        # Um ajuste por intervalo: as respostas em voo refletem a mesma janela de uso
+        now = time.monotonic()
+        if now - bucket.adjusted_at < ADJUST_INTERVAL_SECONDS:
+            return
+        bucket.adjusted_at = now
+        factor = self.target_usage / usage_pct if usage_pct > 0 else MAX_INCREASE_FACTOR
+        factor = min(MAX_INCREASE_FACTOR, max(MIN_DECREASE_FACTOR, factor))
+        bucket.rate = min(bucket.max_rate, max(bucket.max_rate * MIN_RATE_FRACTION, bucket.rate * factor))
+
+    def record_throttle(self, account_id: str, headers: Mapping[str, str], delay: float) -> None:
+        """Resposta de throttling: pausa a conta e corta a taxa pela metade"""
+        bucket = self._bucket(account_id)
+        self.record_response(account_id, headers)
+        bucket.rate = max(bucket.max_rate * MIN_RATE_FRACTION, bucket.rate * MIN_DECREASE_FACTOR)
+        bucket.adjusted_at = time.monotonic()
+        bucket.pause(delay)
+        self._metrics[account_id]["throttled"] += 1
+        logger.warning(
+            f"⚠️ Throttling do Meta na conta {account_id}: nova taxa {bucket.rate:.2f} req/s, "
+            f"pausa de {delay:.1f}s"
+        )
+
+    def record_retry(self, account_id: str) -> None:
+        self._bucket(account_id)
+        self._metrics[account_id]["retries"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            account_id: {
+                **self._metrics[account_id],
+                "wait_seconds": round(self._metrics[account_id]["wait_seconds"], 3),
+                "rate_per_second": round(bucket.rate, 3),
+                "max_rate_per_second": bucket.max_rate,
+                "paused_seconds": round(max(0.0, bucket.paused_until - now), 1)
+            }
+            for account_id, bucket in self._buckets.items()
+        }
+
+
+# Instância global (compartilhada por todos os clientes da Graph API)
+meta_rate_limiter = MetaRateLimiter(
+    rate=settings.META_RATE_LIMIT_PER_SECOND,
+    burst=settings.META_RATE_LIMIT_BURST,
+    target_usage=settings.META_RATE_LIMIT_TARGET_USAGE_PCT
+)
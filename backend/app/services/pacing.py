@@ -0,0 +1,226 @@
+"""
+Pacing de orçamento das campanhas ativas: gasto esperado x realizado
+
+A curva esperada de cada campanha é linear no tempo: orçamento diário x dias
+decorridos, ou orçamento vitalício x fração decorrida entre start_date e
+end_date. O realizado é o total_spent acumulado, comparado no mesmo ponto da
+curva: até o fim do último dia com métricas (o dia corrente conta pela fração
+já passada), para o atraso da ingestão não parecer subinvestimento.
+
+O estado das campanhas ativas fica em memória e só o que mudou é relido: toda
+escrita em campaigns (edições, ingestão de métricas, regras) incrementa a
+versão da tabela e marca as linhas gravadas (campaign_versions), então cada
+leitura busca as campanhas com version > a versão da leitura anterior. A
+versão segue a ordem dos commits, ao contrário de updated_at, que é definido
+antes do commit e pode ficar abaixo de uma marca já lida. Remoções são
+detectadas pela contagem de ativas, e uma recarga completa periódica
+(PACING_FULL_RELOAD_SECONDS) cobre escritas feitas fora da aplicação.
+O cálculo dos indicadores é vetorizado sobre todas as campanhas de uma vez.
+"""
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.campaign import PacingStatus
+from app.schemas.campaign_db import CampaignDB, CampaignStatus, BudgetType, PlatformEnum
+from app.schemas.campaign_metrics_db import CampaignDailyMetricsDB
+from app.services.campaign_versions import campaigns_version
+
+STATE_COLUMNS = [
+    "id", "name", "platform", "status", "budget_type", "budget_amount",
+    "start_date", "end_date", "total_spent", "last_metric_date"
+]
+
+
+def _state_query():
+    daily = CampaignDailyMetricsDB
+    # Subconsulta correlacionada: usa o índice único (campaign_id, date)
+    last_metric_date = (
+        select(func.max(daily.date)).where(daily.campaign_id == CampaignDB.id).scalar_subquery()
+    )
+    return select(
+        CampaignDB.id, CampaignDB.name, CampaignDB.platform, CampaignDB.status,
+        CampaignDB.budget_type, CampaignDB.budget_amount, CampaignDB.start_date,
+        CampaignDB.end_date, CampaignDB.total_spent, last_metric_date.label("last_metric_date")
+    )
+
+
+def compute_pacing(state: pd.DataFrame, now: datetime, tolerance: float) -> pd.DataFrame:
+    """Indicadores de pacing de todas as campanhas do estado, sem laço por campanha"""
+    today = pd.Timestamp(now.date())
+    day_fraction = (now - datetime.combine(now.date(), datetime.min.time())).total_seconds() / 86400
+
+    start = state["start_date"]
+    end = state["end_date"]
+    last_metric = state["last_metric_date"]
+    budget = state["budget_amount"].to_numpy(dtype=np.float64)
+    actual = state["total_spent"].fillna(0).to_numpy(dtype=np.float64)
+    is_daily = state["budget_type"].isin([BudgetType.DAILY]).to_numpy() | state["budget_type"].isna().to_numpy()
+
+    # Sem métricas ou com métricas de hoje: o gasto vale até agora
+    is_partial = (last_metric.isna() | (last_metric >= today)).to_numpy()
+    as_of = last_metric.where(~is_partial, today)
+    total_days = ((end - start).dt.days + 1).to_numpy(dtype=np.float64)  # NaN sem end_date
+    elapsed = (as_of - start).dt.days.to_numpy(dtype=np.float64) + np.where(is_partial, day_fraction, 1.0)
+    elapsed = np.fmin(np.clip(elapsed, 0, None), total_days)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        expected = np.where(is_daily, budget * elapsed, budget * elapsed / total_days)
+        planned = np.where(is_daily, budget * total_days, budget)
+        pacing = np.where(expected > 0, actual / expected, np.nan)
+        projected = np.where(elapsed > 0, actual / elapsed * total_days, np.nan)
+
+    status = np.select(
+        [elapsed <= 0, np.isnan(expected), pacing > 1 + tolerance, pacing < 1 - tolerance],
+        [PacingStatus.NOT_STARTED.value, PacingStatus.NO_END_DATE.value, PacingStatus.OVER.value,
+         PacingStatus.UNDER.value],
+        PacingStatus.ON_TRACK.value
+    )
+
+    return pd.DataFrame({
+        "id": state.index.to_numpy(),
+        "name": state["name"].to_numpy(),
+        "platform": state["platform"].to_numpy(),
+        "budget_type": state["budget_type"].to_numpy(),
+        "budget_amount": budget,
+        "start_date": start.to_numpy(),
+        "end_date": end.to_numpy(),
+        "as_of": as_of.to_numpy(),
+        "elapsed_days": np.round(elapsed, 2),
+        "total_days": total_days,
+        "expected_spend": np.round(expected, 2),
+        "actual_spend": np.round(actual, 2),
+        "deviation": np.round(actual - expected, 2),
+        "pacing_pct": np.round(pacing * 100, 2),
+        "projected_spend": np.round(projected, 2),
+        "planned_budget": np.round(planned, 2),
+        "pacing_status": status,
+    })
+
+
+class PacingEngine:
+    """Estado de pacing das campanhas ativas, atualizado só com o que mudou"""
+
+    def __init__(self, tolerance_pct: float = 20.0, full_reload_seconds: int = 600):
+        self.tolerance = tolerance_pct / 100
+        self.full_reload_seconds = full_reload_seconds
+        self._state: Optional[pd.DataFrame] = None  # Indexado pelo id da campanha
+        self._version: Optional[int] = None  # Versão de campaigns já aplicada ao estado
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        self.full_reloads = 0
+        self.incremental_updates = 0
+
+    async def _load(self, db: AsyncSession, *where) -> pd.DataFrame:
+        result = await db.execute(_state_query().where(*where))
+        frame = pd.DataFrame.from_records(result.all(), columns=STATE_COLUMNS).set_index("id")
+        # Datas convertidas uma vez aqui, não a cada leitura
+        for column in ("start_date", "end_date"):
+            frame[column] = pd.to_datetime(frame[column]).dt.normalize()
+        frame["last_metric_date"] = pd.to_datetime(frame["last_metric_date"])
+        return frame
+
+    async def _full_reload(self, db: AsyncSession) -> None:
+        self._state = await self._load(db, CampaignDB.status == CampaignStatus.ACTIVE)
+        self._loaded_at = time.monotonic()
+        self.full_reloads += 1
+
+    async def _apply_changes(self, db: AsyncSession) -> None:
+        """Relê as campanhas gravadas depois da última versão: entram as ativas, saem as demais"""
+        changed = await self._load(db, CampaignDB.version > self._version)
+        active = changed[changed["status"].isin([CampaignStatus.ACTIVE])]
+        state = self._state.drop(changed.index, errors="ignore")
+        if not len(state):
+            state = active
+        elif len(active):
+            state = pd.concat([state, active])
+        self._state = state
+        self.incremental_updates += 1
+
+    async def _drop_removed(self, db: AsyncSession, active_count: int) -> None:
+        """Tira do estado as campanhas que não estão mais no banco (só os ids são lidos)"""
+        result = await db.execute(select(CampaignDB.id).where(CampaignDB.status == CampaignStatus.ACTIVE))
+        self._state = self._state[self._state.index.isin(result.scalars().all())]
+        if len(self._state) != active_count:
+            await self._full_reload(db)
+
+    async def refresh(self, db: AsyncSession) -> pd.DataFrame:
+        """Aplica as mudanças desde a última leitura e devolve o estado"""
+        async with self._lock:
+            # Lida antes das linhas: o que mudar durante a leitura entra na próxima
+            version = await campaigns_version(db)
+
+            if self._state is None or time.monotonic() - self._loaded_at > self.full_reload_seconds:
+                await self._full_reload(db)
+            else:
+                if version != self._version:
+                    await self._apply_changes(db)
+                # Campanhas ativas removidas não deixam linha com versão nova
+                active_count = (await db.execute(
+                    select(func.count()).where(CampaignDB.status == CampaignStatus.ACTIVE)
+                )).scalar()
+                if active_count != len(self._state):
+                    await self._drop_removed(db, active_count)
+
+            self._version = version
+            return self._state
+
+    async def report(self, db: AsyncSession, now: Optional[datetime] = None) -> pd.DataFrame:
+        state = await self.refresh(db)
+        return compute_pacing(state, now or datetime.now(), self.tolerance)
+
+
+def _totals(frame: pd.DataFrame) -> Dict[str, Any]:
+    paced = frame[frame["expected_spend"] > 0]
+    expected = float(paced["expected_spend"].sum())
+    actual = float(paced["actual_spend"].sum())
+    return {
+        "expected_spend": round(expected, 2),
+        "actual_spend": round(actual, 2),
+        "pacing_pct": round(actual / expected * 100, 2) if expected > 0 else None,
+    }
+
+
+def pacing_report_json(
+    frame: pd.DataFrame,
+    now: datetime,
+    tolerance: float,
+    platform: Optional[PlatformEnum] = None,
+    statuses: Optional[List[PacingStatus]] = None,
+    top: Optional[int] = None
+) -> str:
+    """Resumo da conta e campanhas ordenadas pelo maior desvio (serializadas pelo pandas)"""
+    if platform:
+        frame = frame[frame["platform"].isin([platform])]
+    counts = {status.value: 0 for status in PacingStatus}
+    counts.update(frame["pacing_status"].value_counts().to_dict())
+    totals = _totals(frame) if len(frame) else None
+
+    active_campaigns = len(frame)
+
+    if statuses:
+        frame = frame[frame["pacing_status"].isin([status.value for status in statuses])]
+    deviation = (frame["pacing_pct"] - 100).abs().sort_values(ascending=False, na_position="last", kind="stable")
+    ranked = frame.loc[deviation.index[:top] if top else deviation.index]
+
+    header = json.dumps({
+        "as_of": now.isoformat(timespec="seconds"),
+        "tolerance_pct": round(tolerance * 100, 2),
+        "active_campaigns": active_campaigns,
+        "by_status": counts,
+        "totals": totals,
+        "count": len(ranked),
+    })
+    rows = ranked.to_json(orient="records", date_format="iso", date_unit="s")
+    return f'{header[:-1]}, "campaigns": {rows}}}'
+
+
+pacing_engine = PacingEngine(settings.PACING_TOLERANCE_PCT, settings.PACING_FULL_RELOAD_SECONDS)
@@ -0,0 +1,309 @@
+"""
+Motor de regras automáticas sobre as campanhas
+
+Cada regra é compilada para uma única consulta SQL: as métricas (somas do fato
+diário nos últimos `window_days` dias, ou os acumulados da campanha) e os KPIs
+derivados viram expressões, e as condições viram o WHERE. Razões com
+denominador zero são NULL e não satisfazem nenhuma condição (CPA sem conversões
+não é "CPA > 50").
+
+A ação é aplicada com um único UPDATE ... WHERE id IN (<consulta da regra>)
+RETURNING id, e o histórico (rule_audit_log) é gravado em lote na mesma
+transação. No dry-run só a consulta roda e o resultado diz o que mudaria.
+Regras de alerta não alteram campanhas: cada campanha entra no histórico no
+máximo uma vez por regra e por dia, para a execução periódica não repetir o
+mesmo alerta a cada rodada.
+
+O agendador roda todas as regras habilitadas a cada RULES_INTERVAL_SECONDS.
+Com vários workers do uvicorn, habilite em um só processo.
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import select, update, insert, func, case, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.broadcaster import campaign_events
+from app.core.config import settings
+from app.database import AsyncSessionLocal
+from app.schemas.campaign_db import CampaignDB, CampaignStatus
+from app.schemas.campaign_metrics_db import CampaignDailyMetricsDB
+from app.schemas.rule_db import AutomationRuleDB, RuleAuditLogDB, RuleActionEnum
+from app.services.campaign_metrics import METRIC_COLUMNS
+from app.services.campaign_versions import bump_campaigns_version
+
+logger = logging.getLogger(__name__)
+
+# Campanhas sobre as quais cada ação atua e o status resultante
+ACTION_SCOPE = {
+    RuleActionEnum.PAUSE: (CampaignStatus.ACTIVE, CampaignStatus.PAUSED),
+    RuleActionEnum.ACTIVATE: (CampaignStatus.PAUSED, CampaignStatus.ACTIVE),
+    RuleActionEnum.ALERT: (CampaignStatus.ACTIVE, None),
+}
+
+OPERATORS = {
+    "gt": lambda column, value: column > value,
+    "gte": lambda column, value: column >= value,
+    "lt": lambda column, value: column < value,
+    "lte": lambda column, value: column <= value,
+    "eq": lambda column, value: column == value,
+}
+
+# Campanhas listadas no resultado do dry-run e no evento do stream
+MAX_REPORTED_CAMPAIGNS = 500
+
+
+def _ratio(numerator, denominator, scale: float = 1.0):
+    """numerator / denominator * scale, NULL quando o denominador é 0"""
+    return case((denominator > 0, numerator * scale / denominator), else_=None)
+
+
+def metric_expressions(totals: Dict[str, Any]) -> Dict[str, Any]:
+    """Expressões SQL de cada métrica a partir das colunas de totais"""
+    spend, impressions, clicks = totals["spend"], totals["impressions"], totals["clicks"]
+    conversions, value = totals["conversions"], totals["conversion_value"]
+    return {
+        **totals,
+        "ctr": _ratio(clicks, impressions, 100.0),
+        "cpc": _ratio(spend, clicks),
+        "conversion_rate": _ratio(conversions, clicks, 100.0),
+        "cpa": _ratio(spend, conversions),
+        "roas": _ratio(value, spend),
+    }
+
+
+def compile_rule(rule: AutomationRuleDB, today):
+    """Consulta das campanhas que satisfazem a regra: id, nome, status e as métricas das condições"""
+    scope_status, _ = ACTION_SCOPE[rule.action]
+    query = select(CampaignDB.id, CampaignDB.name, CampaignDB.status).select_from(CampaignDB)
+
+    if rule.window_days:
+        daily = CampaignDailyMetricsDB
+        window = (
+            select(
+                daily.campaign_id,
+                *(func.sum(getattr(daily, column)).label(column) for column in METRIC_COLUMNS)
+            )
+            .where(daily.date > today - timedelta(days=rule.window_days), daily.date <= today)
+            .group_by(daily.campaign_id)
+            .subquery("window")
+        )
+        query = query.join(window, window.c.campaign_id == CampaignDB.id)
+        totals = {column: window.c[column] for column in METRIC_COLUMNS}
+    else:
+        totals = {
+            "spend": CampaignDB.total_spent,
+            "impressions": CampaignDB.impressions,
+            "clicks": CampaignDB.clicks,
+            "conversions": CampaignDB.conversions,
+            "conversion_value": CampaignDB.conversion_value,
+        }
+    # Multiplicação por 1.0: divisão real também entre inteiros
+    totals = {column: expression * literal(1.0) for column, expression in totals.items()}
+    expressions = metric_expressions(totals)
+
+    metrics = sorted({condition["metric"] for condition in rule.conditions})
+    query = query.add_columns(*(expressions[metric].label(metric) for metric in metrics))
+    query = query.where(CampaignDB.status == scope_status)
+    if rule.platform:
+        query = query.where(CampaignDB.platform == rule.platform)
+    for condition in rule.conditions:
+        query = query.where(OPERATORS[condition["operator"]](expressions[condition["metric"]], condition["value"]))
+    return query.order_by(CampaignDB.id)
+
+
+def _metrics_snapshot(row, metrics: Sequence[str]) -> Dict[str, Optional[float]]:
+    return {
+        metric: None if row._mapping[metric] is None else round(float(row._mapping[metric]), 4)
+        for metric in metrics
+    }
+
+
+async def evaluate_rule(
+    db: AsyncSession,
+    rule: AutomationRuleDB,
+    run_id: str,
+    now: datetime,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """Avalia a regra e, fora do dry-run, aplica a ação em lote e grava o histórico (sem commit)"""
+    query = compile_rule(rule, now.date())
+    metrics = sorted({condition["metric"] for condition in rule.conditions})
+    matched = {row.id: row for row in await db.execute(query)}
+    _, new_status = ACTION_SCOPE[rule.action]
+
+    result = {
+        "rule_id": rule.id,
+        "rule_name": rule.name,
+        "action": rule.action,
+        "matched": len(matched),
+        "changed": 0,
+    }
+    if dry_run:
+        result["campaigns"] = [
+            {"id": row.id, "name": row.name, "status": row.status, "metrics": _metrics_snapshot(row, metrics)}
+            for row in list(matched.values())[:MAX_REPORTED_CAMPAIGNS]
+        ]
+        return result
+
+    if new_status is None:
+        # Alerta: só as campanhas ainda não alertadas por esta regra hoje
+        alerted_today = await db.execute(
+            select(RuleAuditLogDB.campaign_id).where(
+                RuleAuditLogDB.rule_id == rule.id,
+                RuleAuditLogDB.created_at >= datetime.combine(now.date(), datetime.min.time())
+            )
+        )
+        already_alerted = set(alerted_today.scalars().all())
+        affected = [campaign_id for campaign_id in matched if campaign_id not in already_alerted]
+        result["alerted"] = len(affected)
+    elif not matched:
+        # Nada a alterar: sem UPDATE e sem nova versão (ETags e pacing continuam válidos)
+        affected = []
+    else:
+        # A própria consulta da regra como subconsulta: um único UPDATE, reavaliado no banco
+        ids = query.with_only_columns(CampaignDB.id).order_by(None).correlate(None)
+        updated = await db.execute(
+            update(CampaignDB)
+            .where(CampaignDB.id.in_(ids))
+            .values(status=new_status, updated_at=now, version=await bump_campaigns_version(db))
+            .returning(CampaignDB.id)
+            .execution_options(synchronize_session=False)
+        )
+        affected = sorted(updated.scalars().all())
+        result["changed"] = len(affected)
+
+    if affected:
+        scope_status, _ = ACTION_SCOPE[rule.action]
+        await db.execute(insert(RuleAuditLogDB.__table__), [
+            {
+                "run_id": run_id,
+                "rule_id": rule.id,
+                "rule_name": rule.name,
+                "campaign_id": campaign_id,
+                "action": rule.action,
+                "previous_status": scope_status,
+                "new_status": new_status,
+                "metrics": _metrics_snapshot(matched[campaign_id], metrics) if campaign_id in matched else None,
+                "created_at": now,
+            }
+            for campaign_id in affected
+        ])
+    rule.last_run_at = now
+    rule.last_matched = len(matched)
+    result["campaign_ids"] = affected
+    return result
+
+
+def _publish(result: Dict[str, Any], run_id: str) -> None:
+    ids = result.pop("campaign_ids")
+    if not ids:
+        return
+    campaign_events.publish("rules.applied", {
+        "run_id": run_id,
+        "rule_id": result["rule_id"],
+        "action": result["action"],
+        "campaigns_affected": len(ids),
+        # Acima do limite o evento leva só a contagem (o cliente recarrega)
+        "campaigns": ids if len(ids) <= MAX_REPORTED_CAMPAIGNS else None,
+    })
+
+
+async def run_rules(
+    db: AsyncSession,
+    rule_ids: Optional[Sequence[int]] = None,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """Avalia as regras habilitadas (ou as informadas) em ordem de id, numa única transação"""
+    query = select(AutomationRuleDB).order_by(AutomationRuleDB.id)
+    if rule_ids is None:
+        query = query.where(AutomationRuleDB.enabled.is_(True))
+    else:
+        query = query.where(AutomationRuleDB.id.in_(rule_ids))
+    rules = (await db.execute(query)).scalars().all()
+
+    run_id = uuid.uuid4().hex
+    now = datetime.now()
+    results = [await evaluate_rule(db, rule, run_id, now, dry_run) for rule in rules]
+
+    if dry_run:
+        await db.rollback()
+    else:
+        await db.commit()
+        for result in results:
+            _publish(result, run_id)
+
+    return {
+        "run_id": run_id,
+        "dry_run": dry_run,
+        "evaluated_at": now,
+        "rules": results,
+    }
+
+
+class RulesWorker:
+    """Agendador asyncio que avalia as regras periodicamente no processo da API"""
+
+    def __init__(self, session_factory=AsyncSessionLocal):
+        self.session_factory = session_factory
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self.last_run: Optional[Dict[str, Any]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def run_once(self) -> Dict[str, Any]:
+        """Uma rodada com todas as regras habilitadas (execuções simultâneas esperam a atual)"""
+        async with self._lock:
+            async with self.session_factory() as db:
+                self.last_run = await run_rules(db)
+            changed = sum(result["changed"] for result in self.last_run["rules"])
+            logger.info(f"⚙️ Regras avaliadas: {len(self.last_run['rules'])}, campanhas alteradas: {changed}")
+            return self.last_run
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"❌ Erro ao avaliar as regras: {e}")
+            await asyncio.sleep(settings.RULES_INTERVAL_SECONDS)
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._loop())
+            logger.info(f"⚙️ Regras automáticas a cada {settings.RULES_INTERVAL_SECONDS}s")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+async def list_audit_log(
+    db: AsyncSession,
+    rule_id: Optional[int] = None,
+    campaign_id: Optional[int] = None,
+    run_id: Optional[str] = None,
+    limit: int = 100
+) -> List[RuleAuditLogDB]:
+    query = select(RuleAuditLogDB).order_by(RuleAuditLogDB.created_at.desc(), RuleAuditLogDB.id.desc())
+    if rule_id is not None:
+        query = query.where(RuleAuditLogDB.rule_id == rule_id)
+    if campaign_id is not None:
+        query = query.where(RuleAuditLogDB.campaign_id == campaign_id)
+    if run_id is not None:
+        query = query.where(RuleAuditLogDB.run_id == run_id)
+    return (await db.execute(query.limit(limit))).scalars().all()
+
+
+rules_worker = RulesWorker()
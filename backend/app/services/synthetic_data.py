@@ -0,0 +1,239 @@
+"""
+Gerador de dados sintéticos para testes de carga
+
+Cria campanhas em todas as plataformas com histórico de métricas diárias.
+Cada plataforma tem CTR, CPC, taxa de conversão e ticket médio típicos, e cada
+campanha sorteia os seus em torno deles (log-normal), então CTR e CPA variam
+como em uma conta real. Os totais das campanhas são a soma do histórico.
+
+Tudo é gerado com numpy em blocos de campanhas e gravado com INSERTs em lote
+(executemany) numa única transação: ou o lote inteiro entra, ou nada entra.
+A geração de cada bloco roda numa thread, fora do event loop da API.
+"""
+import asyncio
+import time
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.campaign_db import CampaignDB, PlatformEnum, CampaignStatus, BudgetType
+from app.schemas.campaign_metrics_db import CampaignDailyMetricsDB
+from app.services.campaign_versions import bump_campaigns_version
+
+# Campanhas geradas (e gravadas) por vez
+GENERATION_CHUNK_SIZE = 10000
+# Blocos menores no endpoint: a gravação de cada bloco ocupa o event loop
+# (~150 ms com 90 dias), e as demais requisições rodam entre um bloco e outro
+API_CHUNK_SIZE = 200
+
+# (CTR, CPC, taxa de conversão, ticket médio) medianos por plataforma
+PLATFORM_PROFILES = {
+    PlatformEnum.GOOGLE_ADS: (0.035, 2.00, 0.040, 180.0),
+    PlatformEnum.META_ADS: (0.012, 0.90, 0.025, 150.0),
+    PlatformEnum.TIKTOK_ADS: (0.010, 0.60, 0.015, 120.0),
+    PlatformEnum.LINKEDIN_ADS: (0.005, 6.00, 0.030, 600.0),
+    PlatformEnum.TWITTER_ADS: (0.008, 1.00, 0.012, 130.0),
+    PlatformEnum.PINTEREST_ADS: (0.004, 0.80, 0.020, 160.0),
+}
+PLATFORM_WEIGHTS = (0.35, 0.35, 0.12, 0.07, 0.05, 0.06)
+
+STATUSES = (CampaignStatus.ACTIVE, CampaignStatus.PAUSED, CampaignStatus.ENDED,
+            CampaignStatus.DRAFT, CampaignStatus.ARCHIVED)
+STATUS_WEIGHTS = (0.45, 0.20, 0.20, 0.10, 0.05)
+
+OBJECTIVES = ("Conversão", "Tráfego", "Alcance", "Leads", "Remarketing", "Vendas do Catálogo")
+PRODUCTS = ("Tênis", "Curso Online", "Plano Premium", "Smartphone", "Cosméticos", "Consultoria",
+            "Assinatura", "Eletrodomésticos", "Moda Praia", "Software B2B")
+AUDIENCES = ("18-24 anos, universitários", "25-34 anos, jovens profissionais", "35-44 anos, pais",
+             "45+ anos, alta renda", "Empresas de 10-200 funcionários", "Visitantes do site (30 dias)")
+BID_STRATEGIES = ("maximize_conversions", "target_cpa", "lowest_cost", "target_roas", "manual_cpc")
+KEYWORDS = ("oferta", "desconto", "frete grátis", "lançamento", "promoção", "black friday",
+            "premium", "online", "comprar", "melhor preço")
+
+
+def _lognormal(rng: np.random.Generator, median: np.ndarray, sigma: float) -> np.ndarray:
+    return median * rng.lognormal(0.0, sigma, size=len(median))
+
+
+def generate_chunk(
+    rng: np.random.Generator,
+    first_id: int,
+    n_campaigns: int,
+    days: int,
+    today: date
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Campanhas com IDs a partir de `first_id` e suas métricas diárias"""
+    ids = np.arange(first_id, first_id + n_campaigns)
+    platforms = np.array(list(PLATFORM_PROFILES), dtype=object)
+    platform_index = rng.choice(len(platforms), size=n_campaigns, p=PLATFORM_WEIGHTS)
+    status_index = rng.choice(len(STATUSES), size=n_campaigns, p=STATUS_WEIGHTS)
+    statuses = np.array(STATUSES, dtype=object)[status_index]
+    profiles = np.array([PLATFORM_PROFILES[p] for p in platforms])[platform_index]
+
+    # Desempenho próprio de cada campanha em torno do perfil da plataforma
+    ctr = np.clip(_lognormal(rng, profiles[:, 0], 0.35), 0.0005, 0.25)
+    cpc = np.clip(_lognormal(rng, profiles[:, 1], 0.30), 0.05, None)
+    cvr = np.clip(_lognormal(rng, profiles[:, 2], 0.50), 0.001, 0.5)
+    order_value = profiles[:, 3]
+
+    # Período: rascunhos começam no futuro, encerradas já terminaram
+    # Comparação pelos índices: numpy não compara enums str com arrays de objetos
+    is_draft = status_index == STATUSES.index(CampaignStatus.DRAFT)
+    is_ended = np.isin(status_index, [STATUSES.index(CampaignStatus.ENDED), STATUSES.index(CampaignStatus.ARCHIVED)])
+    today_ordinal = today.toordinal()
+    start = today_ordinal - rng.integers(0, max(2 * days, 1), size=n_campaigns)
+    start = np.where(is_draft, today_ordinal + rng.integers(1, 31, size=n_campaigns), start)
+    duration = rng.integers(7, max(days, 8) + 1, size=n_campaigns)
+    end = np.where(is_ended, np.minimum(start + duration, today_ordinal - 1), -1)
+    has_planned_end = ~is_ended & (rng.random(n_campaigns) < 0.3)
+    end = np.where(has_planned_end, np.maximum(start, today_ordinal) + duration, end)
+    start = np.minimum(start, np.where(end >= 0, end, start))
+
+    is_daily = rng.random(n_campaigns) < 0.7
+    daily_budget = np.round(np.clip(rng.lognormal(np.log(150), 0.8, size=n_campaigns), 10, 20000), 2)
+    planned_days = np.where(end >= 0, end - start + 1, 30)
+    budget_amount = np.where(is_daily, daily_budget, np.round(daily_budget * planned_days, 2))
+
+    # Histórico: dias entre o início (ou `days` atrás) e o fim (ou hoje)
+    first_day = np.maximum(start, today_ordinal - days + 1)
+    last_day = np.where(end >= 0, np.minimum(end, today_ordinal), today_ordinal)
+    lengths = np.where(is_draft | (days <= 0), 0, np.clip(last_day - first_day + 1, 0, None))
+    campaign_of_row = np.repeat(np.arange(n_campaigns), lengths)
+    offsets = np.arange(len(campaign_of_row)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    day_ordinals = first_day[campaign_of_row] + offsets
+
+    n_rows = len(campaign_of_row)
+    pacing = rng.beta(8, 2, size=n_rows) * rng.lognormal(0.0, 0.25, size=n_rows)
+    day_cpc = cpc[campaign_of_row] * rng.lognormal(0.0, 0.15, size=n_rows)
+    clicks = rng.poisson(daily_budget[campaign_of_row] * pacing / day_cpc)
+    day_ctr = np.clip(ctr[campaign_of_row] * rng.lognormal(0.0, 0.15, size=n_rows), 0.0005, 0.5)
+    impressions = np.maximum(np.round(clicks / day_ctr), clicks).astype(np.int64)
+    conversions = rng.binomial(clicks, cvr[campaign_of_row])
+    spend = np.round(clicks * day_cpc, 2)
+    conversion_value = np.round(
+        conversions * order_value[campaign_of_row] * rng.lognormal(0.0, 0.4, size=n_rows), 2
+    )
+
+    # Totais das campanhas = soma do histórico
+    totals = {
+        name: np.bincount(campaign_of_row, weights=values, minlength=n_campaigns)
+        for name, values in (("total_spent", spend), ("impressions", impressions), ("clicks", clicks),
+                             ("conversions", conversions), ("conversion_value", conversion_value))
+    }
+
+    now = datetime.now()
+    base_ordinal = min(int(start.min()), today_ordinal - days)
+    span = max(int(start.max()), int(end.max()), today_ordinal) - base_ordinal + 1
+    day_dates = np.array([date.fromordinal(base_ordinal + i) for i in range(span)], dtype=object)
+    day_datetimes = np.array([datetime.combine(d, datetime.min.time()) for d in day_dates], dtype=object)
+
+    def pick(values: tuple) -> np.ndarray:
+        return np.array(values, dtype=object)[rng.integers(0, len(values), size=n_campaigns)]
+
+    objectives, products, audiences, bids = pick(OBJECTIVES), pick(PRODUCTS), pick(AUDIENCES), pick(BID_STRATEGIES)
+    keyword_sets = [list(KEYWORDS[i:i + 3]) for i in range(len(KEYWORDS) - 2)]
+    keywords = [keyword_sets[i] for i in rng.integers(0, len(keyword_sets), size=n_campaigns)]
+
+    campaigns = [
+        {
+            "id": campaign_id,
+            "name": f"{objective} - {product} #{campaign_id}",
+            "platform": platform,
+            "budget_type": BudgetType.DAILY if daily else BudgetType.LIFETIME,
+            "budget_amount": budget,
+            "start_date": start_dt,
+            "end_date": end_dt,
+            "status": status,
+            "target_audience": audience,
+            "keywords": keyword_list,
+            "bid_strategy": bid,
+            "total_spent": round(total_spent, 2),
+            "impressions": int(total_impressions),
+            "clicks": int(total_clicks),
+            "conversions": int(total_conversions),
+            "conversion_value": round(total_value, 2),
+            "created_at": now,
+            "updated_at": now,
+        }
+        for (campaign_id, objective, product, platform, daily, budget, start_dt, end_dt, status, audience,
+             keyword_list, bid, total_spent, total_impressions, total_clicks, total_conversions, total_value)
+        in zip(
+            ids.tolist(), objectives, products, platforms[platform_index], is_daily.tolist(),
+            budget_amount.tolist(), day_datetimes[start - base_ordinal],
+            [day_datetimes[e - base_ordinal] if e >= 0 else None for e in end.tolist()],
+            statuses, audiences, keywords, bids, totals["total_spent"].tolist(),
+            totals["impressions"].tolist(), totals["clicks"].tolist(), totals["conversions"].tolist(),
+            totals["conversion_value"].tolist()
+        )
+    ]
+    metrics = [
+        {
+            "campaign_id": campaign_id,
+            "date": day,
+            "spend": day_spend,
+            "impressions": day_impressions,
+            "clicks": day_clicks,
+            "conversions": day_conversions,
+            "conversion_value": day_value,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for campaign_id, day, day_spend, day_impressions, day_clicks, day_conversions, day_value in zip(
+            ids[campaign_of_row].tolist(), day_dates[day_ordinals - base_ordinal], spend.tolist(),
+            impressions.tolist(), clicks.tolist(), conversions.tolist(), conversion_value.tolist()
+        )
+    ]
+    return {"campaigns": campaigns, "metrics": metrics}
+
+
+async def generate_synthetic_data(
+    db: AsyncSession,
+    campaigns: int,
+    days: int = 30,
+    seed: Optional[int] = None,
+    replace: bool = False,
+    chunk_size: int = GENERATION_CHUNK_SIZE
+) -> Dict[str, Any]:
+    """Gera e grava `campaigns` campanhas com até `days` dias de métricas cada"""
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    today = date.today()
+
+    if replace:
+        await db.execute(delete(CampaignDailyMetricsDB))
+        await db.execute(delete(CampaignDB))
+    version = await bump_campaigns_version(db)
+    # IDs explícitos: as métricas do bloco referenciam as campanhas sem RETURNING
+    next_id = (await db.execute(select(func.coalesce(func.max(CampaignDB.id), 0)))).scalar() + 1
+    first_id = next_id
+
+    inserted = {"campaigns": 0, "daily_metrics": 0}
+    for offset in range(0, campaigns, chunk_size):
+        chunk = await asyncio.to_thread(generate_chunk, rng, next_id, min(chunk_size, campaigns - offset), days, today)
+        await db.execute(insert(CampaignDB.__table__).values(version=version), chunk["campaigns"])
+        if chunk["metrics"]:
+            await db.execute(insert(CampaignDailyMetricsDB.__table__), chunk["metrics"])
+        next_id += len(chunk["campaigns"])
+        inserted["campaigns"] += len(chunk["campaigns"])
+        inserted["daily_metrics"] += len(chunk["metrics"])
+
+    if db.get_bind().dialect.name == "postgresql" and inserted["campaigns"]:
+        # Os IDs foram informados: a sequência precisa avançar junto
+        await db.execute(text("SELECT setval(pg_get_serial_sequence('campaigns', 'id'), (SELECT max(id) FROM campaigns))"))
+    await db.commit()
+
+    elapsed = time.perf_counter() - started
+    rows = inserted["campaigns"] + inserted["daily_metrics"]
+    return {
+        **inserted,
+        "first_id": first_id,
+        "last_id": next_id - 1,
+        "days": days,
+        "seed": seed,
+        "replaced": replace,
+        "elapsed_seconds": round(elapsed, 2),
+        "rows_per_second": round(rows / elapsed) if elapsed > 0 else None,
+    }
@@ -0,0 +1,128 @@
+"""
+Benchmark do cache stale-while-revalidate das leituras de Ads
+
+Simula o dashboard fazendo polling de /api/ads/meta/campaigns e dos insights
+de algumas campanhas, com o SDK do Meta substituído por uma chamada lenta.
+Compara chamadas à origem e latência p50/p99:
+- antes: toda requisição vai ao SDK
+- depois: cache SWR (TTL curto para o teste caber em poucos segundos)
+
+Uso (a partir de backend/):
+    python -m benchmarks.ads_cache --clients 20 --seconds 10 --upstream-ms 300
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from app.core.config import settings
+from app.core.swr_cache import ads_cache
+from app.services.meta_ads_service import meta_ads_service
+
+POLL_INTERVAL = 0.5
+CAMPAIGN_IDS = ["mock_1", "mock_2", "mock_3"]
+
+
+def install_slow_upstream(upstream_ms: float, calls: Dict[str, int]) -> None:
+    """Troca as chamadas do SDK por versões lentas que contam as chamadas"""
+    get_campaigns = meta_ads_service._get_mock_campaigns
+    get_insights = meta_ads_service._mock_insights
+
+    def slow_campaigns(limit: int = 10):
+        calls["upstream"] += 1
+        time.sleep(upstream_ms / 1000)
+        return get_campaigns()
+
+    def slow_insights(campaign_id: str, days: int = 7):
+        calls["upstream"] += 1
+        time.sleep(upstream_ms / 1000)
+        return get_insights(campaign_id, days)
+
+    meta_ads_service.get_campaigns = slow_campaigns
+    meta_ads_service.get_campaign_insights = slow_insights
+
+
+def percentile(samples: List[float], pct: int) -> float:
+    if len(samples) < 2:
+        return samples[0] if samples else 0.0
+    return statistics.quantiles(samples, n=100)[pct - 1]
+
+
+async def bypass_cache(key, fetcher, ttl):
+    return await fetcher(), {"status": "bypass", "age_seconds": 0.0}
+
+
+def dashboard_paths() -> List[str]:
+    return ["/api/ads/meta/campaigns"] + [
+        f"/api/ads/meta/campaigns/{campaign_id}/insights" for campaign_id in CAMPAIGN_IDS
+    ]
+
+
+async def poll(app, n_clients: int, seconds: float) -> List[float]:
+    latencies: List[float] = []
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Aquecimento: mede o regime de polling, não a primeira carga
+        for path in dashboard_paths():
+            (await client.get(path)).raise_for_status()
+
+        deadline = time.perf_counter() + seconds
+
+        async def dashboard(index: int):
+            await asyncio.sleep(index * POLL_INTERVAL / n_clients)
+            while time.perf_counter() < deadline:
+                for path in dashboard_paths():
+                    started = time.perf_counter()
+                    (await client.get(path)).raise_for_status()
+                    latencies.append((time.perf_counter() - started) * 1000)
+                await asyncio.sleep(POLL_INTERVAL)
+
+        await asyncio.gather(*(dashboard(i) for i in range(n_clients)))
+    return latencies
+
+
+async def main(n_clients: int, seconds: float, upstream_ms: float, ttl: int, max_stale: int) -> None:
+    from app.main import app
+
+    calls = {"upstream": 0}
+    install_slow_upstream(upstream_ms, calls)
+
+    print(f"\n🗄️ {n_clients} dashboards, polling a cada {POLL_INTERVAL}s por {seconds:.0f}s, "
+          f"origem com {upstream_ms:.0f}ms")
+    print(f"{'cenário':28} {'chamadas à origem':>18} {'p50':>9} {'p99':>9}")
+
+    ads_cache.max_stale = max_stale
+    settings.ADS_CACHE_CAMPAIGNS_TTL_SECONDS = ttl
+    settings.ADS_CACHE_INSIGHTS_TTL_SECONDS = ttl
+
+    for label, cached in [("antes (sem cache)", False), (f"depois (TTL {ttl}s, stale {max_stale}s)", True)]:
+        if not cached:
+            ads_cache.get_or_fetch = bypass_cache
+        else:
+            del ads_cache.get_or_fetch
+        calls["upstream"] = 0
+        latencies = await poll(app, n_clients, seconds)
+        print(f"{label:28} {calls['upstream']:>18} {percentile(latencies, 50):>7.1f}ms "
+              f"{percentile(latencies, 99):>7.1f}ms")
+
+    print(f"📈 {ads_cache.stats()}")
+    await ads_cache.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do cache SWR de Ads")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--upstream-ms", type=float, default=300)
+    parser.add_argument("--ttl", type=int, default=2)
+    parser.add_argument("--max-stale", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.clients, args.seconds, args.upstream_ms, args.ttl, args.max_stale))
@@ -0,0 +1,62 @@
+"""
+Benchmark da atualização de campanhas em lote
+
+Compara, sobre um banco SQLite temporário, pausar `--batch` campanhas:
+- antes: POST /campaigns/{id}/pause para cada uma (commit, refresh e
+  serialização da campanha inteira por requisição)
+- depois: PATCH /campaigns/bulk com a lista de IDs (um UPDATE, um commit)
+
+Uso (a partir de backend/):
+    python -m benchmarks.bulk_update --campaigns 20000 --batch 500
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from benchmarks.concurrency import seed_database, build_async_app
+
+
+async def main(n_campaigns: int, batch: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        print(f"🌱 Criando {n_campaigns} campanhas...")
+        seed_database(url, n_campaigns)
+        app, async_engine = build_async_app(url, slow_ms=0)
+
+        step = max(n_campaigns // batch, 1)
+        ids = list(range(1, n_campaigns + 1, step))[:batch]
+        activate = {"ids": ids, "changes": {"status": "active"}}
+
+        print(f"\n⏸️ Pausando {len(ids)} campanhas")
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            (await client.patch("/campaigns/bulk", json=activate)).raise_for_status()
+            started = time.perf_counter()
+            for campaign_id in ids:
+                (await client.post(f"/campaigns/{campaign_id}/pause")).raise_for_status()
+            loop_elapsed = time.perf_counter() - started
+
+            (await client.patch("/campaigns/bulk", json=activate)).raise_for_status()
+            started = time.perf_counter()
+            response = await client.patch("/campaigns/bulk", json={"ids": ids, "changes": {"status": "paused"}})
+            bulk_elapsed = time.perf_counter() - started
+            response.raise_for_status()
+
+        print(f"{'antes: pause por campanha':32} {loop_elapsed:>8.3f}s  ({len(ids)} requisições)")
+        print(f"{'depois: PATCH /campaigns/bulk':32} {bulk_elapsed:>8.3f}s  ({response.json()['updated']} alteradas)")
+
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark da atualização em lote")
+    parser.add_argument("--campaigns", type=int, default=20000)
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.campaigns, args.batch))
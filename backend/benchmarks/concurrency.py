@@ -0,0 +1,219 @@
+"""
+Benchmark de concorrência da camada de banco de dados
+
+Mede requisições/s com 1, 16 e 64 clientes simultâneos em dois cenários:
+- antes: handlers `async def` usando a Session síncrona (bloqueia o event loop)
+- depois: handlers reais da API usando AsyncSession
+
+Uma em cada `--slow-every` requisições executa uma consulta lenta (`--slow-ms`),
+simulando um relatório pesado: é o caso em que a Session síncrona trava todas
+as outras requisições enquanto a consulta roda.
+
+Tudo roda em processo (httpx + ASGITransport) sobre um banco SQLite temporário,
+então o banco de desenvolvimento não é tocado.
+
+Uso (a partir de backend/):
+    python -m benchmarks.concurrency --campaigns 5000 --requests 640
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import FastAPI, Depends, Query
+from sqlalchemy import create_engine, insert, event, text
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.database import Base, get_async_db, to_async_url
+from app.schemas.campaign_db import CampaignDB, PlatformEnum, CampaignStatus, BudgetType
+from app.schemas.user_db import UserDB
+from app.schemas.table_version_db import TableVersionDB  # noqa: F401 (tabela dos ETags)
+
+CONCURRENCY_LEVELS = [1, 16, 64]
+
+
+def _bench_sleep(ms: float) -> int:
+    time.sleep(ms / 1000)
+    return 1
+
+
+def _register_slow_function(dbapi_connection, connection_record):
+    """Disponibiliza `bench_sleep(ms)` no SQLite para simular consultas lentas"""
+    dbapi_connection.create_function("bench_sleep", 1, _bench_sleep)
+
+
+def seed_database(url: str, n_campaigns: int) -> None:
+    """Cria as tabelas e insere campanhas sintéticas"""
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    platforms = list(PlatformEnum)
+    statuses = list(CampaignStatus)
+    start = datetime(2024, 1, 1)
+    rows = [
+        {
+            "name": f"Campanha {i}",
+            "platform": platforms[i % len(platforms)],
+            "budget_type": BudgetType.DAILY,
+            "budget_amount": 100.0 + i % 50,
+            "start_date": start + timedelta(days=i % 365),
+            "status": statuses[i % len(statuses)],
+            "keywords": [],
+            "total_spent": float(i % 1000),
+            "impressions": 1000 + i,
+            "clicks": 10 + i % 100,
+            "conversions": i % 10,
+            "created_at": start,
+            "updated_at": start,
+        }
+        for i in range(n_campaigns)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(CampaignDB), rows)
+    engine.dispose()
+
+
+def build_legacy_app(url: str, slow_ms: float) -> FastAPI:
+    """Reproduz os handlers anteriores: async def + Session síncrona"""
+    # Com o pool padrão (5 + 10) o cenário antigo trava a partir de 16 clientes:
+    # a requisição que espera conexão bloqueia o loop e quem detém as conexões
+    # nunca termina. O pool é dimensionado para medir apenas o custo do bloqueio.
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        pool_size=max(CONCURRENCY_LEVELS),
+        max_overflow=0
+    )
+    event.listen(engine, "connect", _register_slow_function)
+    LegacySession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def get_db():
+        db = LegacySession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    legacy = FastAPI()
+
+    @legacy.get("/campaigns/")
+    async def list_campaigns(
+        db: Session = Depends(get_db),
+        skip: int = Query(0, ge=0),
+        limit: int = Query(10, ge=1, le=100),
+        platform: Optional[PlatformEnum] = None
+    ):
+        query = db.query(CampaignDB)
+        if platform:
+            query = query.filter(CampaignDB.platform == platform)
+        return [c.id for c in query.offset(skip).limit(limit).all()]
+
+    @legacy.get("/campaigns/{campaign_id}")
+    async def get_campaign(campaign_id: int, db: Session = Depends(get_db)):
+        campaign = db.query(CampaignDB).filter(CampaignDB.id == campaign_id).first()
+        return {"id": campaign.id if campaign else None}
+
+    @legacy.get("/bench/slow")
+    async def slow_report(db: Session = Depends(get_db)):
+        return {"ok": db.execute(text("SELECT bench_sleep(:ms)"), {"ms": slow_ms}).scalar()}
+
+    return legacy
+
+
+def build_async_app(url: str, slow_ms: float):
+    """Usa a aplicação real com a dependência apontando para o banco temporário"""
+    from app.main import app
+
+    async_engine = create_async_engine(to_async_url(url))
+    event.listen(async_engine.sync_engine, "connect", _register_slow_function)
+    TestSession = async_sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with TestSession() as db:
+            yield db
+
+    async def slow_report(db: AsyncSession = Depends(get_async_db)):
+        result = await db.execute(text("SELECT bench_sleep(:ms)"), {"ms": slow_ms})
+        return {"ok": result.scalar()}
+
+    app.add_api_route("/bench/slow", slow_report, methods=["GET"])
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    return app, async_engine
+
+
+def request_paths(n_requests: int, n_campaigns: int, slow_every: int) -> List[str]:
+    """Mistura de listagens paginadas, buscas por ID e consultas lentas"""
+    platforms = [p.value for p in PlatformEnum]
+    paths = []
+    for i in range(n_requests):
+        if slow_every and i % slow_every == slow_every - 1:
+            paths.append("/bench/slow")
+        elif i % 2 == 0:
+            paths.append(f"/campaigns/?skip={(i * 37) % max(n_campaigns - 50, 1)}&limit=50"
+                         f"&platform={platforms[i % len(platforms)]}")
+        else:
+            paths.append(f"/campaigns/{(i * 7919) % n_campaigns + 1}")
+    return paths
+
+
+async def run_load(app: FastAPI, paths: List[str], concurrency: int) -> float:
+    """Dispara as requisições com N clientes simultâneos e retorna req/s"""
+    transport = httpx.ASGITransport(app=app)
+    queue: asyncio.Queue = asyncio.Queue()
+    for path in paths:
+        queue.put_nowait(path)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            while True:
+                try:
+                    path = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                response = await client.get(path)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return len(paths) / elapsed
+
+
+async def main(n_campaigns: int, n_requests: int, slow_ms: float, slow_every: int) -> None:
+    tmpdir = tempfile.mkdtemp(prefix="bench_concurrency_")
+    url = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+    seed_database(url, n_campaigns)
+
+    async_app, async_engine = build_async_app(url, slow_ms)
+    scenarios = {
+        "antes (Session síncrona)": build_legacy_app(url, slow_ms),
+        "depois (AsyncSession)": async_app,
+    }
+    paths = request_paths(n_requests, n_campaigns, slow_every)
+
+    print(f"\n📊 {n_campaigns} campanhas, {n_requests} requisições por nível, "
+          f"1 a cada {slow_every} com consulta de {slow_ms:.0f}ms")
+    print(f"{'cenário':28} " + " ".join(f"{f'c={c}':>12}" for c in CONCURRENCY_LEVELS))
+    for label, scenario_app in scenarios.items():
+        results = [await run_load(scenario_app, paths, c) for c in CONCURRENCY_LEVELS]
+        print(f"{label:28} " + " ".join(f"{r:>8.1f} r/s" for r in results))
+
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de concorrência da camada de banco")
+    parser.add_argument("--campaigns", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=640)
+    parser.add_argument("--slow-ms", type=float, default=20.0)
+    parser.add_argument("--slow-every", type=int, default=8, help="0 desativa as consultas lentas")
+    args = parser.parse_args()
+    asyncio.run(main(args.campaigns, args.requests, args.slow_ms, args.slow_every))
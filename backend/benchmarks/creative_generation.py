@@ -0,0 +1,106 @@
+"""
+Benchmark da geração de criativos com IA contra um servidor falso da OpenAI
+
+Compara, para `--products` produtos com `--variants` variações cada:
+- antes: uma chamada por variação, uma de cada vez (a chamada síncrona
+  bloqueava o event loop, então as requisições eram atendidas em série)
+- depois: CreativeGenerator.generate_batch (n variações por chamada, chamadas
+  em paralelo limitadas por OPENAI_CONCURRENCY)
+- depois, repetindo o lote: respostas do cache
+
+Uso (a partir de backend/):
+    python -m benchmarks.creative_generation --products 40 --variants 3 --latency-ms 300
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.core.config import settings
+from app.services.ad_creative_generator import CreativeGenerator, SYSTEM_PROMPT, build_prompt
+
+BASE_URL = "http://fake-openai/v1"
+
+
+def make_items(n_products: int) -> list:
+    return [
+        {
+            "product": f"Produto {i}",
+            "target_audience": ["jovens adultos", "empreendedores", "famílias"][i % 3],
+            "tone": ["profissional", "conversacional"][i % 2],
+            "platform": ["meta", "google"][i % 2],
+        }
+        for i in range(n_products)
+    ]
+
+
+async def run_sequential(http_client: httpx.AsyncClient, items: list, variants: int) -> int:
+    """Fluxo anterior: uma variação por chamada, chamadas em série"""
+    client = AsyncOpenAI(api_key="fake", base_url=BASE_URL, http_client=http_client)
+    generated = 0
+    for item in items:
+        for _ in range(variants):
+            response = await client.chat.completions.create(
+                model=settings.OPENAI_MODEL,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": build_prompt(
+                        item["product"], item["target_audience"], item["tone"], item["platform"]
+                    )}
+                ],
+                max_tokens=300,
+                temperature=0.7
+            )
+            generated += len(response.choices)
+    return generated
+
+
+async def main(n_products: int, variants: int, latency_ms: float, concurrency: int) -> None:
+    os.environ["FAKE_OPENAI_LATENCY_MS"] = str(latency_ms)
+    from benchmarks import fake_openai_api
+
+    transport = httpx.ASGITransport(app=fake_openai_api.app)
+    items = make_items(n_products)
+
+    print(f"\n🤖 {n_products} produtos x {variants} variações, latência da OpenAI falsa {latency_ms:.0f}ms")
+    print(f"{'cenário':40} {'tempo':>8} {'criativos':>10} {'chamadas':>9} {'paralelas':>10}")
+
+    def report(label: str, elapsed: float, generated: int) -> None:
+        state = fake_openai_api.app.state
+        print(f"{label:40} {elapsed:>7.2f}s {generated:>10} {state.requests:>9} {state.max_in_flight:>10}")
+        state.requests = state.choices = state.max_in_flight = 0
+
+    async with httpx.AsyncClient(transport=transport) as http_client:
+        started = time.perf_counter()
+        generated = await run_sequential(http_client, items, variants)
+        report("antes (1 variação/chamada, em série)", time.perf_counter() - started, generated)
+
+        generator = CreativeGenerator(
+            api_key="fake",
+            base_url=BASE_URL,
+            model=settings.OPENAI_MODEL,
+            concurrency=concurrency,
+            http_client=http_client
+        )
+        for label in (f"depois (n={variants}, {concurrency} em paralelo)", "depois, repetindo o lote (cache)"):
+            started = time.perf_counter()
+            results = await generator.generate_batch(items, variants=variants)
+            generated = sum(len(result["variants"]) for result in results)
+            report(label, time.perf_counter() - started, generated)
+        print(f"   📦 cache: {generator.cache.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do gerador de criativos")
+    parser.add_argument("--products", type=int, default=40)
+    parser.add_argument("--variants", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--concurrency", type=int, default=settings.OPENAI_CONCURRENCY)
+    args = parser.parse_args()
+    asyncio.run(main(args.products, args.variants, args.latency_ms, args.concurrency))
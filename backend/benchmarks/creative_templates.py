@@ -0,0 +1,128 @@
+"""
+Benchmark do motor de criativos por templates
+
+Compara a geração de `--variants` variações serializadas em JSON:
+- antes: cada variação reconstrói o dicionário de templates com f-strings e
+  sorteia com random.choice (como _generate_with_templates fazia)
+- depois: registro compilado, renderização única por requisição e linhas
+  NDJSON montadas a partir de pedaços já serializados
+- endpoint: POST /api/ads/generate-creative/variants (streaming)
+
+Uso (a partir de backend/):
+    python -m benchmarks.creative_templates --variants 2880
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from app.services.creative_templates import creative_templates
+
+PRODUCT = "Tênis de Corrida"
+AUDIENCE = "corredores amadores"
+
+
+def legacy_variant(product: str, audience: str, tone: str) -> dict:
+    """Fluxo anterior: templates recriados a cada chamada"""
+    templates = {
+        "profissional": {
+            "headlines": [
+                f"Solução Profissional para {product}",
+                f"Eficiência em {product} para {audience}",
+                f"Resultados Comprovados com {product}"
+            ],
+            "descriptions": [
+                f"Maximize seus resultados com nossa solução em {product}. Ideal para {audience}.",
+                f"Tecnologia avançada para {product}. Desenvolvido para {audience}.",
+                f"Transforme sua abordagem com {product}. Solução completa para {audience}."
+            ],
+            "ctas": ["Solicitar Demonstração", "Agendar Consulta", "Baixar Material"]
+        },
+        "conversacional": {
+            "headlines": [
+                f"Descubra como {product} pode mudar seu dia a dia!",
+                f"Você já conhece {product}? Perfeito para {audience}!",
+                f"A revolução do {product} chegou!"
+            ],
+            "descriptions": [
+                f"Junte-se a milhares de {audience} satisfeitos. Experimente {product} hoje mesmo!",
+                f"Não espere mais para descobrir os benefícios do {product}. Feito para {audience} como você!",
+                f"O que você está esperando? {product} é a solução que faltava para {audience}."
+            ],
+            "ctas": ["Experimente Grátis", "Começar Agora", "Quero Saber Mais"]
+        }
+    }
+    template = templates.get(tone, templates["profissional"])
+    return {
+        "headline": random.choice(template["headlines"]),
+        "description": random.choice(template["descriptions"]),
+        "cta": random.choice(template["ctas"]),
+        "hashtags": [f"#{product.replace(' ', '')}", f"#{audience.replace(' ', '')}", "#MarketingDigital"],
+        "primary_text": f"{product} oferece a melhor solução para {audience}. Resultados comprovados e suporte especializado. Não perca esta oportunidade!",
+        "generated_by": "template_system"
+    }
+
+
+def run_legacy(n_variants: int) -> int:
+    lines = [json.dumps(legacy_variant(PRODUCT, AUDIENCE, "profissional"), ensure_ascii=False) for _ in range(n_variants)]
+    # Sorteio com repetição: quantas variações saíram de fato diferentes
+    return len(set(lines))
+
+
+def run_compiled(n_variants: int, seed: int) -> int:
+    body = "".join(creative_templates.iter_ndjson(PRODUCT, AUDIENCE, "profissional", limit=n_variants, seed=seed))
+    return len(set(body.splitlines()))
+
+
+async def run_endpoint(n_variants: int, seed: int) -> tuple:
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        response = await client.post("/api/ads/generate-creative/variants", json={
+            "product": PRODUCT, "target_audience": AUDIENCE, "limit": n_variants, "seed": seed
+        })
+        elapsed = time.perf_counter() - started
+        response.raise_for_status()
+    return elapsed, len(response.text.splitlines())
+
+
+def main(n_variants: int, repeat: int, seed: int) -> None:
+    total = creative_templates.total_combinations("profissional")
+    print(f"\n🎨 {n_variants} variações (tom profissional: {total} combinações), melhor de {repeat}")
+    print(f"{'cenário':36} {'tempo':>9} {'var/s':>11} {'distintas':>10}")
+
+    for label, scenario in (
+        ("antes (dict por chamada + choice)", lambda: run_legacy(n_variants)),
+        ("depois (compilado, NDJSON)", lambda: run_compiled(n_variants, seed)),
+    ):
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            distinct = scenario()
+            best = min(best, time.perf_counter() - started)
+        print(f"{label:36} {best * 1000:>7.1f}ms {n_variants / best:>11,.0f} {distinct:>10}")
+
+    elapsed, lines = asyncio.run(run_endpoint(n_variants, seed))
+    print(f"{'endpoint (streaming)':36} {elapsed * 1000:>7.1f}ms {lines / elapsed:>11,.0f} {lines:>10}")
+
+    first = list(creative_templates.iter_variants(PRODUCT, AUDIENCE, limit=5, seed=seed))
+    again = list(creative_templates.iter_variants(PRODUCT, AUDIENCE, limit=5, seed=seed))
+    print(f"   🔁 mesma semente, mesmas variações: {first == again}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do motor de templates de criativos")
+    parser.add_argument("--variants", type=int, default=2880)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    main(args.variants, args.repeat, args.seed)
@@ -0,0 +1,97 @@
+"""
+Benchmark da configuração do engine SQLite
+
+Compara o engine padrão (journal em rollback, synchronous=FULL) com o engine
+da aplicação (WAL, synchronous=NORMAL, mmap, cache e busy_timeout):
+- escritas: `--writes` UPDATEs de uma linha, cada um com commit (pausar/ativar)
+- misto: um escritor fazendo commits enquanto `--readers` leitores listam
+  campanhas; conta leituras/s e erros "database is locked"
+
+Uso (a partir de backend/):
+    python -m benchmarks.db_engine --campaigns 20000 --writes 300 --readers 16
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.database import build_async_engine, to_async_url
+from app.schemas.campaign_db import CampaignDB
+from benchmarks.concurrency import seed_database
+
+
+async def run_writes(session_factory, n_writes: int, n_campaigns: int) -> float:
+    started = time.perf_counter()
+    for i in range(n_writes):
+        async with session_factory() as db:
+            await db.execute(
+                update(CampaignDB).where(CampaignDB.id == i % n_campaigns + 1).values(clicks=CampaignDB.clicks + 1)
+            )
+            await db.commit()
+    return time.perf_counter() - started
+
+
+async def run_mixed(session_factory, n_writes: int, n_readers: int, n_campaigns: int) -> dict:
+    stats = {"reads": 0, "locked": 0}
+    done = asyncio.Event()
+
+    async def writer():
+        try:
+            await run_writes(session_factory, n_writes, n_campaigns)
+        except OperationalError:
+            stats["locked"] += 1
+        finally:
+            done.set()
+
+    async def reader(index: int):
+        while not done.is_set():
+            try:
+                async with session_factory() as db:
+                    offset = (index * 997) % max(1, n_campaigns - 100)
+                    result = await db.execute(select(CampaignDB).order_by(CampaignDB.id).offset(offset).limit(100))
+                    result.scalars().all()
+                stats["reads"] += 1
+            except OperationalError:
+                stats["locked"] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(writer(), *(reader(i) for i in range(n_readers)))
+    stats["elapsed"] = time.perf_counter() - started
+    return stats
+
+
+async def main(n_campaigns: int, n_writes: int, n_readers: int) -> None:
+    print(f"\n🗄️ {n_campaigns} campanhas, {n_writes} commits, {n_readers} leitores simultâneos")
+    print(f"{'engine':26} {'commits/s':>10} {'misto: leituras/s':>18} {'locked':>7}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, factory in (
+            ("antes (padrão)", lambda url: create_async_engine(to_async_url(url))),
+            ("depois (WAL + pragmas)", build_async_engine),
+        ):
+            url = f"sqlite:///{os.path.join(tmp, label.split()[0] + '.db')}"
+            seed_database(url, n_campaigns)
+            engine = factory(url)
+            session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+            elapsed = await run_writes(session_factory, n_writes, n_campaigns)
+            mixed = await run_mixed(session_factory, n_writes, n_readers, n_campaigns)
+            print(f"{label:26} {n_writes / elapsed:>10.0f} {mixed['reads'] / mixed['elapsed']:>18.0f} {mixed['locked']:>7}")
+            await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark da configuração do engine SQLite")
+    parser.add_argument("--campaigns", type=int, default=20000)
+    parser.add_argument("--writes", type=int, default=300)
+    parser.add_argument("--readers", type=int, default=16)
+    args = parser.parse_args()
+    asyncio.run(main(args.campaigns, args.writes, args.readers))
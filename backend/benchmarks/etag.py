@@ -0,0 +1,70 @@
+"""
+Benchmark dos GETs condicionais (ETag / If-None-Match)
+
+Simula um dashboard consultando periodicamente a listagem de campanhas, o
+resumo por plataforma e as métricas de uma campanha:
+- antes: toda consulta devolve o corpo completo
+- depois: o cliente reenvia o ETag e recebe 304 enquanto nada mudou
+
+Uso (a partir de backend/):
+    python -m benchmarks.etag --campaigns 20000 --polls 200
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from benchmarks.concurrency import seed_database, build_async_app
+
+PATHS = ["/campaigns/?limit=1000", "/campaigns/platforms/summary", "/campaigns/1/metrics"]
+
+
+async def poll(client: httpx.AsyncClient, n_polls: int, conditional: bool) -> dict:
+    etags = {}
+    totals = {"bytes": 0, "not_modified": 0}
+    started = time.perf_counter()
+    for _ in range(n_polls):
+        for path in PATHS:
+            headers = {"If-None-Match": etags[path]} if conditional and path in etags else {}
+            response = await client.get(path, headers=headers)
+            if response.status_code == 304:
+                totals["not_modified"] += 1
+            else:
+                response.raise_for_status()
+                etags[path] = response.headers.get("etag")
+            totals["bytes"] += len(response.content)
+    totals["elapsed"] = time.perf_counter() - started
+    return totals
+
+
+async def main(n_campaigns: int, n_polls: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        seed_database(url, n_campaigns)
+        app, async_engine = build_async_app(url, slow_ms=0)
+        transport = httpx.ASGITransport(app=app)
+
+        n_requests = n_polls * len(PATHS)
+        print(f"\n🔁 {n_polls} ciclos de polling x {len(PATHS)} endpoints, {n_campaigns} campanhas")
+        print(f"{'cenário':28} {'tempo':>8} {'req/s':>8} {'ms/req':>8} {'MB':>8} {'304':>6}")
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for label, conditional in (("antes (corpo completo)", False), ("depois (If-None-Match)", True)):
+                result = await poll(client, n_polls, conditional)
+                print(f"{label:28} {result['elapsed']:>7.2f}s {n_requests / result['elapsed']:>8.0f} "
+                      f"{result['elapsed'] / n_requests * 1000:>8.2f} {result['bytes'] / 1e6:>8.2f} "
+                      f"{result['not_modified']:>6}")
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de ETag / GET condicional")
+    parser.add_argument("--campaigns", type=int, default=20000)
+    parser.add_argument("--polls", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.campaigns, args.polls))
@@ -0,0 +1,209 @@
+"""
+Servidor falso da Graph API do Meta (listagem de campanhas e insights)
+
+Responde de forma determinística a partir do ID da campanha e simula a
+latência de rede de cada requisição. Serve para testar o cliente em lote e a
+sincronização sem credenciais reais.
+
+Uso (a partir de backend/):
+    FAKE_GRAPH_LATENCY_MS=80 uvicorn benchmarks.fake_graph_api:app --port 8100
+    # e no .env da API: META_GRAPH_API_URL=http://127.0.0.1:8100
+    #                   META_ACCESS_TOKEN=fake  META_AD_ACCOUNT_ID=act_1
+    # FAKE_GRAPH_CAMPAIGNS define quantas campanhas a conta falsa tem
+
+Com FAKE_GRAPH_QUOTA_CALLS > 0 cada conta tem uma cota de chamadas por janela
+deslizante de FAKE_GRAPH_QUOTA_WINDOW_SECONDS: o uso vai no cabeçalho
+X-Business-Use-Case-Usage e, estourada a cota, a resposta é o erro 80000.
+"""
+import asyncio
+import json
+import os
+import time
+import zlib
+from collections import defaultdict, deque
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+LATENCY_MS = float(os.getenv("FAKE_GRAPH_LATENCY_MS", "50"))
+N_CAMPAIGNS = int(os.getenv("FAKE_GRAPH_CAMPAIGNS", "20"))
+QUOTA_CALLS = int(os.getenv("FAKE_GRAPH_QUOTA_CALLS", "0"))
+QUOTA_WINDOW_SECONDS = float(os.getenv("FAKE_GRAPH_QUOTA_WINDOW_SECONDS", "10"))
+
+
+def _error(status_code: int, code: int, message: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content={"error": {"message": message, "type": "OAuthException", "code": code}}
+    )
+
+
+def _daily_row(campaign_id: str, day: date) -> Dict[str, Any]:
+    """Métricas determinísticas de uma campanha em um dia"""
+    seed = zlib.crc32(f"{campaign_id}:{day.isoformat()}".encode())
+    impressions = 1000 + seed % 9000
+    clicks = 10 + seed % 300
+    spend = round(20 + (seed % 10000) / 100, 2)
+    return {
+        "impressions": impressions,
+        "clicks": clicks,
+        "spend": spend,
+        "reach": impressions * 7 // 10,
+        "conversions": seed % 25,
+    }
+
+
+def _insight_row(campaign_id: str, since: date, until: date) -> Dict[str, Any]:
+    totals = {"impressions": 0, "clicks": 0, "spend": 0.0, "reach": 0, "conversions": 0}
+    day = since
+    while day <= until:
+        for key, value in _daily_row(campaign_id, day).items():
+            totals[key] += value
+        day += timedelta(days=1)
+
+    # A Graph API devolve números como string e conversões como lista de ações
+    return {
+        "campaign_id": campaign_id,
+        "campaign_name": f"Campanha {campaign_id}",
+        "impressions": str(totals["impressions"]),
+        "clicks": str(totals["clicks"]),
+        "spend": f"{totals['spend']:.2f}",
+        "reach": str(totals["reach"]),
+        "ctr": f"{totals['clicks'] / totals['impressions'] * 100:.4f}" if totals["impressions"] else "0",
+        "cpc": f"{totals['spend'] / totals['clicks']:.4f}" if totals["clicks"] else "0",
+        "conversions": [{"action_type": "offsite_conversion", "value": str(totals["conversions"])}],
+        "date_start": since.isoformat(),
+        "date_stop": until.isoformat(),
+    }
+
+
+def _rows(campaign_ids: List[str], since: date, until: date, time_increment: Optional[int]) -> List[Dict]:
+    rows = []
+    for campaign_id in campaign_ids:
+        if not time_increment:
+            rows.append(_insight_row(campaign_id, since, until))
+            continue
+        start = since
+        while start <= until:
+            stop = min(start + timedelta(days=time_increment - 1), until)
+            rows.append(_insight_row(campaign_id, start, stop))
+            start = stop + timedelta(days=1)
+    return rows
+
+
+def _page(request: Request, rows: List[Dict], limit: int, offset: int) -> Dict[str, Any]:
+    page = {"data": rows[offset:offset + limit]}
+    if offset + limit < len(rows):
+        next_url = request.url.include_query_params(after=str(offset + limit))
+        page["paging"] = {"cursors": {"after": str(offset + limit)}, "next": str(next_url)}
+    return page
+
+
+def _time_range(params) -> Optional[tuple]:
+    try:
+        time_range = json.loads(params["time_range"])
+        return date.fromisoformat(time_range["since"]), date.fromisoformat(time_range["until"])
+    except (KeyError, ValueError, TypeError):
+        return None
+
+
+def _campaign(index: int) -> Dict[str, Any]:
+    campaign_id = str(120000000 + index)
+    return {
+        "id": campaign_id,
+        "name": f"Campanha {campaign_id}",
+        "status": "ACTIVE" if index % 3 else "PAUSED",
+        "effective_status": "ACTIVE" if index % 3 else "PAUSED",
+        "objective": "OUTCOME_SALES",
+        # Orçamentos em centavos; parte das campanhas usa orçamento no conjunto de anúncios
+        "daily_budget": str(5000 + index * 100) if index % 4 else None,
+        "bid_strategy": "LOWEST_COST_WITHOUT_CAP",
+        "created_time": "2024-01-01T10:00:00-0300",
+        "start_time": "2024-01-01T10:00:00-0300",
+    }
+
+
+app = FastAPI(title="Fake Graph API")
+app.state.requests = 0
+app.state.throttled = 0
+_calls = defaultdict(deque)
+
+
+@app.middleware("http")
+async def business_use_case_quota(request: Request, call_next):
+    """Cota por conta em janela deslizante, no formato dos cabeçalhos do Meta"""
+    if QUOTA_CALLS <= 0:
+        return await call_next(request)
+
+    parts = request.url.path.strip("/").split("/")
+    account_id = parts[1] if len(parts) > 1 and parts[1].startswith("act_") else "default"
+    now = time.monotonic()
+    calls = _calls[account_id]
+    while calls and calls[0] <= now - QUOTA_WINDOW_SECONDS:
+        calls.popleft()
+
+    throttled = len(calls) >= QUOTA_CALLS
+    if not throttled:
+        calls.append(now)
+    usage_pct = min(100, round(len(calls) * 100 / QUOTA_CALLS))
+    regain_minutes = (calls[0] + QUOTA_WINDOW_SECONDS - now) / 60 if throttled else 0
+    header = json.dumps({account_id: [{
+        "type": "ads_management",
+        "call_count": usage_pct,
+        "total_cputime": usage_pct // 2,
+        "total_time": usage_pct // 2,
+        "estimated_time_to_regain_access": round(regain_minutes, 4)
+    }]})
+
+    if throttled:
+        app.state.throttled += 1
+        response = _error(400, 80000, "There have been too many calls from this ad-account.")
+    else:
+        response = await call_next(request)
+    response.headers["X-Business-Use-Case-Usage"] = header
+    return response
+
+
+@app.get("/{version}/{account_id}/campaigns")
+async def campaigns(version: str, account_id: str, request: Request):
+    app.state.requests += 1
+    await asyncio.sleep(LATENCY_MS / 1000)
+
+    params = request.query_params
+    if not params.get("access_token"):
+        return _error(400, 190, "Invalid OAuth access token.")
+    rows = [
+        {key: value for key, value in _campaign(i).items() if value is not None}
+        for i in range(N_CAMPAIGNS)
+    ]
+    return _page(request, rows, int(params.get("limit", 25)), int(params.get("after", 0)))
+
+
+@app.get("/{version}/{node_id}/insights")
+async def insights(version: str, node_id: str, request: Request):
+    app.state.requests += 1
+    await asyncio.sleep(LATENCY_MS / 1000)
+
+    params = request.query_params
+    if not params.get("access_token"):
+        return _error(400, 190, "Invalid OAuth access token.")
+    period = _time_range(params)
+    if period is None:
+        return _error(400, 100, "Invalid parameter: time_range")
+    since, until = period
+    time_increment = int(params["time_increment"]) if params.get("time_increment") else None
+    limit = int(params.get("limit", 25))
+    offset = int(params.get("after", 0))
+
+    if node_id.startswith("act_"):
+        # Insights da conta com level=campaign e filtro campaign.id IN [...]
+        campaign_ids: List[str] = []
+        for item in json.loads(params.get("filtering", "[]")):
+            if item.get("field") == "campaign.id" and item.get("operator") == "IN":
+                campaign_ids.extend(str(value) for value in item.get("value", []))
+    else:
+        campaign_ids = [node_id]
+
+    return _page(request, _rows(campaign_ids, since, until, time_increment), limit, offset)
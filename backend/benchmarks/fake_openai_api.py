@@ -0,0 +1,80 @@
+"""
+Servidor falso da API de chat da OpenAI (POST /v1/chat/completions)
+
+Devolve `n` criativos em JSON determinísticos a partir do prompt, após uma
+latência simulada, e conta as chamadas recebidas. Serve para testar o gerador
+de criativos sem chave real.
+
+Uso (a partir de backend/):
+    FAKE_OPENAI_LATENCY_MS=800 uvicorn benchmarks.fake_openai_api:app --port 8200
+    # e no .env da API: OPENAI_API_KEY=fake  OPENAI_BASE_URL=http://127.0.0.1:8200/v1
+"""
+import asyncio
+import json
+import os
+import time
+import zlib
+from typing import Any, Dict
+
+from fastapi import FastAPI, Request
+
+LATENCY_MS = float(os.getenv("FAKE_OPENAI_LATENCY_MS", "500"))
+
+app = FastAPI(title="Fake OpenAI API")
+app.state.requests = 0
+app.state.choices = 0
+app.state.in_flight = 0
+app.state.max_in_flight = 0
+
+
+def _creative(prompt: str, index: int) -> Dict[str, Any]:
+    seed = zlib.crc32(f"{prompt}:{index}".encode())
+    return {
+        "headline": f"Headline {seed % 1000}",
+        "description": f"Descrição persuasiva {seed % 997}",
+        "cta": ["Saiba Mais", "Comprar Agora", "Experimente Grátis"][seed % 3],
+        "hashtags": [f"#tag{seed % 50}", f"#tag{seed % 51}", "#MarketingDigital"],
+        "primary_text": f"Texto principal {seed % 991}",
+    }
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    n = int(body.get("n") or 1)
+    prompt = body["messages"][-1]["content"]
+
+    app.state.requests += 1
+    app.state.choices += n
+    app.state.in_flight += 1
+    app.state.max_in_flight = max(app.state.max_in_flight, app.state.in_flight)
+    try:
+        # Gerar n variações custa pouco mais que uma (o prompt é processado uma vez)
+        await asyncio.sleep(LATENCY_MS / 1000 * (1 + 0.1 * (n - 1)))
+    finally:
+        app.state.in_flight -= 1
+
+    return {
+        "id": f"chatcmpl-{app.state.requests}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-3.5-turbo"),
+        "choices": [
+            {
+                "index": i,
+                "message": {"role": "assistant", "content": json.dumps(_creative(prompt, i), ensure_ascii=False)},
+                "finish_reason": "stop"
+            }
+            for i in range(n)
+        ],
+        "usage": {"prompt_tokens": 150, "completion_tokens": 80 * n, "total_tokens": 150 + 80 * n},
+    }
+
+
+@app.get("/stats")
+async def stats():
+    return {
+        "requests": app.state.requests,
+        "choices": app.state.choices,
+        "max_in_flight": app.state.max_in_flight,
+    }
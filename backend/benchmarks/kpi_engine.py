@@ -0,0 +1,114 @@
+"""
+Benchmark do cálculo de KPIs de todas as campanhas
+
+Compara, sobre um banco SQLite temporário:
+- antes: carregar as campanhas como objetos ORM e calcular os KPIs em um laço
+  Python por campanha (como o /campaigns/{id}/metrics), serializando com o
+  jsonable_encoder do FastAPI
+- depois: GET /campaigns/metrics/bulk (consulta só das colunas + NumPy/pandas)
+
+Uso (a partir de backend/):
+    python -m benchmarks.kpi_engine --campaigns 100000
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+
+from app.schemas.campaign_db import CampaignDB
+from app.services.kpi_engine import load_campaign_frame, compute_kpis, rank_campaigns
+from app.models.campaign import KpiSortField, SortOrder
+from benchmarks.concurrency import seed_database, build_async_app
+
+
+def scalar_kpis(campaign: CampaignDB) -> dict:
+    """Cálculo anterior, uma campanha por vez"""
+    spent = campaign.total_spent
+    return {
+        "id": campaign.id,
+        "name": campaign.name,
+        "platform": campaign.platform,
+        "status": campaign.status,
+        "ctr": round(campaign.clicks / campaign.impressions * 100, 2) if campaign.impressions > 0 else 0,
+        "cpc": round(spent / campaign.clicks, 2) if campaign.clicks > 0 else 0,
+        "conversion_rate": round(campaign.conversions / campaign.clicks * 100, 2) if campaign.clicks > 0 else 0,
+        "cpa": round(spent / campaign.conversions, 2) if campaign.conversions > 0 else 0,
+        "roas": round((campaign.conversion_value or 0) / spent, 2) if spent > 0 else 0,
+        "budget_utilization": round(spent / campaign.budget_amount * 100, 2) if campaign.budget_amount > 0 else 0,
+        "budget_remaining": round(campaign.budget_amount - spent, 2),
+    }
+
+
+async def run_scalar(session_factory, top: int) -> float:
+    started = time.perf_counter()
+    async with session_factory() as db:
+        result = await db.execute(select(CampaignDB).order_by(CampaignDB.id))
+        rows = [scalar_kpis(campaign) for campaign in result.scalars()]
+    rows.sort(key=lambda row: row["roas"], reverse=True)
+    json.dumps(jsonable_encoder(rows[:top]))
+    return time.perf_counter() - started
+
+
+async def run_vectorized(session_factory, top: int) -> dict:
+    columns = (
+        CampaignDB.id, CampaignDB.name, CampaignDB.platform, CampaignDB.status,
+        CampaignDB.budget_amount, CampaignDB.total_spent, CampaignDB.impressions,
+        CampaignDB.clicks, CampaignDB.conversions, CampaignDB.conversion_value
+    )
+    async with session_factory() as db:
+        started = time.perf_counter()
+        frame = await load_campaign_frame(db, select(*columns).order_by(CampaignDB.id))
+        loaded = time.perf_counter()
+        rank_campaigns(compute_kpis(frame), KpiSortField.ROAS, SortOrder.DESC, top)
+        computed = time.perf_counter()
+    return {"load": loaded - started, "compute": computed - loaded}
+
+
+async def main(n_campaigns: int, top: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        print(f"🌱 Criando {n_campaigns} campanhas...")
+        seed_database(url, n_campaigns)
+
+        app, async_engine = build_async_app(url, slow_ms=0)
+        session_factory = async_sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
+        transport = httpx.ASGITransport(app=app)
+
+        print(f"\n📊 KPIs de {n_campaigns} campanhas, top {top} por ROAS")
+        scalar = await run_scalar(session_factory, top)
+        print(f"{'antes (ORM + laço Python)':36} {scalar:>8.3f}s")
+
+        vectorized = await run_vectorized(session_factory, top)
+        print(f"{'depois: leitura das colunas':36} {vectorized['load']:>8.3f}s")
+        print(f"{'depois: cálculo vetorizado':36} {vectorized['compute']:>8.3f}s")
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for label, params in (
+                (f"endpoint top {top}", {"sort_by": "roas", "top": top}),
+                ("endpoint todas as campanhas", {"sort_by": "roas"}),
+            ):
+                started = time.perf_counter()
+                response = await client.get("/campaigns/metrics/bulk", params=params)
+                elapsed = time.perf_counter() - started
+                response.raise_for_status()
+                print(f"{label:36} {elapsed:>8.3f}s  ({len(response.content) / 1e6:.1f} MB)")
+
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do cálculo vetorizado de KPIs")
+    parser.add_argument("--campaigns", type=int, default=100000)
+    parser.add_argument("--top", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.campaigns, args.top))
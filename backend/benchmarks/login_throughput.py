@@ -0,0 +1,182 @@
+"""
+Benchmark de logins simultâneos x latência de endpoints não relacionados
+
+Dispara uma rajada de logins e, ao mesmo tempo, mede a latência de /health.
+Compara dois cenários:
+- antes: hash da senha executado inline no handler (congela o event loop)
+- depois: hash no pool de processos dedicado (app.core.security)
+
+Uso (a partir de backend/):
+    python -m benchmarks.login_throughput --logins 64 --concurrency 16
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import FastAPI, Depends, HTTPException
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.database import Base, get_async_db, to_async_url
+from app.core.security import pwd_context, shutdown_hash_executor
+from app.schemas.user_db import UserDB, UserRole
+
+PROBE_INTERVAL = 0.01
+PASSWORD = "benchmark123"
+
+
+def seed_users(url: str, n_users: int) -> None:
+    """Cria as tabelas e os usuários (o hash é calculado uma única vez)"""
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    hashed = pwd_context.hash(PASSWORD)
+    rows = [
+        {
+            "email": f"user{i}@bench.com",
+            "full_name": f"Usuário {i}",
+            "hashed_password": hashed,
+            "role": UserRole.VIEWER,
+            "is_active": True
+        }
+        for i in range(n_users)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(UserDB), rows)
+    engine.dispose()
+
+
+def build_legacy_app(session_factory) -> FastAPI:
+    """Reproduz o login anterior: verificação do hash dentro do handler"""
+    legacy = FastAPI()
+
+    async def get_db():
+        async with session_factory() as db:
+            yield db
+
+    @legacy.post("/auth/login")
+    async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
+        result = await db.execute(select(UserDB).where(UserDB.email == form_data.username))
+        user = result.scalars().first()
+        if not user or not pwd_context.verify(form_data.password, user.hashed_password):
+            raise HTTPException(status_code=401)
+        return {"ok": True}
+
+    @legacy.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    return legacy
+
+
+def build_app(session_factory) -> FastAPI:
+    """Aplicação real apontando para o banco temporário"""
+    from app.main import app
+
+    async def override_get_async_db():
+        async with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    return app
+
+
+def percentile(samples: List[float], pct: int) -> float:
+    if len(samples) < 2:
+        return samples[0] if samples else 0.0
+    return statistics.quantiles(samples, n=100)[pct - 1]
+
+
+async def run_scenario(app: FastAPI, n_logins: int, concurrency: int, n_users: int) -> Dict[str, float]:
+    transport = httpx.ASGITransport(app=app)
+    latencies: List[float] = []
+    done = asyncio.Event()
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def probe():
+            # Latência medida a partir do horário agendado de cada sonda: se o loop
+            # estiver travado, o atraso para enviar também conta (sem omissão coordenada)
+            scheduled = time.perf_counter()
+            while not done.is_set():
+                (await client.get("/health")).raise_for_status()
+                latencies.append((time.perf_counter() - scheduled) * 1000)
+                scheduled += PROBE_INTERVAL
+                now = time.perf_counter()
+                while scheduled < now - PROBE_INTERVAL:
+                    # Sondas que deveriam ter saído enquanto o loop estava travado
+                    latencies.append((now - scheduled) * 1000)
+                    scheduled += PROBE_INTERVAL
+                await asyncio.sleep(max(scheduled - now, 0))
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for i in range(n_logins):
+            queue.put_nowait(i % n_users)
+
+        async def login_worker():
+            while True:
+                try:
+                    user = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                response = await client.post(
+                    "/auth/login",
+                    data={"username": f"user{user}@bench.com", "password": PASSWORD}
+                )
+                response.raise_for_status()
+
+        probe_task = asyncio.create_task(probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(login_worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probe_task
+
+    return {
+        "logins_per_s": n_logins / elapsed,
+        "health_p50_ms": percentile(latencies, 50),
+        "health_p99_ms": percentile(latencies, 99),
+        "health_samples": len(latencies)
+    }
+
+
+async def main(n_logins: int, concurrency: int, n_users: int) -> None:
+    tmpdir = tempfile.mkdtemp(prefix="bench_login_")
+    url = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+    seed_users(url, n_users)
+
+    async_engine = create_async_engine(to_async_url(url))
+    session_factory = async_sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
+
+    scenarios = {
+        "antes (hash inline)": build_legacy_app(session_factory),
+        "depois (pool de hash)": build_app(session_factory),
+    }
+
+    print(f"\n🔐 {n_logins} logins, {concurrency} simultâneos, /health a cada {PROBE_INTERVAL * 1000:.0f}ms")
+    print(f"{'cenário':24} {'logins/s':>10} {'/health p50':>12} {'/health p99':>12} {'amostras':>9}")
+    for label, scenario_app in scenarios.items():
+        result = await run_scenario(scenario_app, n_logins, concurrency, n_users)
+        print(
+            f"{label:24} {result['logins_per_s']:>10.1f} {result['health_p50_ms']:>10.1f}ms "
+            f"{result['health_p99_ms']:>10.1f}ms {result['health_samples']:>9}"
+        )
+
+    await async_engine.dispose()
+    shutdown_hash_executor()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de throughput de login")
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--users", type=int, default=16)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.concurrency, args.users))
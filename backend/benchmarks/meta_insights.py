@@ -0,0 +1,100 @@
+"""
+Benchmark da busca de insights do Meta: uma requisição por campanha x lote
+
+Roda contra o servidor falso da Graph API (benchmarks/fake_graph_api.py) em
+processo, com latência simulada por requisição:
+- antes: uma chamada por campanha, em série (como get_campaign_insights)
+- depois: MetaGraphClient.get_insights_bulk (level=campaign, lotes em paralelo)
+
+Uso (a partir de backend/):
+    python -m benchmarks.meta_insights --campaigns 500 --latency-ms 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("FAKE_GRAPH_LATENCY_MS", "50")
+
+import httpx
+
+from app.services.meta_graph_client import MetaGraphClient, parse_insight
+
+BASE_URL = "http://fake-graph"
+API_VERSION = "v18.0"
+
+
+async def fetch_serial(transport, campaign_ids, since: date, until: date) -> dict:
+    """Reproduz o fluxo anterior: uma requisição por campanha"""
+    time_range = json.dumps({"since": since.isoformat(), "until": until.isoformat()})
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url=f"{BASE_URL}/{API_VERSION}") as client:
+        for campaign_id in campaign_ids:
+            response = await client.get(
+                f"/{campaign_id}/insights",
+                params={"access_token": "fake", "time_range": time_range}
+            )
+            response.raise_for_status()
+            data = response.json()["data"]
+            results[campaign_id] = parse_insight(data[0]) if data else None
+    return results
+
+
+async def main(n_campaigns: int, concurrency: int, chunk_size: int) -> None:
+    from benchmarks import fake_graph_api
+
+    transport = httpx.ASGITransport(app=fake_graph_api.app)
+    campaign_ids = [str(120000000 + i) for i in range(n_campaigns)]
+    until = date.today()
+    since = until - timedelta(days=6)
+
+    client = MetaGraphClient(
+        base_url=BASE_URL,
+        api_version=API_VERSION,
+        access_token="fake",
+        ad_account_id="act_1",
+        concurrency=concurrency,
+        chunk_size=chunk_size,
+        transport=transport
+    )
+
+    print(f"\n📡 {n_campaigns} campanhas, latência simulada de {fake_graph_api.LATENCY_MS:.0f}ms por requisição")
+    print(f"{'cenário':34} {'tempo':>10} {'requisições':>12}")
+
+    fake_graph_api.app.state.requests = 0
+    started = time.perf_counter()
+    serial = await fetch_serial(transport, campaign_ids, since, until)
+    elapsed = time.perf_counter() - started
+    print(f"{'antes (1 por campanha, em série)':34} {elapsed:>9.2f}s {fake_graph_api.app.state.requests:>12}")
+
+    fake_graph_api.app.state.requests = 0
+    started = time.perf_counter()
+    bulk = await client.get_insights_bulk(campaign_ids, since, until)
+    elapsed = time.perf_counter() - started
+    print(f"{f'depois (lotes de {chunk_size}, {concurrency} em paralelo)':34} "
+          f"{elapsed:>9.2f}s {fake_graph_api.app.state.requests:>12}")
+    await client.aclose()
+
+    mismatches = [
+        campaign_id for campaign_id in campaign_ids
+        if serial[campaign_id]["spend"] != bulk[campaign_id]["spend"]
+        or serial[campaign_id]["conversions"] != bulk[campaign_id]["conversions"]
+    ]
+    print("✅ Resultados idênticos" if not mismatches else f"❌ {len(mismatches)} campanhas divergentes")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de insights em lote do Meta")
+    parser.add_argument("--campaigns", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=None)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=50)
+    args = parser.parse_args()
+    if args.latency_ms is not None:
+        os.environ["FAKE_GRAPH_LATENCY_MS"] = str(args.latency_ms)
+    asyncio.run(main(args.campaigns, args.concurrency, args.chunk_size))
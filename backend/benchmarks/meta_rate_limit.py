@@ -0,0 +1,126 @@
+"""
+Benchmark do controle de taxa da Graph API contra uma cota por conta
+
+O servidor falso aplica uma cota de chamadas por janela deslizante e devolve
+o uso em X-Business-Use-Case-Usage (erro 80000 quando estoura). Compara:
+- antes: chamadas disparadas sem controle (cada throttling vira dado simulado)
+- depois: MetaGraphClient com token bucket adaptativo e backoff com jitter
+
+Uso (a partir de backend/):
+    python -m benchmarks.meta_rate_limit --requests 150 --quota 50 --window 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from app.core.config import settings
+from app.services.meta_graph_client import MetaGraphClient
+from app.services.meta_rate_limiter import MetaRateLimiter
+
+BASE_URL = "http://fake-graph"
+API_VERSION = "v18.0"
+
+
+def reset_quota(fake_graph_api) -> None:
+    fake_graph_api._calls.clear()
+    fake_graph_api.app.state.requests = 0
+    fake_graph_api.app.state.throttled = 0
+
+
+async def run_unthrottled(transport, campaign_ids, since, until, concurrency) -> dict:
+    """Fluxo anterior: sem controle de taxa nem novas tentativas"""
+    semaphore = asyncio.Semaphore(concurrency)
+    failed = 0
+    params = {
+        "access_token": "fake",
+        "level": "campaign",
+        "time_range": json.dumps({"since": since.isoformat(), "until": until.isoformat()}),
+    }
+
+    async with httpx.AsyncClient(transport=transport, base_url=f"{BASE_URL}/{API_VERSION}") as client:
+        async def fetch(campaign_id):
+            nonlocal failed
+            async with semaphore:
+                response = await client.get("/act_1/insights", params={
+                    **params,
+                    "filtering": json.dumps([{"field": "campaign.id", "operator": "IN", "value": [campaign_id]}])
+                })
+                if response.status_code != 200:
+                    failed += 1
+
+        await asyncio.gather(*(fetch(campaign_id) for campaign_id in campaign_ids))
+    return {"failed": failed}
+
+
+async def run_adaptive(transport, campaign_ids, since, until, concurrency, rate) -> dict:
+    limiter = MetaRateLimiter(rate=rate, burst=rate, target_usage=settings.META_RATE_LIMIT_TARGET_USAGE_PCT)
+    client = MetaGraphClient(
+        base_url=BASE_URL,
+        api_version=API_VERSION,
+        access_token="fake",
+        ad_account_id="act_1",
+        concurrency=concurrency,
+        chunk_size=1,
+        transport=transport,
+        rate_limiter=limiter
+    )
+    try:
+        await client.get_insights_bulk(campaign_ids, since, until)
+        failed = 0
+    except Exception as e:
+        print(f"❌ {e}")
+        failed = len(campaign_ids)
+    finally:
+        await client.aclose()
+    return {"failed": failed, "limiter": limiter.stats()["act_1"]}
+
+
+async def main(n_requests: int, quota: int, window: float, concurrency: int, rate: float) -> None:
+    os.environ["FAKE_GRAPH_LATENCY_MS"] = "5"
+    os.environ["FAKE_GRAPH_QUOTA_CALLS"] = str(quota)
+    os.environ["FAKE_GRAPH_QUOTA_WINDOW_SECONDS"] = str(window)
+    from benchmarks import fake_graph_api
+
+    settings.META_BACKOFF_BASE_SECONDS = 0.25
+    transport = httpx.ASGITransport(app=fake_graph_api.app)
+    campaign_ids = [str(120000000 + i) for i in range(n_requests)]
+    until = date.today()
+    since = until - timedelta(days=6)
+
+    print(f"\n🚦 {n_requests} requisições, cota de {quota} chamadas a cada {window:.0f}s "
+          f"({quota / window:.1f} req/s), {concurrency} em paralelo")
+    print(f"{'cenário':30} {'tempo':>8} {'ok/s':>7} {'falhas':>7} {'throttled':>10}")
+
+    scenarios = [
+        ("antes (sem controle)", lambda: run_unthrottled(transport, campaign_ids, since, until, concurrency)),
+        (f"depois (bucket de {rate:.0f} req/s)", lambda: run_adaptive(transport, campaign_ids, since, until, concurrency, rate)),
+    ]
+    for label, scenario in scenarios:
+        reset_quota(fake_graph_api)
+        started = time.perf_counter()
+        result = await scenario()
+        elapsed = time.perf_counter() - started
+        ok = n_requests - result["failed"]
+        print(f"{label:30} {elapsed:>7.2f}s {ok / elapsed:>7.1f} {result['failed']:>7} "
+              f"{fake_graph_api.app.state.throttled:>10}")
+        if "limiter" in result:
+            print(f"   📈 {result['limiter']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do controle de taxa do Meta")
+    parser.add_argument("--requests", type=int, default=150)
+    parser.add_argument("--quota", type=int, default=50)
+    parser.add_argument("--window", type=float, default=5)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=20, help="Taxa inicial do bucket (acima da cota)")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.quota, args.window, args.concurrency, args.rate))
@@ -0,0 +1,86 @@
+"""
+Benchmark do custo da instrumentação (/metrics)
+
+Roda a mesma sequência de requisições (listagem, busca por ID e resumo) com e
+sem o MetricsMiddleware e os eventos do SQLAlchemy, e mostra o resumo que o
+/metrics passa a expor.
+
+Uso (a partir de backend/):
+    python -m benchmarks.metrics_overhead --campaigns 5000 --requests 3000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core import metrics
+from benchmarks.concurrency import seed_database, build_async_app
+
+
+def paths(n_requests: int, n_campaigns: int) -> list:
+    cycle = ["/campaigns/?limit=50", "/campaigns/{id}", "/campaigns/platforms/summary"]
+    return [cycle[i % 3].format(id=i % n_campaigns + 1) for i in range(n_requests)]
+
+
+async def run(client: httpx.AsyncClient, request_paths: list) -> float:
+    started = time.perf_counter()
+    for path in request_paths:
+        response = await client.get(path)
+        response.raise_for_status()
+    return time.perf_counter() - started
+
+
+def set_instrumentation(app, enabled: bool) -> None:
+    middleware = [m for m in app.user_middleware if m.cls is not metrics.MetricsMiddleware]
+    if enabled:
+        middleware.insert(0, next(m for m in app.user_middleware if m.cls is metrics.MetricsMiddleware))
+        metrics.instrument_sqlalchemy()
+    else:
+        for name, fn in (("before_cursor_execute", metrics._before_cursor_execute),
+                         ("after_cursor_execute", metrics._after_cursor_execute)):
+            if event.contains(Engine, name, fn):
+                event.remove(Engine, name, fn)
+    app.user_middleware = middleware
+    app.middleware_stack = None
+
+
+async def main(n_campaigns: int, n_requests: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        seed_database(url, n_campaigns)
+        app, async_engine = build_async_app(url, slow_ms=0)
+        saved = list(app.user_middleware)
+        request_paths = paths(n_requests, n_campaigns)
+
+        print(f"\n📏 {n_requests} requisições sequenciais, {n_campaigns} campanhas")
+        print(f"{'cenário':24} {'tempo':>8} {'ms/req':>8}")
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            await run(client, request_paths[:100])  # aquecimento
+            for label, enabled in (("sem instrumentação", False), ("com instrumentação", True)):
+                app.user_middleware = list(saved)
+                set_instrumentation(app, enabled)
+                elapsed = await run(client, request_paths)
+                print(f"{label:24} {elapsed:>7.2f}s {elapsed / n_requests * 1000:>8.3f}")
+
+            body = (await client.get("/metrics")).text
+        print("\n   " + "\n   ".join(
+            line for line in body.splitlines()
+            if line.startswith(("http_request_duration_seconds_sum", "http_request_db_queries_sum", "db_queries_total"))
+        ))
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do custo da instrumentação")
+    parser.add_argument("--campaigns", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=3000)
+    args = parser.parse_args()
+    asyncio.run(main(args.campaigns, args.requests))
@@ -0,0 +1,95 @@
+"""
+Benchmark do pacing das campanhas ativas
+
+Semeia um banco SQLite temporário com o gerador de dados sintéticos e compara:
+- antes: recalcular do zero a cada leitura (estado novo: todas as campanhas
+  ativas e a última data de métricas de cada uma)
+- depois: o mesmo PacingEngine entre leituras, relendo só as campanhas com
+  métricas novas (ingestão de `--changed` campanhas entre uma leitura e outra)
+
+Uso (a partir de backend/):
+    python -m benchmarks.pacing --campaigns 50000 --changed 500
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession, create_async_engine
+
+from app.database import Base, to_async_url
+from app.schemas import campaign_db, campaign_metrics_db, table_version_db  # noqa: F401 (tabelas)
+from app.services.campaign_metrics import upsert_daily_metrics
+from app.services.pacing import PacingEngine, compute_pacing
+from app.services.synthetic_data import generate_synthetic_data
+
+
+async def timed(coro) -> float:
+    started = time.perf_counter()
+    await coro
+    return time.perf_counter() - started
+
+
+async def main(n_campaigns: int, days: int, n_changed: int, rounds: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = create_engine(url)
+        Base.metadata.create_all(engine)
+        engine.dispose()
+
+        async_engine = create_async_engine(to_async_url(url))
+        session_factory = async_sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
+        async with session_factory() as db:
+            print(f"🌱 Gerando {n_campaigns} campanhas com {days} dias de métricas...")
+            seeded = await generate_synthetic_data(db, n_campaigns, days=days, seed=1)
+            print(f"   {seeded['daily_metrics']} linhas em {seeded['elapsed_seconds']}s")
+
+        pacing = PacingEngine()
+        async with session_factory() as db:
+            state = await pacing.refresh(db)
+        active_ids = state.index.tolist()
+        rng = random.Random(1)
+        print(f"\n⏱️ Pacing de {len(active_ids)} campanhas ativas, {n_changed} com métricas novas por rodada")
+
+        full, unchanged, incremental, compute = [], [], [], []
+        for i in range(rounds):
+            async with session_factory() as db:
+                full.append(await timed(PacingEngine().refresh(db)))
+                unchanged.append(await timed(pacing.refresh(db)))
+                await upsert_daily_metrics(db, [
+                    {"campaign_id": campaign_id, "date": date.today(), "spend": rng.uniform(10, 500)}
+                    for campaign_id in rng.sample(active_ids, min(n_changed, len(active_ids)))
+                ])
+                incremental.append(await timed(pacing.refresh(db)))
+                started = time.perf_counter()
+                compute_pacing(pacing._state, datetime.now(), pacing.tolerance)
+                compute.append(time.perf_counter() - started)
+
+        for label, values in (
+            ("antes: recálculo completo", full),
+            ("depois: leitura sem mudanças", unchanged),
+            (f"depois: após {n_changed} campanhas", incremental),
+            ("cálculo vetorizado (todas)", compute),
+        ):
+            print(f"{label:36} {statistics.median(values) * 1000:>9.1f} ms")
+        print(f"{'recargas completas / incrementais':36} {pacing.full_reloads:>6} / {pacing.incremental_updates}")
+
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do pacing incremental")
+    parser.add_argument("--campaigns", type=int, default=50000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--changed", type=int, default=500, help="Campanhas com métricas novas por rodada")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.campaigns, args.days, args.changed, args.rounds))
@@ -0,0 +1,100 @@
+"""
+Benchmark do motor de regras
+
+Semeia um banco SQLite temporário com o gerador de dados sintéticos, cria a
+regra "CPA > 50 e gasto >= 100 nos últimos 3 dias → pausar" e compara:
+- antes: avaliar no cliente e chamar POST /campaigns/{id}/pause para cada
+  campanha (um commit e um refresh por campanha)
+- depois: POST /rules/{id}/run (uma consulta, um UPDATE em lote e o histórico
+  gravado na mesma transação)
+
+Uso (a partir de backend/):
+    python -m benchmarks.rules_engine --campaigns 20000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import create_engine, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+
+from app.database import Base
+from app.schemas import campaign_db, campaign_metrics_db, user_db, rule_db, table_version_db  # noqa: F401 (tabelas)
+from app.schemas.campaign_db import CampaignDB, CampaignStatus
+from app.routers.auth import get_current_active_admin
+from app.services.synthetic_data import generate_synthetic_data
+from benchmarks.concurrency import build_async_app
+
+RULE = {
+    "name": "CPA alto nos últimos 3 dias",
+    "action": "pause",
+    "window_days": 3,
+    "conditions": [
+        {"metric": "cpa", "operator": "gt", "value": 50},
+        {"metric": "spend", "operator": "gte", "value": 100},
+    ],
+}
+
+
+async def main(n_campaigns: int, days: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = create_engine(url)
+        Base.metadata.create_all(engine)
+        engine.dispose()
+
+        app, async_engine = build_async_app(url, slow_ms=0)
+        app.dependency_overrides[get_current_active_admin] = lambda: None
+        session_factory = async_sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
+        async with session_factory() as db:
+            print(f"🌱 Gerando {n_campaigns} campanhas com {days} dias de métricas...")
+            await generate_synthetic_data(db, n_campaigns, days=days, seed=1)
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            rule_id = (await client.post("/rules/", json=RULE)).json()["id"]
+
+            started = time.perf_counter()
+            dry_run = (await client.post(f"/rules/{rule_id}/run", params={"dry_run": True})).json()
+            dry_run_elapsed = time.perf_counter() - started
+            matched = dry_run["rules"][0]["matched"]
+            print(f"\n⚙️ Regra casa com {matched} campanhas ativas")
+
+            started = time.perf_counter()
+            result = (await client.post(f"/rules/{rule_id}/run")).json()
+            bulk_elapsed = time.perf_counter() - started
+            # O dry-run lista só as primeiras: os ids alterados vêm do histórico
+            audit = (await client.get("/rules/audit", params={"run_id": result["run_id"], "limit": 10000})).json()
+            ids = [entry["campaign_id"] for entry in audit]
+
+            # Volta ao estado inicial para pausar as mesmas campanhas uma a uma
+            async with session_factory() as db:
+                await db.execute(
+                    update(CampaignDB).where(CampaignDB.id.in_(ids)).values(status=CampaignStatus.ACTIVE)
+                )
+                await db.commit()
+
+            started = time.perf_counter()
+            for campaign_id in ids:
+                (await client.post(f"/campaigns/{campaign_id}/pause")).raise_for_status()
+            loop_elapsed = time.perf_counter() - started
+
+        print(f"{'antes: pause por campanha':34} {loop_elapsed:>8.3f}s  ({len(ids)} requisições)")
+        print(f"{'depois: dry-run da regra':34} {dry_run_elapsed:>8.3f}s")
+        print(f"{'depois: regra com UPDATE em lote':34} {bulk_elapsed:>8.3f}s  "
+              f"({result['rules'][0]['changed']} alteradas, {len(audit)} no histórico)")
+
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do motor de regras")
+    parser.add_argument("--campaigns", type=int, default=20000)
+    parser.add_argument("--days", type=int, default=30)
+    args = parser.parse_args()
+    asyncio.run(main(args.campaigns, args.days))
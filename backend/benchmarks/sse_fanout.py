@@ -0,0 +1,107 @@
+"""
+Benchmark do stream SSE de campanhas contra polling
+
+Com `--clients` dashboards abertos e `--changes` alterações de campanha:
+- antes: cada cliente consulta /campaigns/ uma vez por alteração (polling)
+- depois: as alterações passam pela API real e chegam a todos os clientes
+  pelo broadcaster (cada cliente consome campaign_events.stream(), o mesmo
+  gerador que o StreamingResponse de /campaigns/stream itera)
+
+Conta as consultas SQL executadas em cada cenário.
+
+Uso (a partir de backend/):
+    python -m benchmarks.sse_fanout --clients 1000 --changes 10
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import event
+
+from app.core.broadcaster import campaign_events
+from benchmarks.concurrency import seed_database, build_async_app
+
+
+async def run_polling(client: httpx.AsyncClient, n_clients: int, n_changes: int) -> None:
+    for i in range(n_changes):
+        await client.post(f"/campaigns/{i % 50 + 1}/pause")
+        responses = await asyncio.gather(*(client.get("/campaigns/?limit=100") for _ in range(n_clients)))
+        for response in responses:
+            response.raise_for_status()
+
+
+async def run_stream(client: httpx.AsyncClient, n_clients: int, n_changes: int) -> list:
+    received = [0] * n_clients
+    ready = asyncio.Event()
+    subscribed = 0
+
+    async def subscriber(index: int):
+        nonlocal subscribed
+        stream = campaign_events.stream(heartbeat=60)
+        await stream.__anext__()  # retry: primeiro frame, já inscrito
+        subscribed += 1
+        if subscribed == n_clients:
+            ready.set()
+        try:
+            async for frame in stream:
+                if frame.startswith("id:"):
+                    received[index] += 1
+                    if received[index] == n_changes:
+                        return
+        finally:
+            await stream.aclose()
+
+    tasks = [asyncio.create_task(subscriber(i)) for i in range(n_clients)]
+    await ready.wait()
+    for i in range(n_changes):
+        response = await client.post(f"/campaigns/{i % 50 + 1}/activate")
+        response.raise_for_status()
+    await asyncio.gather(*tasks)
+    return received
+
+
+async def main(n_campaigns: int, n_clients: int, n_changes: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        seed_database(url, n_campaigns)
+        app, async_engine = build_async_app(url, slow_ms=0)
+
+        queries = {"count": 0}
+
+        @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+        def count_query(*args):
+            queries["count"] += 1
+
+        transport = httpx.ASGITransport(app=app)
+        limits = httpx.Limits(max_connections=None)
+        print(f"\n📡 {n_clients} clientes, {n_changes} alterações de campanha")
+        print(f"{'cenário':30} {'tempo':>8} {'consultas SQL':>14} {'eventos/cliente':>16}")
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits) as client:
+            queries["count"] = 0
+            started = time.perf_counter()
+            await run_polling(client, n_clients, n_changes)
+            print(f"{'antes (polling)':30} {time.perf_counter() - started:>7.2f}s {queries['count']:>14} {'-':>16}")
+
+            queries["count"] = 0
+            started = time.perf_counter()
+            received = await run_stream(client, n_clients, n_changes)
+            print(f"{'depois (SSE / broadcaster)':30} {time.perf_counter() - started:>7.2f}s {queries['count']:>14} "
+                  f"{min(received):>16}")
+        print(f"   📈 {campaign_events.stats()}")
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do stream SSE de campanhas")
+    parser.add_argument("--campaigns", type=int, default=1000)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--changes", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.campaigns, args.clients, args.changes))
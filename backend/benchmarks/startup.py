@@ -0,0 +1,95 @@
+"""
+Benchmark da subida da aplicação (cold start de um worker)
+
+Roda cada medição num processo Python novo, como um worker recém-criado:
+- tempo até o app estar pronto: `import app.main` + startup do lifespan
+- detalhamento do import (`python -X importtime`): tempo próprio somado por
+  pacote de topo e tempo acumulado dos módulos `app.*`
+
+Uso (a partir de backend/):
+    python -m benchmarks.startup --runs 5 --top 15
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+READY_SCRIPT = """
+import asyncio, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+
+async def startup():
+    async with app.main.app.router.lifespan_context(app.main.app):
+        return time.perf_counter()
+
+ready = asyncio.run(startup())
+print(f"READY {imported - started:.6f} {ready - started:.6f}")
+"""
+
+
+def run_python(args: list, env: dict) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args], cwd=BACKEND_DIR, env=env,
+        capture_output=True, text=True, check=True
+    )
+
+
+def measure_ready(env: dict, runs: int) -> dict:
+    imports, readies = [], []
+    for _ in range(runs):
+        output = run_python(["-c", READY_SCRIPT], env).stdout
+        line = next(line for line in output.splitlines() if line.startswith("READY "))
+        imported, ready = (float(value) for value in line.split()[1:])
+        imports.append(imported)
+        readies.append(ready)
+    return {"import": statistics.median(imports), "ready": statistics.median(readies)}
+
+
+def import_breakdown(env: dict) -> tuple:
+    """(tempo próprio por pacote de topo, tempo acumulado dos módulos app.*) em ms"""
+    stderr = run_python(["-X", "importtime", "-c", "import app.main"], env).stderr
+    packages = defaultdict(float)
+    app_modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        module = name.strip()
+        packages[module.split(".")[0]] += int(self_us) / 1000
+        if module == "app" or module.startswith("app."):
+            app_modules[module] = int(cumulative_us) / 1000
+    return packages, app_modules
+
+
+def main(runs: int, top: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'startup.db')}")
+        packages, app_modules = import_breakdown(env)
+        timings = measure_ready(env, runs)
+
+    print(f"\n🚀 Subida de um worker (mediana de {runs} processos)")
+    print(f"   import app.main: {timings['import'] * 1000:.0f} ms")
+    print(f"   pronto (import + lifespan): {timings['ready'] * 1000:.0f} ms")
+
+    print(f"\n📦 Tempo próprio de import por pacote (top {top})")
+    for package, ms in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"   {package:30} {ms:>8.1f} ms")
+
+    print(f"\n🧩 Tempo acumulado dos módulos da aplicação (top {top})")
+    for module, ms in sorted(app_modules.items(), key=lambda item: -item[1])[:top]:
+        print(f"   {module:45} {ms:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark da subida da aplicação")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    main(args.runs, args.top)
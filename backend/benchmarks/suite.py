@@ -0,0 +1,300 @@
+"""
+Suíte de benchmarks dos endpoints com baseline versionado
+
+Semeia um banco SQLite temporário (campanhas, métricas diárias e usuários) e
+exercita a aplicação real em processo (httpx + ASGITransport), com cada nível
+de concorrência:
+- list_campaigns        GET  /campaigns/?skip=..&limit=50
+- get_campaign_metrics  GET  /campaigns/{id}/metrics (metade com período)
+- get_platform_summary  GET  /campaigns/platform/{platform}/summary
+- get_platforms_summary GET  /campaigns/platforms/summary
+- auth_login            POST /auth/login
+- auth_me               GET  /auth/me
+
+Cada medição é repetida `--repeat` vezes e fica a mediana de cada número
+(uma rodada isolada varia bastante). Registra req/s e latências p50/p95/p99
+em JSON e compara com o baseline (benchmarks/baseline.json): queda de req/s
+acima da tolerância, ou alta do p95 acima do dobro dela (a cauda oscila mais),
+é regressão e o processo termina com código 1. A tolerância padrão (40%) fica
+acima da variação medida entre execuções idênticas (~25% no req/s).
+Os números dependem da máquina: regrave o baseline (--update-baseline) ao
+trocar o ambiente de referência. Com --only, só os cenários medidos são
+substituídos no baseline; os demais são mantidos.
+
+Uso (a partir de backend/):
+    python -m benchmarks.suite
+    python -m benchmarks.suite --output resultado.json --tolerance 0.3
+    python -m benchmarks.suite --update-baseline
+    python -m benchmarks.suite --only list_campaigns --update-baseline
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import create_engine, insert
+
+from app.core.security import create_access_token, shutdown_hash_executor
+from app.schemas.campaign_db import PlatformEnum
+from app.schemas.campaign_metrics_db import CampaignDailyMetricsDB
+from benchmarks.concurrency import seed_database, build_async_app
+from benchmarks.login_throughput import seed_users, PASSWORD
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+# Parâmetros que precisam coincidir para a comparação com o baseline valer
+META_KEYS = ("campaigns", "users", "days", "requests", "login_requests", "repeat")
+METRICS_START = date(2024, 1, 1)
+WARMUP_REQUESTS = 20
+
+# Requisição i de cada cenário: (método, caminho, kwargs do httpx)
+Scenario = Callable[[int], tuple]
+
+
+def seed_daily_metrics(url: str, n_campaigns: int, days: int) -> None:
+    engine = create_engine(url)
+    rows = [
+        {
+            "campaign_id": campaign_id,
+            "date": METRICS_START + timedelta(days=day),
+            "spend": float((campaign_id + day) % 100),
+            "impressions": 1000 + day,
+            "clicks": 10 + (campaign_id + day) % 50,
+            "conversions": (campaign_id + day) % 5,
+            "conversion_value": float((campaign_id + day) % 5) * 40.0,
+        }
+        for campaign_id in range(1, n_campaigns + 1)
+        for day in range(days)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(CampaignDailyMetricsDB), rows)
+    engine.dispose()
+
+
+def build_scenarios(n_campaigns: int, n_users: int, days: int) -> Dict[str, Scenario]:
+    tokens = [create_access_token({"sub": f"user{i}@bench.com"}) for i in range(n_users)]
+    period_end = METRICS_START + timedelta(days=max(days - 1, 0))
+    platforms = [platform.value for platform in PlatformEnum]
+
+    def list_campaigns(i: int) -> tuple:
+        return "GET", f"/campaigns/?skip={(i * 37) % max(n_campaigns - 50, 1)}&limit=50", {}
+
+    def get_campaign_metrics(i: int) -> tuple:
+        path = f"/campaigns/{(i * 7919) % n_campaigns + 1}/metrics"
+        if i % 2:
+            path += f"?date_from={METRICS_START.isoformat()}&date_to={period_end.isoformat()}"
+        return "GET", path, {}
+
+    def get_platform_summary(i: int) -> tuple:
+        return "GET", f"/campaigns/platform/{platforms[i % len(platforms)]}/summary", {}
+
+    def get_platforms_summary(i: int) -> tuple:
+        return "GET", "/campaigns/platforms/summary", {}
+
+    def auth_login(i: int) -> tuple:
+        return "POST", "/auth/login", {"data": {"username": f"user{i % n_users}@bench.com", "password": PASSWORD}}
+
+    def auth_me(i: int) -> tuple:
+        return "GET", "/auth/me", {"headers": {"Authorization": f"Bearer {tokens[i % n_users]}"}}
+
+    return {
+        "list_campaigns": list_campaigns,
+        "get_campaign_metrics": get_campaign_metrics,
+        "get_platform_summary": get_platform_summary,
+        "get_platforms_summary": get_platforms_summary,
+        "auth_login": auth_login,
+        "auth_me": auth_me,
+    }
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(cuts[49] * 1000, 3),
+        "p95_ms": round(cuts[94] * 1000, 3),
+        "p99_ms": round(cuts[98] * 1000, 3),
+    }
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, n_requests: int, concurrency: int) -> dict:
+    for i in range(min(WARMUP_REQUESTS, n_requests)):
+        method, path, kwargs = scenario(i)
+        (await client.request(method, path, **kwargs)).raise_for_status()
+
+    latencies: List[float] = []
+    next_index = iter(range(n_requests))
+
+    async def worker():
+        for i in next_index:
+            method, path, kwargs = scenario(i)
+            started = time.perf_counter()
+            response = await client.request(method, path, **kwargs)
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def median_result(runs: List[dict]) -> dict:
+    return {key: statistics.median([run[key] for run in runs]) for key in runs[0]}
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Linhas de regressão: req/s abaixo da tolerância ou p95 acima do dobro dela"""
+    regressions = []
+    print(f"\n📐 Comparação com o baseline (tolerância {tolerance:.0%} no req/s, {2 * tolerance:.0%} no p95)")
+    print(f"{'cenário':22} {'c':>4} {'req/s':>9} {'Δ':>8} {'p95 ms':>9} {'Δ':>8}")
+    for name, levels in results["results"].items():
+        for level, current in levels.items():
+            reference = baseline.get("results", {}).get(name, {}).get(level)
+            if reference is None:
+                print(f"{name:22} {level:>4} {current['rps']:>9.1f} {'novo':>8} {current['p95_ms']:>9.2f} {'novo':>8}")
+                continue
+            rps_delta = current["rps"] / reference["rps"] - 1
+            p95_delta = current["p95_ms"] / reference["p95_ms"] - 1 if reference["p95_ms"] else 0.0
+            flag = ""
+            if rps_delta < -tolerance or p95_delta > 2 * tolerance:
+                flag = " ❌ regressão"
+                regressions.append(f"{name} c={level}: req/s {rps_delta:+.0%}, p95 {p95_delta:+.0%}")
+            elif rps_delta > tolerance:
+                flag = " ✅ melhora"
+            print(f"{name:22} {level:>4} {current['rps']:>9.1f} {rps_delta:>+8.0%} "
+                  f"{current['p95_ms']:>9.2f} {p95_delta:>+8.0%}{flag}")
+    return regressions
+
+
+async def run_suite(
+    n_campaigns: int,
+    n_users: int,
+    days: int,
+    n_requests: int,
+    login_requests: int,
+    levels: List[int],
+    repeat: int,
+    only: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'suite.db')}"
+        seed_database(url, n_campaigns)
+        seed_daily_metrics(url, n_campaigns, days)
+        seed_users(url, n_users)
+        app, async_engine = build_async_app(url, slow_ms=0)
+        scenarios = build_scenarios(n_campaigns, n_users, days)
+
+        results: Dict[str, Dict[str, dict]] = {}
+        print(f"\n🏁 {n_campaigns} campanhas x {days} dias, {n_users} usuários, "
+              f"{n_requests} requisições por nível ({login_requests} no login), mediana de {repeat} rodadas")
+        print(f"{'cenário':22} {'c':>4} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        limits = httpx.Limits(max_connections=None)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench",
+                                     limits=limits) as client:
+            for name, scenario in scenarios.items():
+                if only and name not in only:
+                    continue
+                total = login_requests if name == "auth_login" else n_requests
+                for level in levels:
+                    result = median_result(
+                        [await run_scenario(client, scenario, total, level) for _ in range(repeat)]
+                    )
+                    results.setdefault(name, {})[str(level)] = result
+                    print(f"{name:22} {level:>4} {result['rps']:>9.1f} {result['p50_ms']:>9.2f} "
+                          f"{result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f}")
+        await async_engine.dispose()
+    shutdown_hash_executor()
+
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "campaigns": n_campaigns,
+            "users": n_users,
+            "days": days,
+            "requests": n_requests,
+            "login_requests": login_requests,
+            "concurrency": levels,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def merge_baseline(results: dict, path: str) -> dict:
+    """Resultado novo sobre o baseline existente: cenários e níveis não medidos são mantidos"""
+    if not os.path.exists(path):
+        return results
+    with open(path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if any(baseline["meta"].get(key) != results["meta"][key] for key in META_KEYS):
+        print("\n⚠️ Parâmetros diferentes dos usados no baseline: os cenários mantidos foram medidos com outros")
+    merged = baseline.get("results", {})
+    for name, levels in results["results"].items():
+        merged.setdefault(name, {}).update(levels)
+    return {"meta": results["meta"], "results": merged}
+
+
+def main(args: argparse.Namespace) -> int:
+    levels = [int(level) for level in args.concurrency.split(",")]
+    only = args.only.split(",") if args.only else None
+    results = asyncio.run(run_suite(
+        args.campaigns, args.users, args.days, args.requests, args.login_requests, levels, args.repeat, only
+    ))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Resultado gravado em {args.output}")
+
+    if args.update_baseline:
+        baseline = merge_baseline(results, args.baseline)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"\n💾 Baseline atualizado em {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\n⚠️ Baseline {args.baseline} não encontrado; use --update-baseline para criar")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if any(baseline["meta"].get(key) != results["meta"][key] for key in META_KEYS):
+        print("\n⚠️ Parâmetros diferentes dos usados no baseline: a comparação é só indicativa")
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\n❌ Regressões:\n   " + "\n   ".join(regressions))
+        return 1
+    print("\n✅ Nenhuma regressão em relação ao baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks dos endpoints")
+    parser.add_argument("--campaigns", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--days", type=int, default=30, help="Dias de métricas diárias por campanha")
+    parser.add_argument("--requests", type=int, default=300, help="Requisições por cenário e nível")
+    parser.add_argument("--login-requests", type=int, default=24, help="Logins por nível (hash de senha é caro)")
+    parser.add_argument("--repeat", type=int, default=3, help="Rodadas por medição (fica a mediana)")
+    parser.add_argument("--concurrency", default="1,16,64", help="Níveis separados por vírgula")
+    parser.add_argument("--only", help="Cenários separados por vírgula (padrão: todos)")
+    parser.add_argument("--output", help="Grava o resultado desta execução em JSON")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="Grava o resultado como novo baseline")
+    parser.add_argument("--tolerance", type=float, default=0.4, help="Variação aceita (0.4 = 40%%)")
+    sys.exit(main(parser.parse_args()))
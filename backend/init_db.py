@@ -6,6 +6,10 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from app.database import engine, Base
 from app.schemas.campaign_db import CampaignDB
+from app.schemas.campaign_metrics_db import CampaignDailyMetricsDB
+from app.schemas.ads_sync_db import AdsSyncStateDB
+from app.schemas.rule_db import AutomationRuleDB, RuleAuditLogDB
+from app.schemas.table_version_db import TableVersionDB
 
 print("🔄 Criando tabelas no banco de dados...")
 Base.metadata.create_all(bind=engine)
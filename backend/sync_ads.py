@@ -0,0 +1,44 @@
+"""
+Worker de sincronização das plataformas de anúncios (fora do processo da API)
+
+Uso:
+    python sync_ads.py          # roda a cada ADS_SYNC_INTERVAL_SECONDS
+    python sync_ads.py --once   # uma única sincronização
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.config import settings
+from app.database import async_engine
+from app.services.ads_sync import ads_sync_worker
+from app.services.meta_graph_client import meta_graph_client
+
+
+async def main(once: bool) -> None:
+    try:
+        while True:
+            for result in await ads_sync_worker.run_once():
+                if "error" in result:
+                    print(f"❌ {result['account_id']}: {result['error']}")
+                else:
+                    print(f"✅ {result['account_id']}: {result['campaigns_synced']} campanhas, "
+                          f"{result['metrics_rows_synced']} dias de métricas "
+                          f"({result['date_from']} a {result['date_to']})")
+            if once:
+                break
+            await asyncio.sleep(settings.ADS_SYNC_INTERVAL_SECONDS)
+    finally:
+        await meta_graph_client.aclose()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sincroniza campanhas e métricas das plataformas")
+    parser.add_argument("--once", action="store_true", help="Executa uma vez e sai")
+    args = parser.parse_args()
+    print("🔄 Sincronizando plataformas de anúncios...")
+    asyncio.run(main(args.once))
@@ -3,9 +3,40 @@ sys.path.append('.')
 from app.database import Base, engine
 from app.schemas.campaign_db import CampaignDB
 from app.schemas.user_db import UserDB
+from app.schemas.campaign_metrics_db import CampaignDailyMetricsDB
+from app.schemas.ads_sync_db import AdsSyncStateDB
+from app.schemas.rule_db import AutomationRuleDB, RuleAuditLogDB
+from app.schemas.table_version_db import TableVersionDB
+from sqlalchemy import inspect, text
 
 print("🔄 Atualizando banco de dados com autenticação...")
 Base.metadata.create_all(bind=engine)
+
+# create_all também não adiciona colunas novas em tabelas existentes
+inspector = inspect(engine)
+with engine.begin() as conn:
+    for table in Base.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                column_type = column.type.compile(dialect=engine.dialect)
+                # Linhas existentes recebem o default da coluna (ex.: contadores = 0)
+                default = ""
+                scalar_default = column.default.arg if column.default is not None and column.default.is_scalar else None
+                if isinstance(scalar_default, (int, float)):
+                    default = f" DEFAULT {scalar_default!r}"
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}{default}'))
+                print(f"   + {table.name}.{column.name}")
+
+# create_all não altera tabelas existentes: cria os índices que faltarem
+for table in Base.metadata.sorted_tables:
+    for index in table.indexes:
+        index.create(bind=engine, checkfirst=True)
 print("✅ Tabelas criadas/atualizadas:")
 print("   - campaigns")
 print("   - users")
+print("   - campaign_daily_metrics")
+print("   - ads_sync_state")
+print("   - automation_rules")
+print("   - rule_audit_log")
+print("   - table_versions")